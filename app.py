@@ -1,10 +1,23 @@
 import streamlit as st
 import numpy as np
-import pandas as pd
-import pickle
 import json
-import plotly.graph_objects as go
+import os
+import time
+import uuid
 from datetime import datetime
+from charts import GAUGE_RENDERER, create_bar_rows, create_contribution_chart, create_gauge_chart, create_svg_gauge, create_sensitivity_chart
+from model.features import COLUMN_INDEX, GENDER_OPTIONS, LEVEL_OPTIONS, compute_bmi, encode_patient, patient_features, scale_features
+from model.validation import REASON_MESSAGES, reason_codes, violation_masks
+from model.metrics import REGISTRY as METRICS, REJECTED_TOTAL, start_server
+from model.dataset_stats import STATS_PATH, bin_labels, summary_metrics
+from model.rules import BMI_CATEGORIES, BP_CATEGORIES, RECOMMENDATIONS, RISK_ADVICE, RISK_LEVELS, bmi_category, bp_category, categorize, risk_level
+from model.explain import FEATURE_LABELS, SIGNIFICANT_CONTRIBUTION, contributions, feature_baseline, format_feature_value, ranked_contributions
+from model.whatif import sensitivity_curves
+from model.counterfactual import LOW_RISK_THRESHOLD, describe_change, find_counterfactual
+
+# Heavy modules (pickle for the artifacts, plotly in charts.py) are
+# imported inside the functions that need them so a cold start only pays for
+# what the first rendered view actually uses.
 
 # ============================================================================
 # PAGE CONFIGURATION
@@ -28,6 +41,10 @@ if 'show_results' not in st.session_state:
 if 'current_section' not in st.session_state:
     st.session_state.current_section = 'home'
 
+# Sticky key for A/B routing between model versions
+if 'session_key' not in st.session_state:
+    st.session_state.session_key = uuid.uuid4().hex
+
 def toggle_theme():
     st.session_state.theme = 'dark' if st.session_state.theme == 'light' else 'light'
 
@@ -37,810 +54,179 @@ def navigate_to(section):
 # ============================================================================
 # ENHANCED CSS WITH FIXED NAVIGATION AND SCROLLING
 # ============================================================================
+# The stylesheet itself lives in static/theme.css and is identical for both
+# themes; only the custom properties below change with the theme. Streamlit
+# sends large unchanged elements as a cached reference, so a rerun re-sends
+# just the small token block instead of the whole stylesheet.
+THEME_TOKENS = {
+    'dark': {
+        'page-bg': "#0a0e27",
+        'navbar-bg': "rgba(10, 14, 39, 0.98)",
+        'navbar-shadow': "0 4px 20px rgba(0, 0, 0, 0.3)",
+        'divider': "rgba(59, 130, 246, 0.2)",
+        'brand-gradient': "linear-gradient(135deg, #3b82f6 0%, #06b6d4 100%)",
+        'hero-bg': "linear-gradient(135deg, rgba(10, 14, 39, 0.9) 0%, rgba(26, 31, 58, 0.9) 100%)",
+        'hero-title-gradient': "linear-gradient(135deg, #3b82f6 0%, #06b6d4 50%, #8b5cf6 100%)",
+        'text': "#e2e8f0",
+        'muted': "#94a3b8",
+        'label': "#e2e8f0",
+        'widget-label': "#94a3b8",
+        'stat-card-bg': "linear-gradient(135deg, #1e3a8a 0%, #1e40af 100%)",
+        'stat-number': "white",
+        'stat-label': "#bfdbfe",
+        'card-bg': "linear-gradient(135deg, #1e293b 0%, #334155 100%)",
+        'feature-card-border': "rgba(59, 130, 246, 0.2)",
+        'feature-card-shadow': "none",
+        'feature-card-hover-shadow': "0 20px 40px rgba(59, 130, 246, 0.3)",
+        'assessment-border': "rgba(59, 130, 246, 0.3)",
+        'assessment-shadow': "none",
+        'results-shadow': "none",
+        'footer-bg': "#0a0e27",
+        'button-shadow': "0 8px 24px rgba(59, 130, 246, 0.4)",
+        'button-hover-shadow': "0 12px 32px rgba(59, 130, 246, 0.6)",
+    },
+    'light': {
+        'page-bg': "#ffffff",
+        'navbar-bg': "rgba(255, 255, 255, 0.98)",
+        'navbar-shadow': "0 4px 20px rgba(0, 0, 0, 0.05)",
+        'divider': "rgba(59, 130, 246, 0.1)",
+        'brand-gradient': "linear-gradient(135deg, #1e40af 0%, #0891b2 100%)",
+        'hero-bg': "linear-gradient(135deg, #f0f9ff 0%, #e0f2fe 100%)",
+        'hero-title-gradient': "linear-gradient(135deg, #1e40af 0%, #0891b2 50%, #7c3aed 100%)",
+        'text': "#1e293b",
+        'muted': "#64748b",
+        'label': "#475569",
+        'widget-label': "#475569",
+        'stat-card-bg': "linear-gradient(135deg, #dbeafe 0%, #bfdbfe 100%)",
+        'stat-number': "#1e40af",
+        'stat-label': "#3b82f6",
+        'card-bg': "white",
+        'feature-card-border': "rgba(59, 130, 246, 0.15)",
+        'feature-card-shadow': "0 4px 16px rgba(0, 0, 0, 0.05)",
+        'feature-card-hover-shadow': "0 20px 40px rgba(59, 130, 246, 0.2)",
+        'assessment-border': "rgba(59, 130, 246, 0.2)",
+        'assessment-shadow': "0 8px 32px rgba(0, 0, 0, 0.08)",
+        'results-shadow': "0 12px 40px rgba(0, 0, 0, 0.1)",
+        'footer-bg': "#f8fafc",
+        'button-shadow': "0 8px 24px rgba(59, 130, 246, 0.3)",
+        'button-hover-shadow': "0 12px 32px rgba(59, 130, 246, 0.5)",
+    },
+}
+
+# Rules that only exist in one theme
+THEME_EXTRA_CSS = {
+    'dark': "",
+    'light': """
+label[data-testid="stWidgetLabel"] {
+    font-weight: 500 !important;
+}
+
+/* Info box text */
+.stAlert p {
+    color: #1e293b !important;
+}
+""",
+}
+
+@st.cache_resource
+def get_base_css():
+    with open("static/theme.css", "r") as f:
+        return f"<style>\n{f.read()}</style>"
+
+@st.cache_resource
 def get_theme_css(theme):
-    if theme == 'dark':
-        return """
-        <style>
-            @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800&display=swap');
-            
-            * {
-                font-family: 'Inter', sans-serif;
-            }
-            
-            /* Hide Streamlit defaults */
-            #MainMenu {visibility: hidden;}
-            footer {visibility: hidden;}
-            header {visibility: hidden;}
-            
-            [data-testid="stAppViewContainer"] {
-                background: #0a0e27;
-            }
-            
-            [data-testid="stHeader"] {
-                background: transparent;
-            }
-            
-            [data-testid="stSidebar"] {
-                display: none;
-            }
-            
-            /* Smooth scroll */
-            html {
-                scroll-behavior: smooth;
-            }
-            
-            /* Fixed Navigation Bar */
-            .navbar {
-                position: fixed;
-                top: 0;
-                left: 0;
-                right: 0;
-                z-index: 9999;
-                background: rgba(10, 14, 39, 0.98);
-                backdrop-filter: blur(10px);
-                padding: 1rem 0;
-                border-bottom: 1px solid rgba(59, 130, 246, 0.2);
-                box-shadow: 0 4px 20px rgba(0, 0, 0, 0.3);
-            }
-            
-            .navbar-container {
-                max-width: 1400px;
-                margin: 0 auto;
-                padding: 0 2rem;
-                display: flex;
-                justify-content: space-between;
-                align-items: center;
-            }
-            
-            .navbar-brand {
-                font-size: 1.8rem;
-                font-weight: 800;
-                background: linear-gradient(135deg, #3b82f6 0%, #06b6d4 100%);
-                -webkit-background-clip: text;
-                -webkit-text-fill-color: transparent;
-                cursor: pointer;
-            }
-            
-            .navbar-menu {
-                display: flex;
-                gap: 2.5rem;
-                align-items: center;
-            }
-            
-            .nav-link {
-                color: #e2e8f0;
-                text-decoration: none;
-                font-weight: 500;
-                font-size: 0.95rem;
-                transition: all 0.3s;
-                cursor: pointer;
-                padding: 0.5rem 1rem;
-                border-radius: 8px;
-            }
-            
-            .nav-link:hover {
-                color: #3b82f6;
-                background: rgba(59, 130, 246, 0.1);
-            }
-            
-            /* Content padding for fixed navbar */
-            .main .block-container {
-                padding-top: 0 !important;
-                max-width: 100% !important;
-            }
-            
-            /* Hero Section */
-            .hero-section {
-                min-height: 100vh;
-                display: flex;
-                align-items: center;
-                justify-content: center;
-                background: linear-gradient(135deg, rgba(10, 14, 39, 0.9) 0%, rgba(26, 31, 58, 0.9) 100%);
-                padding: 8rem 2rem 4rem;
-                margin-top: 70px;
-            }
-            
-            .hero-content {
-                max-width: 1400px;
-                width: 100%;
-                text-align: center;
-            }
-            
-            .hero-title {
-                font-size: 4.5rem;
-                font-weight: 800;
-                background: linear-gradient(135deg, #3b82f6 0%, #06b6d4 50%, #8b5cf6 100%);
-                -webkit-background-clip: text;
-                -webkit-text-fill-color: transparent;
-                margin-bottom: 1.5rem;
-                line-height: 1.2;
-            }
-            
-            .hero-subtitle {
-                font-size: 1.5rem;
-                color: #94a3b8;
-                margin-bottom: 3rem;
-                font-weight: 400;
-            }
-            
-            /* Section */
-            .section {
-                padding: 6rem 2rem;
-                max-width: 1400px;
-                margin: 0 auto;
-            }
-            
-            .section-title {
-                font-size: 3rem;
-                font-weight: 800;
-                text-align: center;
-                background: linear-gradient(135deg, #3b82f6 0%, #06b6d4 100%);
-                -webkit-background-clip: text;
-                -webkit-text-fill-color: transparent;
-                margin-bottom: 1rem;
-            }
-            
-            .section-subtitle {
-                font-size: 1.2rem;
-                color: #94a3b8;
-                text-align: center;
-                margin-bottom: 4rem;
-            }
-            
-            /* Stats Grid */
-            .stats-grid {
-                display: grid;
-                grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-                gap: 2rem;
-                margin-top: 3rem;
-            }
-            
-            .stat-card {
-                background: linear-gradient(135deg, #1e3a8a 0%, #1e40af 100%);
-                padding: 2rem;
-                border-radius: 16px;
-                text-align: center;
-                border: 2px solid #3b82f6;
-            }
-            
-            .stat-number {
-                font-size: 3rem;
-                font-weight: 800;
-                color: white;
-                margin-bottom: 0.5rem;
-            }
-            
-            .stat-label {
-                font-size: 1rem;
-                color: #bfdbfe;
-            }
-            
-            /* Features Grid */
-            .features-grid {
-                display: grid;
-                grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
-                gap: 2rem;
-                margin-top: 3rem;
-            }
-            
-            .feature-card {
-                background: linear-gradient(135deg, #1e293b 0%, #334155 100%);
-                padding: 2.5rem;
-                border-radius: 20px;
-                border: 2px solid rgba(59, 130, 246, 0.2);
-                transition: all 0.3s;
-                text-align: center;
-            }
-            
-            .feature-card:hover {
-                transform: translateY(-10px);
-                border-color: #3b82f6;
-                box-shadow: 0 20px 40px rgba(59, 130, 246, 0.3);
-            }
-            
-            .feature-icon {
-                font-size: 3rem;
-                margin-bottom: 1.5rem;
-            }
-            
-            .feature-title {
-                font-size: 1.5rem;
-                font-weight: 700;
-                color: #e2e8f0;
-                margin-bottom: 1rem;
-            }
-            
-            .feature-text {
-                font-size: 1rem;
-                color: #94a3b8;
-                line-height: 1.6;
-            }
-            
-            /* Assessment Container */
-            .assessment-container {
-                background: linear-gradient(135deg, #1e293b 0%, #334155 100%);
-                padding: 3rem;
-                border-radius: 24px;
-                border: 2px solid rgba(59, 130, 246, 0.3);
-                margin-top: 3rem;
-            }
-            
-            .form-section-title {
-                font-size: 1.5rem;
-                font-weight: 700;
-                color: #3b82f6;
-                margin-bottom: 1.5rem;
-            }
-            
-            /* Results */
-            .results-hero {
-                background: linear-gradient(135deg, #1e293b 0%, #334155 100%);
-                padding: 3rem;
-                border-radius: 24px;
-                border: 3px solid #3b82f6;
-                margin: 3rem 0;
-                text-align: center;
-            }
-            
-            .risk-badge {
-                display: inline-block;
-                padding: 1rem 3rem;
-                border-radius: 50px;
-                font-size: 2.5rem;
-                font-weight: 800;
-                margin-bottom: 1.5rem;
-            }
-            
-            .risk-low {
-                background: linear-gradient(135deg, #059669 0%, #047857 100%);
-                color: white;
-            }
-            
-            .risk-moderate {
-                background: linear-gradient(135deg, #f59e0b 0%, #d97706 100%);
-                color: white;
-            }
-            
-            .risk-high {
-                background: linear-gradient(135deg, #dc2626 0%, #991b1b 100%);
-                color: white;
-            }
-            
-            /* Footer */
-            .footer {
-                background: #0a0e27;
-                padding: 3rem 2rem;
-                text-align: center;
-                border-top: 1px solid rgba(59, 130, 246, 0.2);
-                margin-top: 4rem;
-            }
-            
-            .footer-text {
-                color: #94a3b8;
-                font-size: 0.95rem;
-                margin: 0.5rem 0;
-            }
-            
-            /* Streamlit Overrides */
-            .stButton>button {
-                width: 100%;
-                background: linear-gradient(135deg, #3b82f6 0%, #2563eb 100%);
-                color: white;
-                padding: 1rem 2rem;
-                font-size: 1.1rem;
-                font-weight: 700;
-                border: none;
-                border-radius: 12px;
-                box-shadow: 0 8px 24px rgba(59, 130, 246, 0.4);
-                transition: all 0.3s ease;
-            }
-            
-            .stButton>button:hover {
-                transform: translateY(-2px);
-                box-shadow: 0 12px 32px rgba(59, 130, 246, 0.6);
-            }
-            
-            /* Form elements */
-            .stSlider {
-                padding: 1rem 0;
-            }
-            
-            .stSelectbox {
-                padding: 0.5rem 0;
-            }
-            
-            .stRadio {
-                padding: 0.5rem 0;
-            }
-            
-            /* Text colors - Dark Theme */
-            .main h1, .main h2, .main h3, .main h4 {
-                color: #e2e8f0 !important;
-            }
-            
-            .main p, .main span, .main div, .main label {
-                color: #e2e8f0 !important;
-            }
-            
-            /* Metric styling */
-            [data-testid="stMetricValue"] {
-                color: #3b82f6 !important;
-                font-size: 2rem !important;
-                font-weight: 800 !important;
-            }
-            
-            [data-testid="stMetricLabel"] {
-                color: #94a3b8 !important;
-            }
-            
-            [data-testid="stMetricDelta"] {
-                color: #94a3b8 !important;
-            }
-            
-            /* Fix Streamlit elements in dark theme */
-            .stMarkdown, .stMarkdown p {
-                color: #e2e8f0 !important;
-            }
-            
-            /* Input labels */
-            label[data-testid="stWidgetLabel"] {
-                color: #94a3b8 !important;
-            }
-        </style>
-        """
-    else:  # light theme
-        return """
-        <style>
-            @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800&display=swap');
-            
-            * {
-                font-family: 'Inter', sans-serif;
-            }
-            
-            /* Hide Streamlit defaults */
-            #MainMenu {visibility: hidden;}
-            footer {visibility: hidden;}
-            header {visibility: hidden;}
-            
-            [data-testid="stAppViewContainer"] {
-                background: #ffffff;
-            }
-            
-            [data-testid="stHeader"] {
-                background: transparent;
-            }
-            
-            [data-testid="stSidebar"] {
-                display: none;
-            }
-            
-            /* Smooth scroll */
-            html {
-                scroll-behavior: smooth;
-            }
-            
-            /* Fixed Navigation Bar */
-            .navbar {
-                position: fixed;
-                top: 0;
-                left: 0;
-                right: 0;
-                z-index: 9999;
-                background: rgba(255, 255, 255, 0.98);
-                backdrop-filter: blur(10px);
-                padding: 1rem 0;
-                border-bottom: 1px solid rgba(59, 130, 246, 0.1);
-                box-shadow: 0 4px 20px rgba(0, 0, 0, 0.05);
-            }
-            
-            .navbar-container {
-                max-width: 1400px;
-                margin: 0 auto;
-                padding: 0 2rem;
-                display: flex;
-                justify-content: space-between;
-                align-items: center;
-            }
-            
-            .navbar-brand {
-                font-size: 1.8rem;
-                font-weight: 800;
-                background: linear-gradient(135deg, #1e40af 0%, #0891b2 100%);
-                -webkit-background-clip: text;
-                -webkit-text-fill-color: transparent;
-                cursor: pointer;
-            }
-            
-            .navbar-menu {
-                display: flex;
-                gap: 2.5rem;
-                align-items: center;
-            }
-            
-            .nav-link {
-                color: #1e293b;
-                text-decoration: none;
-                font-weight: 500;
-                font-size: 0.95rem;
-                transition: all 0.3s;
-                cursor: pointer;
-                padding: 0.5rem 1rem;
-                border-radius: 8px;
-            }
-            
-            .nav-link:hover {
-                color: #3b82f6;
-                background: rgba(59, 130, 246, 0.1);
-            }
-            
-            /* Content padding for fixed navbar */
-            .main .block-container {
-                padding-top: 0 !important;
-                max-width: 100% !important;
-            }
-            
-            /* Hero Section */
-            .hero-section {
-                min-height: 100vh;
-                display: flex;
-                align-items: center;
-                justify-content: center;
-                background: linear-gradient(135deg, #f0f9ff 0%, #e0f2fe 100%);
-                padding: 8rem 2rem 4rem;
-                margin-top: 70px;
-            }
-            
-            .hero-content {
-                max-width: 1400px;
-                width: 100%;
-                text-align: center;
-            }
-            
-            .hero-title {
-                font-size: 4.5rem;
-                font-weight: 800;
-                background: linear-gradient(135deg, #1e40af 0%, #0891b2 50%, #7c3aed 100%);
-                -webkit-background-clip: text;
-                -webkit-text-fill-color: transparent;
-                margin-bottom: 1.5rem;
-                line-height: 1.2;
-            }
-            
-            .hero-subtitle {
-                font-size: 1.5rem;
-                color: #64748b;
-                margin-bottom: 3rem;
-                font-weight: 400;
-            }
-            
-            /* Section */
-            .section {
-                padding: 6rem 2rem;
-                max-width: 1400px;
-                margin: 0 auto;
-            }
-            
-            .section-title {
-                font-size: 3rem;
-                font-weight: 800;
-                text-align: center;
-                background: linear-gradient(135deg, #1e40af 0%, #0891b2 100%);
-                -webkit-background-clip: text;
-                -webkit-text-fill-color: transparent;
-                margin-bottom: 1rem;
-            }
-            
-            .section-subtitle {
-                font-size: 1.2rem;
-                color: #64748b;
-                text-align: center;
-                margin-bottom: 4rem;
-            }
-            
-            /* Stats Grid */
-            .stats-grid {
-                display: grid;
-                grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-                gap: 2rem;
-                margin-top: 3rem;
-            }
-            
-            .stat-card {
-                background: linear-gradient(135deg, #dbeafe 0%, #bfdbfe 100%);
-                padding: 2rem;
-                border-radius: 16px;
-                text-align: center;
-                border: 2px solid #3b82f6;
-            }
-            
-            .stat-number {
-                font-size: 3rem;
-                font-weight: 800;
-                color: #1e40af;
-                margin-bottom: 0.5rem;
-            }
-            
-            .stat-label {
-                font-size: 1rem;
-                color: #3b82f6;
-            }
-            
-            /* Features Grid */
-            .features-grid {
-                display: grid;
-                grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
-                gap: 2rem;
-                margin-top: 3rem;
-            }
-            
-            .feature-card {
-                background: white;
-                padding: 2.5rem;
-                border-radius: 20px;
-                border: 2px solid rgba(59, 130, 246, 0.15);
-                transition: all 0.3s;
-                text-align: center;
-                box-shadow: 0 4px 16px rgba(0, 0, 0, 0.05);
-            }
-            
-            .feature-card:hover {
-                transform: translateY(-10px);
-                border-color: #3b82f6;
-                box-shadow: 0 20px 40px rgba(59, 130, 246, 0.2);
-            }
-            
-            .feature-icon {
-                font-size: 3rem;
-                margin-bottom: 1.5rem;
-            }
-            
-            .feature-title {
-                font-size: 1.5rem;
-                font-weight: 700;
-                color: #1e293b;
-                margin-bottom: 1rem;
-            }
-            
-            .feature-text {
-                font-size: 1rem;
-                color: #64748b;
-                line-height: 1.6;
-            }
-            
-            /* Assessment Container */
-            .assessment-container {
-                background: white;
-                padding: 3rem;
-                border-radius: 24px;
-                border: 2px solid rgba(59, 130, 246, 0.2);
-                margin-top: 3rem;
-                box-shadow: 0 8px 32px rgba(0, 0, 0, 0.08);
-            }
-            
-            .form-section-title {
-                font-size: 1.5rem;
-                font-weight: 700;
-                color: #3b82f6;
-                margin-bottom: 1.5rem;
-            }
-            
-            /* Results */
-            .results-hero {
-                background: white;
-                padding: 3rem;
-                border-radius: 24px;
-                border: 3px solid #3b82f6;
-                margin: 3rem 0;
-                text-align: center;
-                box-shadow: 0 12px 40px rgba(0, 0, 0, 0.1);
-            }
-            
-            .risk-badge {
-                display: inline-block;
-                padding: 1rem 3rem;
-                border-radius: 50px;
-                font-size: 2.5rem;
-                font-weight: 800;
-                margin-bottom: 1.5rem;
-            }
-            
-            .risk-low {
-                background: linear-gradient(135deg, #059669 0%, #047857 100%);
-                color: white;
-            }
-            
-            .risk-moderate {
-                background: linear-gradient(135deg, #f59e0b 0%, #d97706 100%);
-                color: white;
-            }
-            
-            .risk-high {
-                background: linear-gradient(135deg, #dc2626 0%, #991b1b 100%);
-                color: white;
-            }
-            
-            /* Footer */
-            .footer {
-                background: #f8fafc;
-                padding: 3rem 2rem;
-                text-align: center;
-                border-top: 1px solid rgba(59, 130, 246, 0.1);
-                margin-top: 4rem;
-            }
-            
-            .footer-text {
-                color: #64748b;
-                font-size: 0.95rem;
-                margin: 0.5rem 0;
-            }
-            
-            /* Streamlit Overrides */
-            .stButton>button {
-                width: 100%;
-                background: linear-gradient(135deg, #3b82f6 0%, #2563eb 100%);
-                color: white;
-                padding: 1rem 2rem;
-                font-size: 1.1rem;
-                font-weight: 700;
-                border: none;
-                border-radius: 12px;
-                box-shadow: 0 8px 24px rgba(59, 130, 246, 0.3);
-                transition: all 0.3s ease;
-            }
-            
-            .stButton>button:hover {
-                transform: translateY(-2px);
-                box-shadow: 0 12px 32px rgba(59, 130, 246, 0.5);
-            }
-            
-            /* Form elements */
-            .stSlider {
-                padding: 1rem 0;
-            }
-            
-            .stSelectbox {
-                padding: 0.5rem 0;
-            }
-            
-            .stRadio {
-                padding: 0.5rem 0;
-            }
-            
-            /* Text colors - Light Theme */
-            .main h1, .main h2, .main h3, .main h4 {
-                color: #1e293b !important;
-            }
-            
-            .main p, .main span, .main div {
-                color: #1e293b !important;
-            }
-            
-            .main label {
-                color: #475569 !important;
-            }
-            
-            /* Metric styling */
-            [data-testid="stMetricValue"] {
-                color: #3b82f6 !important;
-                font-size: 2rem !important;
-                font-weight: 800 !important;
-            }
-            
-            [data-testid="stMetricLabel"] {
-                color: #64748b !important;
-            }
-            
-            [data-testid="stMetricDelta"] {
-                color: #64748b !important;
-            }
-            
-            /* Fix Streamlit elements in light theme */
-            .stMarkdown, .stMarkdown p {
-                color: #1e293b !important;
-            }
-            
-            /* Input labels */
-            label[data-testid="stWidgetLabel"] {
-                color: #475569 !important;
-                font-weight: 500 !important;
-            }
-            
-            /* Info box text */
-            .stAlert p {
-                color: #1e293b !important;
-            }
-        </style>
-        """
+    tokens = "\n".join(f"    --{name}: {value};" for name, value in THEME_TOKENS[theme].items())
+    return f"<style>\n:root {{\n{tokens}\n}}\n{THEME_EXTRA_CSS[theme]}</style>"
 
 # Apply theme CSS
+st.markdown(get_base_css(), unsafe_allow_html=True)
 st.markdown(get_theme_css(st.session_state.theme), unsafe_allow_html=True)
 
 # ============================================================================
 # LOAD MODEL & SCALER
 # ============================================================================
+# One router per server process. It holds a hot-reloading registry per
+# model version (see model/registry.py), routes each session to the
+# production or candidate model and scores the other one in shadow (see
+# model/serving.py).
 @st.cache_resource
+def get_model_router():
+    from model.serving import build_router
+    return build_router()
+
 def load_model_and_scaler():
-    try:
-        with open("model/logistic_model.pkl", "rb") as f:
-            model = pickle.load(f)
-        with open("model/scaler.pkl", "rb") as f:
-            scaler = pickle.load(f)
-        try:
-            with open("model/training_report.json", "r") as f:
-                report = json.load(f)
-        except:
-            report = None
-        return model, scaler, report, None
-    except Exception as e:
-        return None, None, None, str(e)
+    router = get_model_router()
+    name, active = router.select(st.session_state.session_key)
+    if active is None:
+        return None, None, None, router.error(name) or "Model artifacts could not be loaded"
+    return active.model, active.scaler, active.report, None
 
 model, scaler, training_report, error = load_model_and_scaler()
 
+# Prediction-path latency histograms and counters in Prometheus format on a
+# local port (CARDIO_METRICS_PORT, see model/metrics.py); started once per process
+@st.cache_resource
+def get_metrics_server():
+    return start_server()
+
+get_metrics_server()
+
+# Every assessment is appended to an audit log (CARDIO_AUDIT_PATH) by a
+# background writer; scoring only copies it into a buffer (see model/audit.py)
+@st.cache_resource
+def get_audit_log():
+    from model.audit import open_audit_log
+    return open_audit_log()
+
+# Streaming statistics over every scored input, compared with the training
+# distribution; drift alerts are logged (see model/drift.py). One monitor per
+# served model version, against the reference saved with that version.
+@st.cache_resource
+def get_drift_monitor(version, _served):
+    from model.drift import DriftMonitor, version_reference
+    return DriftMonitor(version_reference(_served))
+
+# Dataset aggregates written by train.py (model/dataset_stats.py); keyed by
+# the file's mtime so a retrain shows up without a restart
+@st.cache_data
+def load_dataset_stats(mtime):
+    with open(STATS_PATH) as f:
+        return json.load(f)
+
+def get_dataset_stats():
+    try:
+        return load_dataset_stats(os.path.getmtime(STATS_PATH))
+    except (OSError, ValueError):
+        return None
+
+dataset_stats = get_dataset_stats()
+# Headline metrics of the served model, else those recorded with the dataset stats
+metrics = summary_metrics(training_report) or (dataset_stats or {}).get('metrics') or {}
+
+def format_metric(name, spec):
+    return format(metrics[name], spec) if metrics.get(name) is not None else "–"
+
+samples_text = f"{metrics['n_samples'] // 1000}K+" if metrics.get('n_samples') else "–"
+records_text = f"{metrics['n_samples']:,}" if metrics.get('n_samples') else "thousands of"
+# The privacy card discloses the audit log whenever it is enabled
+privacy_text = (
+    "All data processed locally. Each assessment is kept in a local audit log under a random session id; "
+    "no names, no tracking"
+    if get_audit_log() is not None else "All data processed locally. No storage, no tracking, complete privacy"
+)
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 def get_bmi_category(bmi):
-    if bmi < 18.5:
-        return "Underweight", "🔵", "Consider gaining weight"
-    elif 18.5 <= bmi < 25:
-        return "Normal", "🟢", "Maintain current weight"
-    elif 25 <= bmi < 30:
-        return "Overweight", "🟡", "Weight management advised"
-    else:
-        return "Obese", "🔴", "Weight loss recommended"
+    return BMI_CATEGORIES[bmi_category(bmi)]
 
 def get_bp_category(systolic, diastolic):
-    if systolic < 120 and diastolic < 80:
-        return "Normal", "🟢"
-    elif 120 <= systolic < 130 and diastolic < 80:
-        return "Elevated", "🟡"
-    elif 130 <= systolic < 140 or 80 <= diastolic < 90:
-        return "Stage 1 High BP", "🟠"
-    else:
-        return "Stage 2 High BP", "🔴"
+    label, emoji, _ = BP_CATEGORIES[bp_category(systolic, diastolic)]
+    return label, emoji
 
 def get_risk_level(probability):
-    if probability < 0.3:
-        return "LOW RISK", "low", "🟢"
-    elif probability < 0.7:
-        return "MODERATE RISK", "moderate", "🟡"
-    else:
-        return "HIGH RISK", "high", "🔴"
-
-def create_gauge_chart(probability, theme):
-    fig = go.Figure(go.Indicator(
-        mode = "gauge+number",
-        value = probability * 100,
-        domain = {'x': [0, 1], 'y': [0, 1]},
-        title = {'text': "Risk Probability (%)", 'font': {'size': 20, 'color': '#e2e8f0' if theme == 'dark' else '#1e293b'}},
-        gauge = {
-            'axis': {'range': [None, 100], 'tickwidth': 2},
-            'bar': {'color': "#3b82f6"},
-            'bgcolor': "white",
-            'borderwidth': 2,
-            'bordercolor': "#cbd5e1",
-            'steps': [
-                {'range': [0, 30], 'color': '#d1fae5'},
-                {'range': [30, 70], 'color': '#fef3c7'},
-                {'range': [70, 100], 'color': '#fee2e2'}
-            ],
-            'threshold': {
-                'line': {'color': "red", 'width': 4},
-                'thickness': 0.75,
-                'value': 70
-            }
-        }
-    ))
-    
-    fig.update_layout(
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        font={'color': '#e2e8f0' if theme == 'dark' else '#1e293b'},
-        height=350,
-        margin=dict(l=20, r=20, t=50, b=20)
-    )
-    
-    return fig
+    return RISK_LEVELS[risk_level(probability)]
 
 # ============================================================================
 # NAVIGATION BAR
@@ -873,22 +259,22 @@ st.markdown(f"""
 # ============================================================================
 # HERO SECTION
 # ============================================================================
-st.markdown("""
+st.markdown(f"""
 <div id="home" class="hero-section">
 <div class="hero-content">
 <h1 class="hero-title">CardioGuard AI</h1>
 <p class="hero-subtitle">Advanced AI-Powered Cardiovascular Disease Risk Assessment</p>
 <div class="stats-grid">
 <div class="stat-card">
-<div class="stat-number">73%</div>
+<div class="stat-number">{format_metric('accuracy', '.0%')}</div>
 <div class="stat-label">Accuracy</div>
 </div>
 <div class="stat-card">
-<div class="stat-number">0.82</div>
+<div class="stat-number">{format_metric('roc_auc', '.2f')}</div>
 <div class="stat-label">ROC-AUC Score</div>
 </div>
 <div class="stat-card">
-<div class="stat-number">70K+</div>
+<div class="stat-number">{samples_text}</div>
 <div class="stat-label">Training Samples</div>
 </div>
 <div class="stat-card">
@@ -903,7 +289,7 @@ st.markdown("""
 # ============================================================================
 # FEATURES SECTION
 # ============================================================================
-st.markdown("""
+st.markdown(f"""
 <div id="features" class="section">
 <h2 class="section-title">Why Choose CardioGuard AI?</h2>
 <p class="section-subtitle">Powered by advanced machine learning algorithms for accurate health predictions</p>
@@ -912,7 +298,7 @@ st.markdown("""
 <div class="feature-card">
 <div class="feature-icon">🤖</div>
 <h3 class="feature-title">AI-Powered Analysis</h3>
-<p class="feature-text">Sophisticated machine learning model trained on 70,000+ medical records for accurate predictions</p>
+<p class="feature-text">Sophisticated machine learning model trained on {records_text} medical records for accurate predictions</p>
 </div>
 
 <div class="feature-card">
@@ -930,7 +316,7 @@ st.markdown("""
 <div class="feature-card">
 <div class="feature-icon">🔒</div>
 <h3 class="feature-title">Privacy First</h3>
-<p class="feature-text">All data processed locally. No storage, no tracking, complete privacy</p>
+<p class="feature-text">{privacy_text}</p>
 </div>
 
 <div class="feature-card">
@@ -955,9 +341,10 @@ st.markdown('<div id="assessment" class="section">', unsafe_allow_html=True)
 st.markdown('<h2 class="section-title">Health Risk Assessment</h2>', unsafe_allow_html=True)
 st.markdown('<p class="section-subtitle">Complete the form below for a comprehensive cardiovascular risk evaluation</p>', unsafe_allow_html=True)
 
-if error:
-    st.error(f"❌ Error loading model: {error}")
-else:
+# The inputs run as a fragment: moving a slider or changing a selectbox reruns
+# only this function instead of the whole page (navbar, hero, about, results).
+@st.fragment
+def assessment_form():
     # Create a container for the assessment form
     with st.container():
         st.markdown('<div class="assessment-container">', unsafe_allow_html=True)
@@ -969,7 +356,7 @@ else:
         with col1:
             age_years = st.slider("Age (years)", 18, 100, 45, key="age")
         with col2:
-            gender = st.selectbox("Gender", ["Female", "Male"], key="gender")
+            gender = st.selectbox("Gender", GENDER_OPTIONS, key="gender")
         with col3:
             height = st.slider("Height (cm)", 120, 220, 165, key="height")
         
@@ -977,7 +364,7 @@ else:
         with col1:
             weight = st.slider("Weight (kg)", 30, 200, 70, key="weight")
         with col2:
-            BMI = weight / ((height / 100) ** 2)
+            BMI = compute_bmi(weight, height)
             bmi_cat, bmi_emoji, bmi_advice = get_bmi_category(BMI)
             st.metric("Body Mass Index (BMI)", f"{BMI:.1f}", f"{bmi_emoji} {bmi_cat}")
         
@@ -996,12 +383,12 @@ else:
         with col2:
             cholesterol = st.selectbox(
                 "Cholesterol Level",
-                ["Normal", "Above Normal", "Well Above Normal"],
+                LEVEL_OPTIONS,
                 key="cholesterol"
             )
             gluc = st.selectbox(
                 "Glucose Level",
-                ["Normal", "Above Normal", "Well Above Normal"],
+                LEVEL_OPTIONS,
                 key="glucose"
             )
         
@@ -1022,75 +409,148 @@ else:
         
         # Analyze Button
         if st.button("🔬 Analyze Cardiovascular Risk", type="primary", key="analyze_btn"):
-            with st.spinner("🔄 Analyzing your health data..."):
-                # Encode features
-                gender_encoded = 1 if gender == "Male" else 0
-                cholesterol_encoded = ["Normal", "Above Normal", "Well Above Normal"].index(cholesterol)
-                gluc_encoded = ["Normal", "Above Normal", "Well Above Normal"].index(gluc)
-                smoke_encoded = 1 if smoke == "Smoker" else 0
-                alco_encoded = 1 if alco == "Yes" else 0
-                active_encoded = 1 if active == "Yes" else 0
-                
-                # Prepare features
-                numeric_features = np.array([[age_years, height, weight, ap_hi, ap_lo, BMI]])
-                numeric_scaled = scaler.transform(numeric_features)
-                categorical_features = np.array([[gender_encoded, cholesterol_encoded, gluc_encoded, 
-                                                smoke_encoded, alco_encoded, active_encoded]])
-                input_final = np.hstack((numeric_scaled, categorical_features))
-                
-                # Prediction
-                prob = model.predict_proba(input_final)[0]
-                pred = model.predict(input_final)[0]
-                
-                risk_text, risk_class, risk_emoji = get_risk_level(prob)
-                
-                st.session_state.show_results = True
-                st.session_state.prediction_data = {
-                    'prob': prob,
-                    'pred': pred,
-                    'risk_text': risk_text,
-                    'risk_class': risk_class,
-                    'risk_emoji': risk_emoji,
-                    'BMI': BMI,
-                    'bmi_cat': bmi_cat,
-                    'bmi_emoji': bmi_emoji,
-                    'ap_hi': ap_hi,
-                    'ap_lo': ap_lo,
-                    'bp_cat': bp_cat,
-                    'bp_emoji': bp_emoji,
-                    'cholesterol': cholesterol,
-                    'gluc': gluc,
-                    'age_years': age_years,
-                    'gender': gender,
-                    'height': height,
-                    'weight': weight,
-                    'smoke': smoke,
-                    'alco': alco,
-                    'active': active,
-                    'smoke_encoded': smoke_encoded,
-                    'alco_encoded': alco_encoded,
-                    'active_encoded': active_encoded
-                }
-                st.rerun()
+            preprocess_start = time.perf_counter()
+            
+            # Encode features
+            gender_encoded = GENDER_OPTIONS.index(gender)
+            cholesterol_encoded = LEVEL_OPTIONS.index(cholesterol)
+            gluc_encoded = LEVEL_OPTIONS.index(gluc)
+            smoke_encoded = 1 if smoke == "Smoker" else 0
+            alco_encoded = 1 if alco == "Yes" else 0
+            active_encoded = 1 if active == "Yes" else 0
+            
+            # Prepare features (training column order, unscaled)
+            input_raw = encode_patient(
+                age_years, gender_encoded, height, weight, ap_hi, ap_lo,
+                cholesterol_encoded, gluc_encoded, smoke_encoded, alco_encoded, active_encoded
+            )[np.newaxis, :]
+            
+            # Reject inputs outside the training data's outlier filters
+            violations = violation_masks(input_raw)[0]
+            preprocess_seconds = time.perf_counter() - preprocess_start
+            if violations:
+                for code in reason_codes(violations):
+                    METRICS.counter(REJECTED_TOTAL, reason=code).inc()
+                reasons = "\n".join(f"- {REASON_MESSAGES[code]}" for code in reason_codes(violations))
+                st.warning(f"⚠️ These values are outside the range the model was trained on:\n{reasons}")
+                # Don't leave the previous patient's result under the warning
+                st.session_state.show_results = False
+                st.session_state.prediction_data = None
+            else:
+                with st.spinner("🔄 Analyzing your health data..."):
+                    # Prediction (routed model; any other model scores it in shadow)
+                    router = get_model_router()
+                    proba, served_by, served_version = router.score(input_raw, key=st.session_state.session_key)
+                    router.metrics[served_by].stages['preprocess'].observe(preprocess_seconds)
+                    prob = proba[0]
+                    pred = int(prob >= 0.5)
+                    get_drift_monitor(served_version.version, served_version).observe(input_raw[0])
+                    
+                    input_scaled = scale_features(input_raw.copy(), served_version.scaler)
+                    
+                    # Uncertainty: spread of the bagged ensemble's members, when one is deployed
+                    ensemble_prob, prob_interval = None, None
+                    if served_version.ensemble is not None:
+                        mean, _, lower, upper = served_version.ensemble.predict_interval(input_scaled)
+                        ensemble_prob, prob_interval = float(mean[0]), (float(lower[0]), float(upper[0]))
+                    
+                    # Standing in the training population (binary search over stored quantiles)
+                    percentiles = None
+                    if served_version.population is not None:
+                        population = served_version.population
+                        percentiles = {
+                            'risk': population.percentile('risk', float(prob)),
+                            'ap_hi': population.percentile('ap_hi', ap_hi),
+                            'ap_lo': population.percentile('ap_lo', ap_lo),
+                            'BMI': population.percentile('BMI', float(BMI))
+                        }
+                    
+                    # Per-feature contributions to the logit vs. the training population
+                    contribution_row = contributions(
+                        served_version.model, input_scaled, feature_baseline(served_version.report)
+                    )[0]
+                    
+                    risk_text, risk_class, risk_emoji = get_risk_level(prob)
+                    
+                    audit_log = get_audit_log()
+                    if audit_log is not None:
+                        audit_log.record(input_raw[0], prob, risk_text, served_by, served_version.version,
+                                         session=st.session_state.session_key)
+                    
+                    st.session_state.show_results = True
+                    st.session_state.prediction_data = {
+                        'prob': prob,
+                        'model_name': served_by,
+                        'model_version': served_version.version,
+                        'served_version': served_version,
+                        'contributions': contribution_row,
+                        'ensemble_prob': ensemble_prob,
+                        'prob_interval': prob_interval,
+                        'percentiles': percentiles,
+                        'pred': pred,
+                        'risk_text': risk_text,
+                        'risk_class': risk_class,
+                        'risk_emoji': risk_emoji,
+                        'BMI': BMI,
+                        'bmi_cat': bmi_cat,
+                        'bmi_emoji': bmi_emoji,
+                        'ap_hi': ap_hi,
+                        'ap_lo': ap_lo,
+                        'bp_cat': bp_cat,
+                        'bp_emoji': bp_emoji,
+                        'cholesterol': cholesterol,
+                        'gluc': gluc,
+                        'age_years': age_years,
+                        'gender': gender,
+                        'height': height,
+                        'weight': weight,
+                        'smoke': smoke,
+                        'alco': alco,
+                        'active': active,
+                        'smoke_encoded': smoke_encoded,
+                        'alco_encoded': alco_encoded,
+                        'active_encoded': active_encoded,
+                        'render_pending': True
+                    }
+                    # Full rerun so the results section below picks up the new prediction
+                    st.rerun(scope="app")
         
         st.markdown('</div>', unsafe_allow_html=True)
+
+if error:
+    st.error(f"❌ Error loading model: {error}")
+else:
+    assessment_form()
     
     # ============================================================================
     # RESULTS SECTION
     # ============================================================================
     if st.session_state.show_results:
         data = st.session_state.prediction_data
+        # The version that scored this assessment also computes its plan and what-if curves
+        served = data['served_version']
+        render_start = time.perf_counter()
         
         st.markdown("<br><br>", unsafe_allow_html=True)
         st.markdown('<h2 class="section-title">📋 Assessment Results</h2>', unsafe_allow_html=True)
         
         # Risk Badge
+        interval_html = ""
+        if data.get('prob_interval') is not None:
+            lower, upper = data['prob_interval']
+            interval_html = (f'<p style="font-size: 1.1rem; opacity: 0.8; margin-top: 0;">'
+                             f'Bootstrap ensemble: {data["ensemble_prob"]*100:.1f}%, spread across its models '
+                             f'{lower*100:.1f}% – {upper*100:.1f}% (90%)</p>')
+        percentile_html = ""
+        if data.get('percentiles') is not None:
+            percentile_html = (f'<p style="font-size: 1.1rem; opacity: 0.8; margin-top: 0;">'
+                               f'Your risk is higher than {data["percentiles"]["risk"]:.0f}% of the screened population</p>')
         st.markdown(f"""
         <div class="results-hero">
             <div class="risk-badge risk-{data['risk_class']}">
                 {data['risk_emoji']} {data['risk_text']}
             </div>
-            <h2 style="font-size: 2rem; margin-bottom: 0.5rem;">Disease Probability: {data['prob']*100:.1f}%</h2>
+            <h2 style="font-size: 2rem; margin-bottom: 0.5rem;">Disease Probability: {data['prob']*100:.1f}%</h2>{interval_html}{percentile_html}
             <p style="font-size: 1.1rem; opacity: 0.8;">Based on comprehensive health metrics and lifestyle analysis</p>
         </div>
         """, unsafe_allow_html=True)
@@ -1098,8 +558,11 @@ else:
         # Gauge Chart
         col1, col2, col3 = st.columns([1, 2, 1])
         with col2:
-            gauge_fig = create_gauge_chart(data['prob'], st.session_state.theme)
-            st.plotly_chart(gauge_fig, use_container_width=True)
+            if GAUGE_RENDERER == "svg":
+                st.markdown(create_svg_gauge(data['prob'], st.session_state.theme), unsafe_allow_html=True)
+            else:
+                gauge_fig = create_gauge_chart(data['prob'], st.session_state.theme)
+                st.plotly_chart(gauge_fig, use_container_width=True)
         
         # Health Metrics Dashboard
         st.markdown('<h3 class="section-title" style="font-size: 2rem; margin-top: 3rem;">📊 Your Health Dashboard</h3>', unsafe_allow_html=True)
@@ -1108,9 +571,14 @@ else:
         
         with col1:
             st.metric("BMI", f"{data['BMI']:.1f}", f"{data['bmi_emoji']} {data['bmi_cat']}")
+            if data.get('percentiles') is not None:
+                st.caption(f"Higher than {data['percentiles']['BMI']:.0f}% of screened patients")
         
         with col2:
             st.metric("Blood Pressure", f"{data['ap_hi']}/{data['ap_lo']}", f"{data['bp_emoji']} {data['bp_cat']}")
+            if data.get('percentiles') is not None:
+                st.caption(f"Systolic higher than {data['percentiles']['ap_hi']:.0f}%, "
+                           f"diastolic than {data['percentiles']['ap_lo']:.0f}% of screened patients")
         
         with col3:
             chol_emoji = "🟢" if data['cholesterol'] == "Normal" else "🔴"
@@ -1129,30 +597,34 @@ else:
             with st.container():
                 st.markdown('<div class="assessment-container">', unsafe_allow_html=True)
                 st.markdown("#### 🎯 Identified Risk Factors")
+                st.caption("What the model weighted most, compared with an average patient")
                 
-                risk_factors = []
-                if data['BMI'] >= 25:
-                    risk_factors.append(f"• **High BMI**: {data['BMI']:.1f} (Target: <25)")
-                if "High" in data['bp_cat']:
-                    risk_factors.append(f"• **{data['bp_cat']}**: {data['ap_hi']}/{data['ap_lo']} mmHg")
-                if data['cholesterol'] != "Normal":
-                    risk_factors.append(f"• **{data['cholesterol']} Cholesterol**")
-                if data['gluc'] != "Normal":
-                    risk_factors.append(f"• **{data['gluc']} Glucose**")
-                if data['smoke_encoded'] == 1:
-                    risk_factors.append("• **Smoking** - Major cardiovascular risk")
-                if data['alco_encoded'] == 1:
-                    risk_factors.append("• **Alcohol consumption**")
-                if data['active_encoded'] == 0:
-                    risk_factors.append("• **Physical inactivity**")
-                if data['age_years'] > 55:
-                    risk_factors.append(f"• **Age factor**: {data['age_years']} years")
+                patient_raw = patient_features(data)
+                ranked = ranked_contributions(data['contributions'])
+                risk_factors = [
+                    f"• **{FEATURE_LABELS[name]}** ({format_feature_value(name, patient_raw[COLUMN_INDEX[name]])}): "
+                    f"{value:+.2f} log-odds"
+                    for name, value in ranked if value >= SIGNIFICANT_CONTRIBUTION
+                ]
+                protective = [
+                    f"{FEATURE_LABELS[name]} ({format_feature_value(name, patient_raw[COLUMN_INDEX[name]])})"
+                    for name, value in ranked if value <= -SIGNIFICANT_CONTRIBUTION
+                ]
                 
                 if risk_factors:
                     for factor in risk_factors:
                         st.markdown(factor)
                 else:
                     st.success("✅ No major risk factors identified")
+                if protective:
+                    st.markdown(f"🛡️ **Lowering your risk:** {', '.join(protective)}")
+                
+                st.plotly_chart(
+                    create_contribution_chart(
+                        [FEATURE_LABELS[name] for name, _ in ranked], [value for _, value in ranked], st.session_state.theme
+                    ),
+                    use_container_width=True
+                )
                 
                 st.markdown('</div>', unsafe_allow_html=True)
         
@@ -1161,32 +633,95 @@ else:
                 st.markdown('<div class="assessment-container">', unsafe_allow_html=True)
                 st.markdown("#### 💡 Personalized Recommendations")
                 
-                if data['risk_class'] == "high":
-                    st.error("🏥 **Immediate Action Required**")
-                    st.markdown("• Schedule cardiologist appointment")
-                    st.markdown("• Get comprehensive cardiac evaluation")
-                    st.markdown("• Consider cardiac screening tests")
-                elif data['risk_class'] == "moderate":
-                    st.warning("⚠️ **Preventive Action Needed**")
-                    st.markdown("• Regular health monitoring")
-                    st.markdown("• Implement lifestyle modifications")
-                    st.markdown("• Consult healthcare provider")
-                else:
-                    st.success("✅ **Maintain Healthy Habits**")
-                    st.markdown("• Continue current lifestyle")
-                    st.markdown("• Annual health check-ups")
-                    st.markdown("• Stay physically active")
+                # Band advice plus the targeted recommendations (model/rules.py)
+                categories = categorize(patient_raw[np.newaxis, :], np.array([data['prob']]))
+                advice_emoji, advice_heading, actions = RISK_ADVICE[categories['risk_level'][0]]
+                advice_box = {"high": st.error, "moderate": st.warning}.get(data['risk_class'], st.success)
+                advice_box(f"{advice_emoji} **{advice_heading}**")
+                for action in actions:
+                    st.markdown(f"• {action}")
+                
+                for (_, emoji, text), on in zip(RECOMMENDATIONS, categories['recommendations'][0]):
+                    if on:
+                        st.markdown(f"• **{emoji} {text}**")
                 
-                if data['smoke_encoded'] == 1:
-                    st.markdown("• **🚭 Quit smoking immediately**")
-                if data['BMI'] >= 25:
-                    st.markdown("• **🏃 Start weight management program**")
-                if "High" in data['bp_cat']:
-                    st.markdown("• **🧂 Reduce sodium intake**")
-                    st.markdown("• **💊 Monitor blood pressure daily**")
+                plan = None
+                if data['prob'] >= LOW_RISK_THRESHOLD:
+                    plan_start = time.perf_counter()
+                    plan = find_counterfactual(served.model, served.scaler, patient_features(data))
+                    plan_ms = (time.perf_counter() - plan_start) * 1000
+                    
+                    st.markdown("#### 🧭 Path to Low Risk")
+                    if plan['reached']:
+                        st.markdown(f"Smallest change found that brings your risk under {LOW_RISK_THRESHOLD:.0%} "
+                                    f"(to **{plan['probability']*100:.1f}%**):")
+                    else:
+                        st.markdown(f"No realistic change brings your risk under {LOW_RISK_THRESHOLD:.0%}; "
+                                    f"the largest reduction found (to **{plan['probability']*100:.1f}%**) is:")
+                    for name, (before, after) in plan['changes'].items():
+                        st.markdown(f"• {describe_change(name, before, after)}")
+                    st.caption(f"{plan['evaluated']} candidate plans scored ({plan_ms:.1f} ms)")
                 
                 st.markdown('</div>', unsafe_allow_html=True)
         
+        # What-If Analysis
+        st.markdown('<h3 class="section-title" style="font-size: 2rem; margin-top: 3rem;">📈 What-If Analysis</h3>', unsafe_allow_html=True)
+        
+        whatif_start = time.perf_counter()
+        curves = sensitivity_curves(served.model, served.scaler, patient_features(data))
+        whatif_ms = (time.perf_counter() - whatif_start) * 1000
+        
+        col1, col2, col3 = st.columns(3)
+        for col, (name, label, current) in zip((col1, col2, col3), [
+            ('ap_hi', "Systolic BP (mmHg)", data['ap_hi']),
+            ('ap_lo', "Diastolic BP (mmHg)", data['ap_lo']),
+            ('weight', "Weight (kg)", data['weight'])
+        ]):
+            with col:
+                values, probs = curves[name]
+                st.plotly_chart(
+                    create_sensitivity_chart(values, probs, current, label, st.session_state.theme),
+                    use_container_width=True
+                )
+        
+        col1, col2, col3 = st.columns(3)
+        for col, (name, if_on, if_off) in zip((col1, col2, col3), [
+            ('smoke', "If you smoked", "If you quit smoking"),
+            ('alco', "If you drank alcohol", "If you stopped drinking"),
+            ('active', "If you were physically active", "If you were inactive")
+        ]):
+            with col:
+                current = data[f'{name}_encoded']
+                probs = curves[name][1]
+                st.metric(
+                    if_off if current else if_on,
+                    f"{probs[1 - current]*100:.1f}%",
+                    f"{(probs[1 - current] - probs[current])*100:+.1f} pts",
+                    delta_color="inverse"
+                )
+        
+        n_scenarios = sum(len(values) for values, _ in curves.values())
+        st.caption(f"{n_scenarios} scenarios scored in one batched prediction ({whatif_ms:.1f} ms)")
+        
+        # Shadow evaluation (only when a candidate model is configured)
+        router = get_model_router()
+        if len(router.registries) > 1:
+            with st.expander("🔬 Model Comparison (Shadow Scoring)"):
+                st.caption(f"This prediction was served by the **{data['model_name']}** model "
+                           f"(version {data['model_version']}).")
+                st.table({
+                    name: {
+                        "Version": stats['version'] or "–",
+                        "Served": f"{stats['served']:,}",
+                        "Shadow scored": f"{stats['shadowed']:,}",
+                        "Class agreement": f"{stats['agreement']:.1%}" if stats['agreement'] is not None else "–",
+                        "Risk band agreement": f"{stats['band_agreement']:.1%}" if stats['band_agreement'] is not None else "–",
+                        "Mean |Δ prob|": f"{stats['mean_abs_diff']:.4f}" if stats['mean_abs_diff'] is not None else "–",
+                        "p99 latency (ms)": f"{stats['latency_p99_ms']:.3f}" if stats['latency_p99_ms'] is not None else "–"
+                    }
+                    for name, stats in router.summary().items()
+                })
+        
         # Download Report
         st.markdown("<br>", unsafe_allow_html=True)
         
@@ -1214,10 +749,27 @@ else:
             "results": {
                 "risk_level": data['risk_text'],
                 "disease_probability": round(data['prob'] * 100, 2),
-                "prediction": "Positive" if data['pred'] == 1 else "Negative"
+                "ensemble_probability": round(data['ensemble_prob'] * 100, 2)
+                if data.get('ensemble_prob') is not None else None,
+                "ensemble_probability_range": [round(bound * 100, 2) for bound in data['prob_interval']]
+                if data.get('prob_interval') is not None else None,
+                "prediction": "Positive" if data['pred'] == 1 else "Negative",
+                "population_percentiles": {name: round(value, 1) for name, value in data['percentiles'].items()}
+                if data.get('percentiles') is not None else None,
+                "model": data.get('model_name'),
+                "model_version": data.get('model_version')
             },
-            "risk_factors": risk_factors if risk_factors else ["None identified"]
+            "risk_factors": risk_factors if risk_factors else ["None identified"],
+            "feature_contributions": {
+                name: round(value, 4) for name, value in ranked
+            }
         }
+        if plan is not None:
+            report_data["risk_reduction_plan"] = {
+                "reaches_low_risk": plan['reached'],
+                "disease_probability_after": round(plan['probability'] * 100, 2),
+                "changes": [describe_change(name, *change) for name, change in plan['changes'].items()]
+            }
         
         col1, col2, col3 = st.columns([1, 2, 1])
         with col2:
@@ -1228,13 +780,17 @@ else:
                 mime="application/json",
                 use_container_width=True
             )
+        
+        # Render time is recorded once, for the rerun that shows a new prediction
+        if data.pop('render_pending', False):
+            router.metrics[data['model_name']].stages['render'].observe(time.perf_counter() - render_start)
 
 st.markdown('</div>', unsafe_allow_html=True)
 
 # ============================================================================
 # ABOUT SECTION
 # ============================================================================
-st.markdown("""
+st.markdown(f"""
 <div id="about" class="section">
 <h2 class="section-title">About CardioGuard AI</h2>
 <p class="section-subtitle">Advanced machine learning for cardiovascular health assessment</p>
@@ -1243,13 +799,13 @@ st.markdown("""
 <div class="feature-card">
 <div class="feature-icon">🧠</div>
 <h3 class="feature-title">Machine Learning Model</h3>
-<p class="feature-text">Custom-built Logistic Regression algorithm trained from scratch on 70,000+ medical records with 12 key health features</p>
+<p class="feature-text">Custom-built Logistic Regression algorithm trained from scratch on {records_text} medical records with 12 key health features</p>
 </div>
 
 <div class="feature-card">
 <div class="feature-icon">🎯</div>
 <h3 class="feature-title">High Accuracy</h3>
-<p class="feature-text">73% accuracy with 0.82 ROC-AUC score, providing reliable cardiovascular risk predictions</p>
+<p class="feature-text">{format_metric('accuracy', '.0%')} accuracy with {format_metric('roc_auc', '.2f')} ROC-AUC score, providing reliable cardiovascular risk predictions</p>
 </div>
 
 <div class="feature-card">
@@ -1302,39 +858,39 @@ st.markdown("""
 # ============================================================================
 # STATS SECTION
 # ============================================================================
-st.markdown("""
+st.markdown(f"""
 <div id="stats" class="section">
 <h2 class="section-title">Performance Metrics</h2>
 <p class="section-subtitle">Transparent model performance evaluation</p>
 
 <div class="stats-grid">
 <div class="stat-card">
-<div class="stat-number">73.1%</div>
+<div class="stat-number">{format_metric('accuracy', '.1%')}</div>
 <div class="stat-label">Test Accuracy</div>
 </div>
 
 <div class="stat-card">
-<div class="stat-number">71.2%</div>
+<div class="stat-number">{format_metric('precision', '.1%')}</div>
 <div class="stat-label">Precision</div>
 </div>
 
 <div class="stat-card">
-<div class="stat-number">75.0%</div>
+<div class="stat-number">{format_metric('recall', '.1%')}</div>
 <div class="stat-label">Recall</div>
 </div>
 
 <div class="stat-card">
-<div class="stat-number">0.731</div>
+<div class="stat-number">{format_metric('f1_score', '.3f')}</div>
 <div class="stat-label">F1-Score</div>
 </div>
 
 <div class="stat-card">
-<div class="stat-number">0.820</div>
+<div class="stat-number">{format_metric('roc_auc', '.3f')}</div>
 <div class="stat-label">ROC-AUC</div>
 </div>
 
 <div class="stat-card">
-<div class="stat-number">12</div>
+<div class="stat-number">{format_metric('n_features', 'd')}</div>
 <div class="stat-label">Features</div>
 </div>
 </div>
@@ -1365,6 +921,39 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
+# Dataset dashboards, rendered from the precomputed aggregates
+if dataset_stats is not None:
+    st.markdown(f"""
+<div class="section" style="padding-top: 0;">
+<h3 class="section-title" style="font-size: 2rem;">📊 Dataset Overview</h3>
+<p class="section-subtitle" style="margin-bottom: 2rem;">{dataset_stats['n_samples']:,} patients, {dataset_stats['n_positive'] / dataset_stats['n_samples']:.1%} with cardiovascular disease</p>
+</div>
+""", unsafe_allow_html=True)
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("#### Disease prevalence by age and gender")
+        age_gender = dataset_stats['age_gender']
+        labels, rates = [], []
+        for band, counts, positives in zip(age_gender['age_bands'], age_gender['count'], age_gender['positive']):
+            for gender, count, positive in zip(age_gender['genders'], counts, positives):
+                labels.append(f"{band} · {gender}")
+                rates.append(positive / count if count else 0.0)
+        st.markdown(create_bar_rows(labels, rates, max_value=1), unsafe_allow_html=True)
+    with col2:
+        st.markdown("#### Disease prevalence by systolic BP")
+        hist = dataset_stats['histograms']['ap_hi']
+        rates = [positive / count if count else 0.0 for count, positive in zip(hist['count'], hist['positive'])]
+        st.markdown(create_bar_rows(bin_labels(hist), rates, max_value=1), unsafe_allow_html=True)
+    
+    col1, col2, col3 = st.columns(3)
+    for col, name in zip((col1, col2, col3), ('age_years', 'BMI', 'ap_lo')):
+        with col:
+            st.markdown(f"#### {FEATURE_LABELS[name]} distribution")
+            hist = dataset_stats['histograms'][name]
+            shares = [count / dataset_stats['n_samples'] for count in hist['count']]
+            st.markdown(create_bar_rows(bin_labels(hist), shares), unsafe_allow_html=True)
+
 # ============================================================================
 # FOOTER
 # ============================================================================
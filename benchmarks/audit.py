@@ -0,0 +1,144 @@
+"""
+Audit log benchmark.
+
+Scores single patients through the router and compares the prediction
+path's p50/p99 latency with no audit log, with the buffered audit log
+(model/audit.py) and with a synchronous, fsynced JSON-lines write per
+prediction: first at a steady arrival rate, then back to back (the writer
+competing for the CPU). Checks that every accepted record reached the
+(rotated) files, then fills a small buffer faster than it drains to
+exercise the backpressure policy.
+
+Usage:
+    python -m benchmarks.audit [--predictions 5000] [--rate 500] [--model-dir model]
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.export import encoded_row, random_patient
+from model.audit import AuditLog
+from model.metrics import MetricsRegistry
+from model.registry import ModelRegistry
+from model.rules import RISK_LEVELS, risk_level
+from model.serving import ModelRouter, candidate_artifacts
+
+
+def timed_predictions(router, rows, audit=None, rate=None):
+    """Per-prediction latency (ms) of scoring plus the audit call, optionally paced at rate/s"""
+    latencies = np.empty(len(rows))
+    first = time.perf_counter()
+    for i, row in enumerate(rows):
+        if rate:
+            time.sleep(max(0.0, first + i / rate - time.perf_counter()))
+        start = time.perf_counter()
+        proba, name, active = router.score(row[np.newaxis, :])
+        risk = RISK_LEVELS[risk_level(proba[0])][0]  # the app labels every prediction anyway
+        if audit is not None:
+            audit(row, proba[0], risk, name, active.version)
+        latencies[i] = time.perf_counter() - start
+    return latencies * 1000
+
+
+def synchronous_writer(path):
+    f = open(path, 'a', encoding='utf-8')
+
+    def write(row, probability, risk, model, version):
+        f.write(json.dumps({'ts': round(time.time(), 3), 'model': model, 'version': version,
+                            'probability': round(float(probability), 6), 'risk': risk, 'x': row.tolist()},
+                           separators=(',', ':')) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+    return write, f
+
+
+def count_records(path):
+    """Assessment lines and dropped-marker totals across the file and its backups"""
+    records = dropped = 0
+    for name in glob.glob(f"{path}*"):
+        with open(name) as f:
+            for line in f:
+                entry = json.loads(line)
+                if 'probability' in entry:
+                    records += 1
+                elif entry.get('event') == 'dropped':
+                    dropped += entry['count']
+    return records, dropped
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--predictions", type=int, default=5000, help="patients scored per variant")
+    parser.add_argument("--rate", type=float, default=500, help="arrivals per second in the paced runs")
+    parser.add_argument("--model-dir", default="model", help="directory with the model artifacts")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    router = ModelRouter({'production': ModelRegistry(candidate_artifacts(args.model_dir))},
+                         metrics=MetricsRegistry())
+    if router.select()[1] is None:
+        print("❌ Could not load the model artifacts")
+        sys.exit(1)
+    rng = np.random.default_rng(args.seed)
+    rows = [encoded_row(random_patient(rng)) for _ in range(args.predictions)]
+    timed_predictions(router, rows[:1000])  # warm up
+
+    with tempfile.TemporaryDirectory() as directory:
+        results = {}
+        audits = []
+        for pacing, rate in [(f"{args.rate:g}/s", args.rate), ("back to back", None)]:
+            results[f"No audit log, {pacing}"] = timed_predictions(router, rows, rate=rate)
+
+            path = os.path.join(directory, f"audit-{len(audits)}.jsonl")
+            audit = AuditLog(path, max_bytes=256 * 1024, backups=1000)
+            results[f"Buffered audit log, {pacing}"] = timed_predictions(router, rows, audit.record, rate)
+            audit.close()
+            audits.append((audit, count_records(path)[0], len(glob.glob(f"{path}*"))))
+
+            if rate:
+                write, f = synchronous_writer(os.path.join(directory, "sync.jsonl"))
+                results[f"Synchronous write, {pacing}"] = timed_predictions(router, rows, write, rate)
+                f.close()
+
+        # Backpressure: a 256-slot buffer that never blocks, filled in a tight loop
+        burst_path = os.path.join(directory, "burst.jsonl")
+        burst = AuditLog(burst_path, capacity=256, batch_size=64, block_timeout=0)
+        row = rows[0]
+        for _ in range(args.predictions):
+            burst.record(row, 0.5, "MODERATE RISK", 'production', 'burst')
+        burst.close()
+        burst_records, burst_marked = count_records(burst_path)
+
+    print(f"\n{'='*70}")
+    print(f"AUDIT LOG ({args.predictions:,} single-patient predictions per variant)")
+    print(f"{'='*70}")
+    print(f"{'Variant':<38}{'p50 (ms)':>10}{'p99 (ms)':>10}{'max (ms)':>10}")
+    for name, latencies in results.items():
+        print(f"{name:<38}{np.percentile(latencies, 50):10.4f}{np.percentile(latencies, 99):10.4f}"
+              f"{latencies.max():10.2f}")
+    missing = 0
+    for audit, on_disk, n_files in audits:
+        missing += abs(on_disk - audit.recorded) + (args.predictions - audit.recorded - audit.dropped)
+        print(f"Buffered: {audit.recorded:,} accepted, {audit.dropped:,} dropped, "
+              f"{on_disk:,} on disk across {n_files} files")
+    print(f"Burst into 256 slots: {burst.recorded:,} written, {burst.dropped:,} dropped "
+          f"({burst_marked:,} recorded in drop markers)")
+    print(f"{'='*70}\n")
+
+    if missing:
+        print("❌ Audit records missing from disk")
+        sys.exit(1)
+    if burst_records != burst.recorded or burst_marked != burst.dropped:
+        print("❌ Dropped records are not accounted for in the log")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
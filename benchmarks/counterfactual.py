@@ -0,0 +1,133 @@
+"""
+Counterfactual search benchmark.
+
+Runs the risk-reduction search (model/counterfactual.py) for a batch of
+random patients above the low-risk cut point and reports search latency,
+how many candidate plans were scored, and how often a plan was found. Then
+checks the pruned search against scoring every unpruned plan, with the
+model's own calibration and with an isotonic calibrator fitted on
+synthetic patients (its flat steps are where pruning on calibrated
+probabilities would go wrong).
+
+Usage:
+    python -m benchmarks.counterfactual [--patients 500] [--checked 200] [--seed 0]
+"""
+
+import argparse
+import copy
+import pickle
+import sys
+import time
+
+import numpy as np
+
+from model.LogisticRegression import sigmoid
+from model.calibration import fit_isotonic
+from model.counterfactual import (LOW_RISK_THRESHOLD, apply_moves, candidate_moves, find_counterfactual,
+                                  move_costs)
+from model.features import encode_patient, scale_features
+from model.synthetic import CohortGenerator
+
+
+def load_artifacts():
+    with open("model/logistic_model.pkl", "rb") as f:
+        model = pickle.load(f)
+    with open("model/scaler.pkl", "rb") as f:
+        scaler = pickle.load(f)
+    return model, scaler
+
+
+def random_patients(model, scaler, n, rng):
+    patients = []
+    while len(patients) < n:
+        ap_lo = int(rng.integers(70, 111))
+        row = encode_patient(
+            age_years=int(rng.integers(30, 70)), gender=int(rng.integers(0, 2)),
+            height=int(rng.integers(150, 195)), weight=int(rng.integers(55, 120)),
+            ap_hi=ap_lo + int(rng.integers(30, 80)), ap_lo=ap_lo,
+            cholesterol=int(rng.integers(0, 3)), gluc=int(rng.integers(0, 3)),
+            smoke=int(rng.integers(0, 2)), alco=int(rng.integers(0, 2)), active=int(rng.integers(0, 2))
+        )
+        if model.predict_proba(scale_features(row[np.newaxis, :].copy(), scaler))[0] >= LOW_RISK_THRESHOLD:
+            patients.append(row)
+    return patients
+
+
+def brute_force(model, scaler, row, target=LOW_RISK_THRESHOLD):
+    """(reached, cost) of the cheapest plan under target among every unpruned plan"""
+    moves = candidate_moves(row)
+    costs = move_costs(row, moves)
+    names = list(moves)
+    grid = np.indices([len(moves[name]) for name in names]).reshape(len(names), -1).T
+    values = np.column_stack([moves[name][grid[:, j]] for j, name in enumerate(names)])
+    cost = np.sum([costs[name][grid[:, j]] for j, name in enumerate(names)], axis=0)
+    plausible = values[:, names.index('ap_hi')] > values[:, names.index('ap_lo')]
+    proba = model.predict_proba(scale_features(apply_moves(row, names, values[plausible]), scaler))
+    under = cost[plausible][proba < target]
+    return (True, float(under.min())) if len(under) else (False, None)
+
+
+def mismatches(model, scaler, patients):
+    """Patients told no plan exists when one does, and plans costing more than needed"""
+    missed = costlier = 0
+    for row in patients:
+        plan = find_counterfactual(model, scaler, row)
+        reached, cost = brute_force(model, scaler, row)
+        missed += reached and not plan['reached']
+        costlier += reached and plan['reached'] and plan['cost'] > cost + 1e-9
+    return missed, costlier
+
+
+def with_isotonic(model, scaler, rng):
+    """Copy of model with an isotonic calibrator fitted on synthetic patients"""
+    X_raw, y = CohortGenerator().sample(20000, rng)
+    X = scale_features(X_raw, scaler)
+    isotonic = copy.copy(model)
+    isotonic.calibrator = fit_isotonic(sigmoid(np.dot(X, model.weights) + model.bias), y)
+    return isotonic
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--patients", type=int, default=500, help="number of searched patients")
+    parser.add_argument("--checked", type=int, default=200, help="patients checked against brute force")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for the patients")
+    args = parser.parse_args()
+
+    model, scaler = load_artifacts()
+    patients = random_patients(model, scaler, args.patients, np.random.default_rng(args.seed))
+
+    timings, evaluated, reached = [], [], 0
+    for row in patients:
+        start = time.perf_counter()
+        plan = find_counterfactual(model, scaler, row)
+        timings.append(time.perf_counter() - start)
+        evaluated.append(plan['evaluated'])
+        reached += plan['reached']
+
+    timings = np.array(timings) * 1000
+    print(f"\n{'='*70}")
+    print(f"COUNTERFACTUAL SEARCH ({args.patients} patients above {LOW_RISK_THRESHOLD:.0%} risk)")
+    print(f"{'='*70}")
+    print(f"{'Latency p50:':<30}{np.percentile(timings, 50):8.3f} ms")
+    print(f"{'Latency p99:':<30}{np.percentile(timings, 99):8.3f} ms")
+    print(f"{'Latency max:':<30}{timings.max():8.3f} ms")
+    print(f"{'Candidates scored (mean):':<30}{np.mean(evaluated):8.0f}")
+    print(f"{'Low risk reachable:':<30}{reached / len(patients):8.1%}")
+
+    isotonic = with_isotonic(model, scaler, np.random.default_rng(args.seed + 1))
+    checked = patients[:args.checked]
+    failures = 0
+    for label, candidate in (("model's calibration", model), ("isotonic calibrator", isotonic)):
+        missed, costlier = mismatches(candidate, scaler, checked)
+        failures += missed + costlier
+        print(f"{f'Vs brute force, {label}:':<38}{missed} missed / {costlier} costlier of {len(checked)}")
+    print(f"{'='*70}\n")
+
+    if failures:
+        print("❌ Pruned search disagrees with brute force")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
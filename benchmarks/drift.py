@@ -0,0 +1,82 @@
+"""
+Input drift monitor benchmark.
+
+Measures the per-prediction cost of DriftMonitor.observe(), checks that it
+does not allocate, and compares it with the batched update() and a full
+PSI/KS evaluation.
+
+Usage:
+    python -m benchmarks.drift [--rows 20000]
+"""
+
+import argparse
+import pickle
+import time
+import tracemalloc
+
+import numpy as np
+
+from model.drift import DriftMonitor, load_reference
+from model.features import encode_patient
+
+
+def random_rows(n, rng):
+    ap_lo = rng.integers(70, 111, n)
+    return np.stack([
+        encode_patient(*values) for values in zip(
+            rng.integers(30, 65, n), rng.integers(0, 2, n), rng.integers(150, 195, n),
+            rng.integers(55, 120, n), ap_lo + rng.integers(30, 80, n), ap_lo,
+            rng.integers(0, 3, n), rng.integers(0, 3, n), rng.integers(0, 2, n),
+            rng.integers(0, 2, n), rng.integers(0, 2, n)
+        )
+    ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=20000, help="observed rows")
+    args = parser.parse_args()
+
+    with open("model/scaler.pkl", "rb") as f:
+        scaler = pickle.load(f)
+    reference = load_reference(scaler)
+    X = random_rows(args.rows, np.random.default_rng(0))
+
+    # check_every is pushed out so only observe() itself is timed
+    monitor = DriftMonitor(reference, check_every=10 ** 12)
+    for row in X[:1000]:
+        monitor.observe(row)
+    start = time.perf_counter()
+    for row in X:
+        monitor.observe(row)
+    observe_us = (time.perf_counter() - start) / len(X) * 1e6
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for row in X[:5000]:
+        monitor.observe(row)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+
+    batch = DriftMonitor(reference)
+    start = time.perf_counter()
+    batch.update(X)
+    update_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    batch.drift()
+    drift_ms = (time.perf_counter() - start) * 1000
+
+    print(f"\n{'='*70}")
+    print(f"INPUT DRIFT MONITOR ({args.rows:,} rows)")
+    print(f"{'='*70}")
+    print(f"{'observe() per prediction:':<40}{observe_us:10.2f} us")
+    print(f"{'Net bytes allocated by 5,000 observe():':<40}{allocated:10,}")
+    print(f"{'update() for the whole batch:':<40}{update_ms:10.2f} ms")
+    print(f"{'PSI/KS evaluation (all 12 features):':<40}{drift_ms:10.2f} ms")
+    print(f"{'='*70}\n")
+
+
+if __name__ == "__main__":
+    main()
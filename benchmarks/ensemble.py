@@ -0,0 +1,74 @@
+"""
+Bagged ensemble benchmark.
+
+Compares scoring all members with the stacked weight matrix against one
+LogisticRegression.predict_proba call per member, and times parallel
+training across the process pool against a single worker.
+
+Usage:
+    python -m benchmarks.ensemble [--models 25] [--rows 20000] [--iters 300]
+"""
+
+import argparse
+import os
+import statistics
+import time
+
+import numpy as np
+
+from model.LogisticRegression import LogisticRegression
+from model.ensemble import fit_bagged
+
+
+def timed(fn, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--models", type=int, default=25, help="ensemble members")
+    parser.add_argument("--rows", type=int, default=20000, help="synthetic training rows")
+    parser.add_argument("--iters", type=int, default=300, help="gradient descent iterations per member")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(args.rows, 12))
+    y = (rng.uniform(size=args.rows) < 1 / (1 + np.exp(-X @ rng.normal(size=12)))).astype(int)
+
+    cores = os.cpu_count() or 1
+    start = time.perf_counter()
+    fit_bagged(X, y, n_models=args.models, n_iters=args.iters, n_jobs=1)
+    serial = time.perf_counter() - start
+    start = time.perf_counter()
+    ensemble = fit_bagged(X, y, n_models=args.models, n_iters=args.iters, n_jobs=cores)
+    parallel = time.perf_counter() - start
+
+    members = []
+    for weights, bias in zip(ensemble.weights, ensemble.biases):
+        member = LogisticRegression()
+        member.weights, member.bias = weights, bias
+        members.append(member)
+
+    print(f"\n{'='*70}")
+    print(f"BAGGED ENSEMBLE ({args.models} models)")
+    print(f"{'='*70}")
+    print(f"{'Training, 1 worker:':<34}{serial:10.2f} s")
+    print(f"{f'Training, {cores} workers:':<34}{parallel:10.2f} s  ({serial/parallel:.1f}x)")
+    print("\nMember probabilities (ms):")
+    print(f"{'Rows':<10}{'Stacked matrix':>18}{'Per-member loop':>18}{'+ interval':>14}")
+    for rows in (1, 1000, 100_000):
+        batch = X[:rows] if rows <= len(X) else rng.normal(size=(rows, 12))
+        stacked = timed(lambda: ensemble.member_proba(batch), 20)
+        looped = timed(lambda: np.stack([m.predict_proba(batch) for m in members], axis=1), 20)
+        interval = timed(lambda: ensemble.predict_interval(batch), 20)
+        print(f"{rows:<10,}{stacked*1000:>18.3f}{looped*1000:>18.3f}{interval*1000:>14.3f}")
+    print(f"{'='*70}\n")
+
+
+if __name__ == "__main__":
+    main()
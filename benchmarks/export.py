@@ -0,0 +1,124 @@
+"""
+Standalone scorer parity check and benchmark.
+
+Generates the dependency-free scoring module (export_scorer.py) for a model
+directory, checks it against LogisticRegression.predict_proba and the risk
+bands on random patients, and compares the per-call latency of one patient
+with the numpy path the app uses.
+
+Usage:
+    python -m benchmarks.export [--patients 10000] [--model-dir model] [--seed 0]
+"""
+
+import argparse
+import importlib.util
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from export_scorer import generate_scorer
+from model.features import GENDER_OPTIONS, LEVEL_OPTIONS, encode_patient, scale_features
+from model.registry import ModelRegistry
+from model.rules import RISK_CUTS, RISK_LEVELS, risk_level
+from model.serving import candidate_artifacts
+
+TOLERANCE = 1e-9
+
+
+def load_scorer(source):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "cardio_scorer.py")
+        with open(path, "w") as f:
+            f.write(source)
+        spec = importlib.util.spec_from_file_location("cardio_scorer", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    return module
+
+
+def random_patient(rng):
+    # Same ranges as the app's input widgets
+    return {
+        'age_years': int(rng.integers(18, 101)), 'gender': GENDER_OPTIONS[rng.integers(0, 2)],
+        'height': int(rng.integers(120, 221)), 'weight': int(rng.integers(30, 201)),
+        'ap_hi': int(rng.integers(80, 251)), 'ap_lo': int(rng.integers(40, 151)),
+        'cholesterol': LEVEL_OPTIONS[rng.integers(0, 3)], 'gluc': LEVEL_OPTIONS[rng.integers(0, 3)],
+        'smoke': int(rng.integers(0, 2)), 'alco': int(rng.integers(0, 2)), 'active': int(rng.integers(0, 2))
+    }
+
+
+def encoded_row(patient):
+    return encode_patient(**{
+        **patient,
+        'gender': GENDER_OPTIONS.index(patient['gender']),
+        'cholesterol': LEVEL_OPTIONS.index(patient['cholesterol']),
+        'gluc': LEVEL_OPTIONS.index(patient['gluc'])
+    })
+
+
+def per_call_us(fn, repeats=5, calls=2000):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        timings.append((time.perf_counter() - start) / calls * 1e6)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--patients", type=int, default=10000, help="random patients for the parity check")
+    parser.add_argument("--model-dir", default="model", help="directory with the model artifacts")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    active = ModelRegistry(candidate_artifacts(args.model_dir)).get()
+    if active is None:
+        print("❌ Could not load the model artifacts")
+        sys.exit(1)
+    source = generate_scorer(active.model, active.scaler, active.version)
+    scorer = load_scorer(source)
+
+    rng = np.random.default_rng(args.seed)
+    patients = [random_patient(rng) for _ in range(args.patients)]
+    X = scale_features(np.array([encoded_row(p) for p in patients]), active.scaler)
+    expected = active.model.predict_proba(X)
+    expected_levels = [RISK_LEVELS[i][0] for i in risk_level(expected)]
+    generated = [scorer.score(**p) for p in patients]
+    max_diff = max(abs(p - e) for (p, _), e in zip(generated, expected))
+    # Probabilities within TOLERANCE of a cut point may land on either side
+    near_cut = np.min(np.abs(expected[:, None] - np.array(RISK_CUTS)), axis=1) < TOLERANCE
+    level_mismatches = sum(
+        level != e for (_, level), e, near in zip(generated, expected_levels, near_cut) if not near
+    )
+
+    patient = patients[0]
+    numpy_path = lambda: active.model.predict_proba(scale_features(encoded_row(patient)[None, :], active.scaler))
+    generated_path = lambda: scorer.score(**patient)
+    numpy_us = per_call_us(numpy_path)
+    generated_us = per_call_us(generated_path)
+
+    calibrator = getattr(active.model, 'calibrator', None)
+    print(f"\n{'='*70}")
+    print(f"STANDALONE SCORER (model {active.version}, "
+          f"calibrator: {type(calibrator).__name__ if calibrator is not None else 'none'})")
+    print(f"{'='*70}")
+    print(f"{'Generated source:':<34}{len(source):10,} bytes")
+    print(f"{'Max |probability difference|:':<34}{max_diff:10.2e}  ({args.patients:,} patients)")
+    print(f"{'Risk level mismatches:':<34}{level_mismatches:10d}")
+    print(f"{'numpy path, 1 patient:':<34}{numpy_us:10.2f} µs")
+    print(f"{'Generated scorer, 1 patient:':<34}{generated_us:10.2f} µs  ({numpy_us/generated_us:.1f}x)")
+    print(f"{'='*70}\n")
+
+    if max_diff > TOLERANCE or level_mismatches:
+        print("❌ Generated scorer does not match predict_proba")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
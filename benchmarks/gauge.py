@@ -0,0 +1,74 @@
+"""
+Result-view gauge benchmark.
+
+Times what the server does to put the risk gauge on screen, including the
+serialization st.plotly_chart performs, and the bytes sent to the browser:
+
+  * plotly, uncached - a fresh go.Indicator figure per render
+  * plotly, cached   - per-theme template, figure cached per displayed value
+  * svg              - lightweight inline SVG gauge (CARDIO_GAUGE_RENDERER=svg)
+
+Usage:
+    python -m benchmarks.gauge [--renders 2000]
+"""
+
+import argparse
+import statistics
+import time
+import warnings
+
+
+def plotly_payload(fig):
+    """What st.plotly_chart does with a figure before sending it"""
+    import plotly.io
+    import plotly.tools
+
+    figure = plotly.tools.return_figure_from_figure_or_data(fig, validate_figure=True)
+    return plotly.io.to_json(figure, validate=False)
+
+
+def time_renders(render, probabilities):
+    timings, size = [], 0
+    for prob in probabilities:
+        start = time.perf_counter()
+        payload = render(prob)
+        timings.append(time.perf_counter() - start)
+        size = len(payload)
+    return statistics.median(timings), size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--renders", type=int, default=2000, help="gauge renders per variant")
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore")
+    from streamlit import logger
+    logger.set_log_level("error")  # cached functions warn outside a script run
+
+    from charts import build_gauge_chart, create_gauge_chart, create_svg_gauge
+
+    # Results views mostly show a few hundred distinct probabilities
+    probabilities = [(i % 300) / 300 for i in range(args.renders)]
+    theme = "dark"
+
+    variants = [
+        ("plotly, uncached", lambda p: plotly_payload(build_gauge_chart.__wrapped__(round(p * 100, 1), theme))),
+        ("plotly, cached", lambda p: plotly_payload(create_gauge_chart(p, theme))),
+        ("svg", lambda p: create_svg_gauge(p, theme)),
+    ]
+    for p in probabilities:  # warm the per-value figure cache
+        create_gauge_chart(p, theme)
+
+    print(f"\n{'='*70}")
+    print(f"RISK GAUGE RENDERING ({args.renders} renders)")
+    print(f"{'='*70}")
+    print(f"{'Variant':<20}{'Server time (ms)':>18}{'Bytes to browser':>20}")
+    for name, render in variants:
+        elapsed, size = time_renders(render, probabilities)
+        print(f"{name:<20}{elapsed*1000:>18.3f}{size:>20,}")
+    print(f"{'='*70}\n")
+
+
+if __name__ == "__main__":
+    main()
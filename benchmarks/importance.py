@@ -0,0 +1,141 @@
+"""
+Permutation importance benchmark.
+
+Scores a synthetic test set (model/synthetic.py) with the production model
+and compares model/importance.py's permutation importance (one reused
+buffer per feature, one predict_proba call and one row-wise AUC pass per
+feature) with the usual loop that copies the data, shuffles one column,
+scores it and computes its AUC once per permutation, and with stacking
+every feature x repeat copy into one batch. Reports time and peak memory
+of each, and checks the AUC drops against scoring the same shuffled copies
+one by one with sklearn's roc_auc_score.
+
+Usage:
+    python -m benchmarks.importance [--rows 13735] [--repeats 10] [--model-dir model]
+"""
+
+import argparse
+import os
+import pickle
+import statistics
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+from sklearn.metrics import roc_auc_score
+
+from model.features import FEATURE_COLUMNS, scale_features
+from model.importance import permutation_importance, row_shuffles
+from model.subgroups import roc_auc, row_auc
+from model.synthetic import CohortGenerator
+
+TOLERANCE = 1e-9
+
+
+def timed_ms(fn, repeats=3):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return result, statistics.median(timings)
+
+
+def peak_mb(fn):
+    """Peak memory allocated while fn runs (numpy buffers included)"""
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1e6
+
+
+def looped(model, X, y, n_repeats, seed=42):
+    """Reference: one copy, predict_proba call and AUC per permutation"""
+    perms = row_shuffles(len(X), n_repeats, np.random.default_rng(seed))
+    baseline = roc_auc(y, model.predict_proba(X))
+    drops = np.empty((X.shape[1], n_repeats))
+    for j in range(X.shape[1]):
+        for r, perm in enumerate(perms):
+            shuffled = X.copy()
+            shuffled[:, j] = X[perm, j]
+            drops[j, r] = baseline - roc_auc(y, model.predict_proba(shuffled))
+    return drops
+
+
+def stacked(model, X, y, n_repeats, seed=42):
+    """Every feature x repeat copy in one (n_features^2 * n_repeats * n_samples) batch, one predict_proba call"""
+    n_samples, n_features = X.shape
+    perms = row_shuffles(n_samples, n_repeats, np.random.default_rng(seed))
+    baseline = roc_auc(y, model.predict_proba(X))
+    columns = np.empty((n_features, n_features, n_repeats, n_samples))
+    columns[:] = X.T[:, None, None, :]
+    diagonal = np.arange(n_features)
+    columns[diagonal, diagonal] = X.T[:, perms]
+    proba = model.predict_proba(columns.reshape(n_features, -1).T).reshape(n_features * n_repeats, n_samples)
+    return baseline - row_auc(y, proba).reshape(n_features, n_repeats)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=13735, help="synthetic test patients (default: test set size)")
+    parser.add_argument("--repeats", type=int, default=10, help="shuffles per feature")
+    parser.add_argument("--model-dir", default="model", help="directory with scaler.pkl and logistic_model.pkl")
+    args = parser.parse_args()
+
+    try:
+        with open(os.path.join(args.model_dir, "scaler.pkl"), "rb") as f:
+            scaler = pickle.load(f)
+        with open(os.path.join(args.model_dir, "logistic_model.pkl"), "rb") as f:
+            model = pickle.load(f)
+    except Exception as e:
+        print(f"❌ Error loading model: {e}")
+        sys.exit(1)
+
+    X_raw, y = CohortGenerator().sample(args.rows, np.random.default_rng(0))
+    X = scale_features(X_raw, scaler)
+
+    blocked = lambda: permutation_importance(model, X, y, FEATURE_COLUMNS, args.repeats)
+    importance, blocked_ms = timed_ms(blocked)
+    _, looped_ms = timed_ms(lambda: looped(model, X, y, args.repeats), repeats=1)
+    _, stacked_ms = timed_ms(lambda: stacked(model, X, y, args.repeats), repeats=1)
+    blocked_mb = peak_mb(blocked)
+    looped_mb = peak_mb(lambda: looped(model, X, y, args.repeats))
+    stacked_mb = peak_mb(lambda: stacked(model, X, y, args.repeats))
+
+    # The same shuffled copies, scored one at a time with sklearn
+    perms = row_shuffles(args.rows, args.repeats, np.random.default_rng(42))
+    baseline = roc_auc_score(y, model.predict_proba(X))
+    reference = []
+    for j in range(len(FEATURE_COLUMNS)):
+        drops = []
+        for perm in perms:
+            shuffled = X.copy()
+            shuffled[:, j] = X[perm, j]
+            drops.append(baseline - roc_auc_score(y, model.predict_proba(shuffled)))
+        reference.append(np.mean(drops))
+    by_name = {feature['feature']: feature['mean'] for feature in importance['features']}
+    difference = max(abs(by_name[name] - value) for name, value in zip(FEATURE_COLUMNS, reference))
+    top = importance['features'][0]
+
+    print(f"\n{'='*70}")
+    print(f"PERMUTATION IMPORTANCE ({args.rows:,} patients, {len(FEATURE_COLUMNS)} features x {args.repeats} repeats)")
+    print(f"{'='*70}")
+    print(f"{'':<36}{'time':>10}    {'peak memory':>12}")
+    print(f"{'Looped (copy, score, AUC each):':<36}{looped_ms:10.1f} ms {looped_mb:10.1f} MB")
+    print(f"{'Stacked (one predict_proba):':<36}{stacked_ms:10.1f} ms {stacked_mb:10.1f} MB")
+    print(f"{'Per feature (one reused buffer):':<36}{blocked_ms:10.1f} ms {blocked_mb:10.1f} MB  "
+          f"({looped_ms / blocked_ms:.1f}x vs looped)")
+    print(f"{'Max diff vs sklearn per copy:':<36}{difference:10.1e}")
+    print(f"{'Most important feature:':<36}{top['feature']:>10}  "
+          f"(AUC drop {top['mean']:.4f} ± {top['std']:.4f})")
+    print(f"{'='*70}\n")
+
+    if difference > TOLERANCE:
+        print("❌ Permutation importance differs from scoring each permutation separately")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Learning curve benchmark.
+
+Runs model/learning_curve.py's learning curve on synthetic data with one
+worker and with every core, checks that both give the same curve, and
+compares the makespan of submitting the fits largest first with submitting
+them in fraction order (simulated on --sim-workers workers from the
+measured fit times, so the scheduling effect shows on any machine).
+
+Usage:
+    python -m benchmarks.learning_curve [--rows 50000] [--iters 300] [--seeds 5] [--sim-workers 8]
+"""
+
+import argparse
+import heapq
+import os
+import sys
+import time
+
+import numpy as np
+
+from model.learning_curve import learning_curve
+
+FRACTIONS = [0.02, 0.05, 0.1, 0.2, 0.4, 0.6, 0.8, 1.0]
+
+
+def makespan(durations, workers):
+    """Finish time of greedy list scheduling (each task goes to the first free worker)"""
+    free = [0.0] * workers
+    for duration in durations:
+        heapq.heappush(free, heapq.heappop(free) + duration)
+    return max(free)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=50000, help="synthetic training rows")
+    parser.add_argument("--iters", type=int, default=300, help="gradient descent iterations per fit")
+    parser.add_argument("--seeds", type=int, default=5, help="random subsets per fraction")
+    parser.add_argument("--sim-workers", type=int, default=8, help="workers for the scheduling simulation")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(args.rows + args.rows // 4, 12))
+    y = (rng.uniform(size=len(X)) < 1 / (1 + np.exp(-X @ rng.normal(size=12)))).astype(int)
+    X_train, y_train, X_test, y_test = X[:args.rows], y[:args.rows], X[args.rows:], y[args.rows:]
+
+    cores = os.cpu_count() or 1
+    start = time.perf_counter()
+    serial = learning_curve(X_train, y_train, X_test, y_test, FRACTIONS, args.seeds, n_iters=args.iters, n_jobs=1)
+    serial_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    parallel = learning_curve(X_train, y_train, X_test, y_test, FRACTIONS, args.seeds, n_iters=args.iters,
+                              n_jobs=cores)
+    parallel_seconds = time.perf_counter() - start
+    same = [point['test'] for point in serial['points']] == [point['test'] for point in parallel['points']]
+
+    durations = {point['fraction']: point['fit_seconds']['mean'] for point in serial['points']}
+    in_order = [durations[f] for f in sorted(FRACTIONS) for _ in range(args.seeds)]
+    ascending = makespan(in_order, args.sim_workers)
+    largest_first = makespan(in_order[::-1], args.sim_workers)
+
+    print(f"\n{'='*70}")
+    print(f"LEARNING CURVE ({len(FRACTIONS)} sizes x {args.seeds} seeds, {args.rows:,} rows, {args.iters} iters)")
+    print(f"{'='*70}")
+    print(f"{'All fits, 1 worker:':<38}{serial_seconds:10.2f} s")
+    print(f"{f'All fits, {cores} worker(s):':<38}{parallel_seconds:10.2f} s  "
+          f"({serial_seconds / parallel_seconds:.1f}x)")
+    print(f"{'Fit time, smallest / full set:':<38}{durations[min(FRACTIONS)]:10.3f} s / {durations[1.0]:.3f} s")
+    print(f"{f'Makespan on {args.sim_workers} workers, in order:':<38}{ascending:10.2f} s")
+    print(f"{f'Makespan on {args.sim_workers} workers, largest first:':<38}{largest_first:10.2f} s")
+    print(f"{'Same curve with 1 and N workers:':<38}{str(same):>10}")
+    print(f"{'='*70}\n")
+
+    if not same:
+        print("❌ The learning curve depends on the number of workers")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+"""
+Concurrent-user load test against a real Streamlit server.
+
+Starts ``streamlit run app.py`` headless, connects N simulated browsers to
+the websocket endpoint and has each of them drag the age slider repeatedly
+after one "Analyze" click. Reported per interaction:
+
+  * server CPU time (user + system of the server process)
+  * round-trip latency until the rerun finishes
+  * bytes received by the client
+
+``--mode fragment`` sends slider changes the way the browser does for widgets
+inside an ``st.fragment`` (fragment-scoped rerun). ``--mode full`` forces a
+full script rerun for every interaction, which is what every slider drag cost
+before the assessment form became a fragment.
+
+Usage:
+    python -m benchmarks.load_test [--users 50] [--interactions 20] [--mode fragment|full]
+
+Linux only (server CPU is read from /proc).
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FINISHED = {"FINISHED_SUCCESSFULLY", "FINISHED_FRAGMENT_RUN_SUCCESSFULLY"}
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def process_cpu_seconds(pid):
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    # utime and stime are fields 14 and 15 of /proc/<pid>/stat
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def start_server(app_path, port):
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", app_path,
+         "--server.headless", "true",
+         "--server.port", str(port),
+         "--browser.gatherUsageStats", "false"],
+        cwd=ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1)
+            return proc
+        except OSError:
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError("Streamlit server did not become healthy within 60s")
+
+
+class SimulatedBrowser:
+    """Minimal Streamlit websocket client that tracks widgets and cached messages"""
+
+    def __init__(self, url, mode):
+        self.url = url
+        self.mode = mode
+        self.widgets = {}        # user key -> (widget id, fragment id)
+        self.states = {}         # widget id -> WidgetState
+        self.cached_hashes = set()
+        self.ws = None
+
+    async def connect(self):
+        import websockets
+
+        self.ws = await websockets.connect(self.url, subprotocols=["streamlit"], max_size=None)
+
+    async def close(self):
+        await self.ws.close()
+
+    async def rerun(self, widget_state=None, fragment_id=""):
+        """Send a rerun request and wait for it to finish. Returns bytes received."""
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        msg = BackMsg()
+        client_state = msg.rerun_script
+        client_state.query_string = ""
+        client_state.fragment_id = fragment_id
+        client_state.cached_message_hashes.extend(self.cached_hashes)
+        for wid, state in self.states.items():
+            client_state.widget_states.widgets.add().CopyFrom(state)
+        if widget_state is not None:
+            client_state.widget_states.widgets.add().CopyFrom(widget_state)
+        await self.ws.send(msg.SerializeToString())
+
+        received = 0
+        while True:
+            raw = await self.ws.recv()
+            received += len(raw)
+            fwd = ForwardMsg()
+            fwd.ParseFromString(raw)
+            if fwd.metadata.cacheable:
+                self.cached_hashes.add(fwd.hash)
+            kind = fwd.WhichOneof("type")
+            if kind == "delta" and fwd.delta.WhichOneof("type") == "new_element":
+                self._track_widget(fwd.delta)
+            elif kind == "script_finished":
+                status = ForwardMsg.ScriptFinishedStatus.Name(fwd.script_finished)
+                if status in FINISHED:
+                    return received
+
+    def _track_widget(self, delta):
+        element = delta.new_element
+        kind = element.WhichOneof("type")
+        widget = getattr(element, kind)
+        wid = getattr(widget, "id", "")
+        if wid.startswith("$$ID-"):
+            key = wid.rsplit("-", 1)[1]
+            self.widgets[key] = (wid, delta.fragment_id)
+
+    def slider_state(self, key, value):
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        wid, _ = self.widgets[key]
+        state = WidgetState(id=wid)
+        state.double_array_value.data.append(float(value))
+        self.states[wid] = state
+        return state
+
+    def click_state(self, key):
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        wid, _ = self.widgets[key]
+        return WidgetState(id=wid, trigger_value=True)
+
+    def fragment_of(self, key):
+        return self.widgets[key][1] if self.mode == "fragment" else ""
+
+    async def set_slider(self, key, value):
+        self.slider_state(key, value)
+        return await self.rerun(fragment_id=self.fragment_of(key))
+
+    async def click(self, key):
+        return await self.rerun(self.click_state(key), fragment_id=self.fragment_of(key))
+
+
+async def simulate_user(url, mode, interactions, start_barrier, latencies, payloads):
+    browser = SimulatedBrowser(url, mode)
+    await browser.connect()
+    await browser.rerun()
+    await browser.click("analyze_btn")
+    await start_barrier.wait()
+
+    for i in range(interactions):
+        start = time.perf_counter()
+        payloads.append(await browser.set_slider("age", 30 + i % 50))
+        latencies.append(time.perf_counter() - start)
+    await browser.close()
+
+
+class Barrier:
+    """asyncio.Barrier for Python < 3.11"""
+
+    def __init__(self, parties):
+        self.parties = parties
+        self.count = 0
+        self.event = asyncio.Event()
+        self.released_at = None
+
+    async def wait(self):
+        self.count += 1
+        if self.count == self.parties:
+            self.released_at = time.perf_counter()
+            self.event.set()
+        await self.event.wait()
+
+
+async def run_load(url, pid, users, interactions, mode):
+    barrier = Barrier(users)
+    latencies, payloads = [], []
+    tasks = [
+        asyncio.create_task(simulate_user(url, mode, interactions, barrier, latencies, payloads))
+        for _ in range(users)
+    ]
+    await barrier.event.wait()
+    cpu_start = process_cpu_seconds(pid)
+    await asyncio.gather(*tasks)
+    wall = time.perf_counter() - barrier.released_at
+    cpu = process_cpu_seconds(pid) - cpu_start
+    return cpu, wall, latencies, payloads
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--app", default=os.path.join(ROOT, "app.py"), help="app script to serve")
+    parser.add_argument("--users", type=int, default=50, help="concurrent simulated users")
+    parser.add_argument("--interactions", type=int, default=20, help="slider moves per user")
+    parser.add_argument("--mode", choices=["fragment", "full"], default="fragment",
+                        help="fragment-scoped reruns (browser behaviour) or forced full reruns")
+    args = parser.parse_args()
+
+    port = free_port()
+    server = start_server(os.path.abspath(args.app), port)
+    try:
+        url = f"ws://127.0.0.1:{port}/_stcore/stream"
+        cpu, wall, latencies, payloads = asyncio.run(
+            run_load(url, server.pid, args.users, args.interactions, args.mode)
+        )
+    finally:
+        server.terminate()
+        server.wait()
+
+    total = len(latencies)
+    print(f"\n{'='*70}")
+    print(f"LOAD TEST: {args.users} users x {args.interactions} slider moves ({args.mode} reruns)")
+    print(f"{'='*70}")
+    print(f"Interactions:             {total}")
+    print(f"Throughput:               {total / wall:8.1f} interactions/s")
+    print(f"Server CPU / interaction: {cpu / total * 1000:8.2f} ms")
+    print(f"Latency p50:              {statistics.median(latencies)*1000:8.1f} ms")
+    print(f"Latency p95:              {percentile(latencies, 0.95)*1000:8.1f} ms")
+    print(f"Bytes / interaction:      {statistics.mean(payloads):8.0f}")
+    print(f"{'='*70}\n")
+
+
+if __name__ == "__main__":
+    main()
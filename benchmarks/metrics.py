@@ -0,0 +1,124 @@
+"""
+Prediction metrics overhead benchmark.
+
+Times the instrumentation one prediction adds (model/metrics.py): the stage
+histogram observations, the prediction counter and the extra clock reads,
+in the router and in the app, net of the benchmark's own call overhead,
+against the router's scoring call it wraps. Also checks that a scrape of
+the local endpoint returns consistent Prometheus histograms.
+
+Usage:
+    python -m benchmarks.metrics [--predictions 200000] [--model-dir model]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+import urllib.request
+
+import numpy as np
+
+from benchmarks.export import encoded_row, random_patient
+from model.metrics import STAGE_SECONDS, STAGES, MetricsRegistry, PredictionMetrics, start_server
+from model.registry import ModelRegistry
+from model.serving import ModelRouter, candidate_artifacts
+
+def per_prediction_ns(fn, predictions, repeats=5):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(predictions):
+            fn()
+        timings.append((time.perf_counter() - start) / predictions * 1e9)
+    return statistics.median(timings)
+
+
+def check_exposition(text):
+    """Bucket counts are cumulative and end at the sample count"""
+    buckets, counts = {}, {}
+    for line in text.splitlines():
+        if line.startswith(f"{STAGE_SECONDS}_bucket"):
+            series = line[:line.index(',le=')]
+            buckets.setdefault(series, []).append(int(line.rsplit(" ", 1)[1]))
+        elif line.startswith(f"{STAGE_SECONDS}_count"):
+            counts[line.split("{", 1)[1].split("}")[0]] = int(line.rsplit(" ", 1)[1])
+    for series, values in buckets.items():
+        labels = series.split("{", 1)[1]
+        if values != sorted(values) or values[-1] != counts.get(labels):
+            return False
+    return bool(buckets)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--predictions", type=int, default=200_000, help="instrumented predictions to time")
+    parser.add_argument("--model-dir", default="model", help="directory with the model artifacts")
+    parser.add_argument("--port", type=int, default=0, help="port for the scrape check (0 = any free port)")
+    args = parser.parse_args()
+
+    registry = MetricsRegistry()
+    metrics = PredictionMetrics('production', registry)
+    preprocess, scale, model, render = (metrics.stages[stage] for stage in STAGES)
+    clock = time.perf_counter
+
+    # What ModelRouter.score adds around scaling and predict_proba: one more
+    # clock read, two observations and the prediction counter
+    def router_instrumentation():
+        clock()
+        scale.observe(0.00002)
+        model.observe(0.00004)
+        metrics.predictions.inc()
+
+    # ...plus the app's start/stop reads around preprocessing and rendering
+    def app_instrumentation():
+        clock()
+        clock()
+        preprocess.observe(0.0003)
+        clock()
+        clock()
+        render.observe(0.2)
+
+    def empty():
+        pass
+
+    call_ns = per_prediction_ns(empty, args.predictions)
+    router_ns = per_prediction_ns(router_instrumentation, args.predictions) - call_ns
+    app_ns = per_prediction_ns(app_instrumentation, args.predictions) - call_ns
+    observe_ns = per_prediction_ns(lambda: model.observe(0.00004), args.predictions) - call_ns
+    clock_ns = per_prediction_ns(lambda: clock(), args.predictions) - call_ns
+
+    router = ModelRouter({'production': ModelRegistry(candidate_artifacts(args.model_dir))}, metrics=registry)
+    if router.select()[1] is None:
+        print("❌ Could not load the model artifacts")
+        sys.exit(1)
+    row = encoded_row(random_patient(np.random.default_rng(0)))[np.newaxis, :]
+    score_ns = per_prediction_ns(lambda: router.score(row), max(args.predictions // 20, 1000))
+
+    start = time.perf_counter()
+    text = registry.render()
+    render_ms = (time.perf_counter() - start) * 1000
+
+    server = start_server(registry, port=args.port)
+    scraped = urllib.request.urlopen(f"http://127.0.0.1:{server.server_address[1]}/metrics").read().decode()
+    server.shutdown()
+    consistent = check_exposition(scraped)
+
+    print(f"\n{'='*70}")
+    print(f"PREDICTION METRICS ({len(STAGES)} stage histograms + 1 counter per prediction)")
+    print(f"{'='*70}")
+    print(f"{'Histogram observe:':<34}{observe_ns:10.0f} ns  (one clock read: {clock_ns:.0f} ns)")
+    print(f"{'Router path instrumentation:':<34}{router_ns:10.0f} ns  "
+          f"({router_ns / score_ns:.1%} of a {score_ns / 1000:.1f} µs router score)")
+    print(f"{'App path instrumentation:':<34}{app_ns:10.0f} ns")
+    print(f"{'Render exposition:':<34}{render_ms:10.2f} ms  ({len(text):,} bytes)")
+    print(f"{'Scraped histograms consistent:':<34}{'yes' if consistent else 'NO':>10}")
+    print(f"{'='*70}\n")
+
+    if not consistent:
+        print("❌ Scraped histograms are not cumulative")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
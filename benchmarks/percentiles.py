@@ -0,0 +1,79 @@
+"""
+Population percentile index benchmark.
+
+Builds the quantile index (model/percentiles.py) over a synthetic training
+population, compares its answers with the exact share of the population
+below each query, and times single-value and batch queries.
+
+Usage:
+    python -m benchmarks.percentiles [--population 56000] [--queries 100000] [--seed 0]
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+import numpy as np
+
+from model.features import COLUMN_INDEX, FEATURE_COLUMNS
+from model.percentiles import PopulationIndex, build_index
+
+
+def per_call_us(fn, repeats=5, calls=20000):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        timings.append((time.perf_counter() - start) / calls * 1e6)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--population", type=int, default=56000, help="training population size")
+    parser.add_argument("--queries", type=int, default=100000, help="batch query size")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    proba = rng.beta(2, 2, args.population)
+    X = np.zeros((args.population, len(FEATURE_COLUMNS)))
+    X[:, COLUMN_INDEX['ap_hi']] = np.round(rng.normal(127, 17, args.population))
+    X[:, COLUMN_INDEX['ap_lo']] = np.round(rng.normal(81, 9, args.population))
+    X[:, COLUMN_INDEX['BMI']] = rng.lognormal(np.log(27), 0.18, args.population)
+
+    start = time.perf_counter()
+    index = build_index(proba, X)
+    build_ms = (time.perf_counter() - start) * 1000
+    size = len(json.dumps(index.to_dict()))
+    index = PopulationIndex.from_dict(json.loads(json.dumps(index.to_dict())))
+
+    queries = rng.uniform(0, 1, args.queries)
+    approximate = index.percentile('risk', queries)
+    exact = np.searchsorted(np.sort(proba), queries, side='left') / args.population * 100
+    bp_queries = rng.integers(90, 180, args.queries).astype(float)
+    bp_error = np.abs(index.percentile('ap_hi', bp_queries) -
+                      np.searchsorted(np.sort(X[:, COLUMN_INDEX['ap_hi']]), bp_queries, side='left')
+                      / args.population * 100)
+
+    scalar_us = per_call_us(lambda: index.percentile('risk', 0.42))
+    start = time.perf_counter()
+    index.percentile('risk', queries)
+    batch = time.perf_counter() - start
+
+    print(f"\n{'='*70}")
+    print(f"POPULATION PERCENTILE INDEX ({args.population:,} patients)")
+    print(f"{'='*70}")
+    print(f"{'Build time:':<34}{build_ms:10.1f} ms")
+    print(f"{'Artifact size (JSON):':<34}{size / 1024:10.1f} KiB")
+    print(f"{'Risk: max error vs exact:':<34}{np.abs(approximate - exact).max():10.3f} pts")
+    print(f"{'Systolic BP: max error vs exact:':<34}{bp_error.max():10.3f} pts")
+    print(f"{'Single query:':<34}{scalar_us:10.2f} µs")
+    print(f"{f'Batch of {args.queries:,}:':<34}{batch*1000:10.2f} ms")
+    print(f"{'='*70}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Model hot-reload benchmark.
+
+Many threads call ModelRegistry.get() in a loop, as sessions do at the top
+of every script run, while a new model is deployed into a temporary copy of
+the artifacts. Reports get() latency during the reload, how many reloads
+happened (1 means no reload storm), and how long the new version took to
+reach callers.
+
+Usage:
+    python -m benchmarks.registry [--sessions 50] [--seconds 4] [--interval 0.5]
+"""
+
+import argparse
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+from model.registry import ARTIFACTS, ModelRegistry
+
+
+def deploy_new_model(path):
+    with open(path, "rb") as f:
+        model = pickle.load(f)
+    model.bias += 0.01
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(model, f)
+    os.replace(tmp_path, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sessions", type=int, default=50, help="concurrent calling threads")
+    parser.add_argument("--seconds", type=float, default=4.0, help="duration of the run")
+    parser.add_argument("--interval", type=float, default=0.5, help="registry check interval (s)")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="cardio-registry-")
+    paths = {}
+    for name, path in ARTIFACTS.items():
+        paths[name] = os.path.join(workdir, os.path.basename(path))
+        if os.path.exists(path):  # optional artifacts may not have been generated
+            shutil.copy(path, paths[name])
+
+    registry = ModelRegistry(paths, check_interval=args.interval)
+    first_version = registry.get().version
+
+    stop = threading.Event()
+    latencies = [[] for _ in range(args.sessions)]
+    first_seen = {}
+
+    def session(i):
+        while not stop.is_set():
+            start = time.perf_counter()
+            active = registry.get()
+            latencies[i].append(time.perf_counter() - start)
+            if active.version != first_version:
+                first_seen.setdefault(i, time.perf_counter())
+            time.sleep(0.001)
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(args.sessions)]
+    for thread in threads:
+        thread.start()
+    time.sleep(args.seconds / 2)
+    deployed_at = time.perf_counter()
+    deploy_new_model(paths["model"])
+    time.sleep(args.seconds / 2)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    shutil.rmtree(workdir)
+
+    timings = np.concatenate([np.array(t) for t in latencies]) * 1e6
+    swap_delays = [(t - deployed_at) * 1000 for t in first_seen.values()]
+
+    print(f"\n{'='*70}")
+    print(f"MODEL HOT RELOAD ({args.sessions} sessions, check every {args.interval}s)")
+    print(f"{'='*70}")
+    print(f"{'get() calls:':<36}{len(timings):>10,}")
+    print(f"{'get() latency p50 / p99 / max:':<36}{np.percentile(timings, 50):>8.1f} / "
+          f"{np.percentile(timings, 99):.1f} / {timings.max():.1f} us")
+    print(f"{'Reloads after deploy:':<36}{registry.reloads - 1:>10}")
+    print(f"{'Sessions that saw the new version:':<36}{len(first_seen):>10} / {args.sessions}")
+    if swap_delays:
+        print(f"{'Deploy to first caller on new model:':<36}{min(swap_delays):>10.0f} ms")
+    print(f"{'='*70}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Per-rerun stylesheet payload benchmark.
+
+Streamlit re-executes app.py on every interaction and re-sends every element
+it emits. Elements whose serialized message is at least
+``global.minCachedMessageSize`` bytes are hashed and, once the browser has
+seen them, sent as a short cache reference instead of the full body.
+
+This benchmark drives the app through a typical sequence (first load, slider
+drag, theme toggle, toggle back) and reports, for the <style> elements only:
+
+  * bytes that actually go over the websocket on each rerun
+  * the script run time of each rerun
+
+Usage:
+    python -m benchmarks.rerun_payload [--app app.py] [--runs 5]
+"""
+
+import argparse
+import os
+import statistics
+import time
+import warnings
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+REFERENCE_MSG_BYTES = 40  # ForwardMsg carrying only a ref_hash
+
+
+def style_messages(at):
+    """Serialized ForwardMsgs for every <style> element of the last run"""
+    from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+    messages = []
+    for element in at.markdown:
+        if "<style>" not in element.value:
+            continue
+        msg = ForwardMsg()
+        msg.delta.new_element.markdown.CopyFrom(element.proto)
+        messages.append(msg.SerializeToString(deterministic=True))
+    return messages
+
+
+def sent_bytes(messages, seen, min_cached):
+    """Bytes sent for one rerun, mimicking Streamlit's ForwardMsg cache"""
+    total = 0
+    for payload in messages:
+        if len(payload) >= min_cached and payload in seen:
+            total += REFERENCE_MSG_BYTES
+        else:
+            total += len(payload)
+        if len(payload) >= min_cached:
+            seen.add(payload)
+    return total
+
+
+def run_sequence(app_path):
+    from streamlit import config
+    from streamlit.testing.v1 import AppTest
+
+    min_cached = int(config.get_option("global.minCachedMessageSize"))
+    seen = set()
+    results = []
+
+    at = AppTest.from_file(app_path, default_timeout=120)
+
+    def step(name, action):
+        start = time.perf_counter()
+        action()
+        elapsed = time.perf_counter() - start
+        results.append((name, sent_bytes(style_messages(at), seen, min_cached), elapsed))
+
+    step("first load", lambda: at.run())
+    step("slider drag", lambda: at.slider(key="age").set_value(50).run())
+    step("slider drag", lambda: at.slider(key="age").set_value(51).run())
+    step("theme toggle", lambda: at.button(key="theme_btn").click().run())
+    step("slider drag", lambda: at.slider(key="age").set_value(52).run())
+    step("theme toggle", lambda: at.button(key="theme_btn").click().run())
+
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--app", default=os.path.join(ROOT, "app.py"), help="app script to measure")
+    parser.add_argument("--runs", type=int, default=5, help="repetitions of the interaction sequence")
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore")
+    os.chdir(ROOT)
+    app_path = os.path.abspath(args.app)
+
+    runs = [run_sequence(app_path) for _ in range(args.runs)]
+
+    print(f"\n{'='*70}")
+    print(f"PER-RERUN STYLESHEET PAYLOAD ({os.path.relpath(app_path, ROOT)}, {args.runs} runs)")
+    print(f"{'='*70}")
+    print(f"{'Step':<16}{'CSS bytes sent':>16}{'Rerun time (ms)':>20}")
+    for i, (name, size, _) in enumerate(runs[0]):
+        elapsed = statistics.median(run[i][2] for run in runs)
+        print(f"{name:<16}{size:>16,}{elapsed*1000:>20.1f}")
+    steady = [size for name, size, _ in runs[0][1:] if name == "slider drag"]
+    print(f"\nSteady-state CSS bytes per slider rerun: {max(steady):,}")
+    print(f"{'='*70}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Rules engine benchmark.
+
+Labels a synthetic cohort with BMI / blood pressure categories, risk level
+and recommendations through the vectorized rules tables (model/rules.py),
+checks every row against the scalar if-chains the app used before, and
+compares the time of one vectorized pass with a per-patient loop.
+
+Usage:
+    python -m benchmarks.rules [--patients 1000000] [--loop-patients 100000] [--seed 0]
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from model.features import COLUMN_INDEX, FEATURE_COLUMNS, compute_bmi
+from model.rules import cohort_labels
+
+
+# Scalar reference: the app's original helpers and recommendation chain
+def reference_bmi_category(bmi):
+    if bmi < 18.5:
+        return "Underweight"
+    elif 18.5 <= bmi < 25:
+        return "Normal"
+    elif 25 <= bmi < 30:
+        return "Overweight"
+    else:
+        return "Obese"
+
+
+def reference_bp_category(systolic, diastolic):
+    if systolic < 120 and diastolic < 80:
+        return "Normal"
+    elif 120 <= systolic < 130 and diastolic < 80:
+        return "Elevated"
+    elif 130 <= systolic < 140 or 80 <= diastolic < 90:
+        return "Stage 1 High BP"
+    else:
+        return "Stage 2 High BP"
+
+
+def reference_risk_level(probability):
+    if probability < 0.3:
+        return "LOW RISK"
+    elif probability < 0.7:
+        return "MODERATE RISK"
+    else:
+        return "HIGH RISK"
+
+
+def reference_recommendations(risk, smoke, bmi, bp_cat):
+    if risk == "HIGH RISK":
+        actions = ["Schedule cardiologist appointment", "Get comprehensive cardiac evaluation",
+                   "Consider cardiac screening tests"]
+    elif risk == "MODERATE RISK":
+        actions = ["Regular health monitoring", "Implement lifestyle modifications", "Consult healthcare provider"]
+    else:
+        actions = ["Continue current lifestyle", "Annual health check-ups", "Stay physically active"]
+    if smoke == 1:
+        actions.append("Quit smoking immediately")
+    if bmi >= 25:
+        actions.append("Start weight management program")
+    if "High" in bp_cat:
+        actions.append("Reduce sodium intake")
+        actions.append("Monitor blood pressure daily")
+    return "; ".join(actions)
+
+
+def reference_labels(row, probability):
+    bmi = row[COLUMN_INDEX['BMI']]
+    bp_cat = reference_bp_category(row[COLUMN_INDEX['ap_hi']], row[COLUMN_INDEX['ap_lo']])
+    risk = reference_risk_level(probability)
+    return (reference_bmi_category(bmi), bp_cat, risk,
+            reference_recommendations(risk, row[COLUMN_INDEX['smoke']], bmi, bp_cat))
+
+
+def random_cohort(n, rng):
+    X = np.zeros((n, len(FEATURE_COLUMNS)))
+    X[:, COLUMN_INDEX['height']] = rng.integers(120, 221, n)
+    X[:, COLUMN_INDEX['weight']] = rng.integers(30, 201, n)
+    X[:, COLUMN_INDEX['ap_hi']] = rng.integers(80, 251, n)
+    X[:, COLUMN_INDEX['ap_lo']] = rng.integers(40, 151, n)
+    X[:, COLUMN_INDEX['smoke']] = rng.integers(0, 2, n)
+    X[:, COLUMN_INDEX['BMI']] = compute_bmi(X[:, COLUMN_INDEX['weight']], X[:, COLUMN_INDEX['height']])
+    # Probabilities on a 0.1% grid so the cut points themselves are covered
+    return X, rng.integers(0, 1001, n) / 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--patients", type=int, default=1_000_000, help="cohort size for the vectorized pass")
+    parser.add_argument("--loop-patients", type=int, default=100_000, help="rows labelled and checked one by one")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    X, proba = random_cohort(args.patients, np.random.default_rng(args.seed))
+
+    start = time.perf_counter()
+    labels = cohort_labels(X, proba)
+    vectorized = time.perf_counter() - start
+
+    n_loop = min(args.loop_patients, args.patients)
+    start = time.perf_counter()
+    expected = [reference_labels(X[i], proba[i]) for i in range(n_loop)]
+    looped = time.perf_counter() - start
+
+    columns = ['bmi_category', 'bp_category', 'risk_level', 'recommendations']
+    mismatches = sum(
+        tuple(labels[column][i] for column in columns) != expected[i] for i in range(n_loop)
+    )
+
+    print(f"\n{'='*70}")
+    print(f"RULES ENGINE ({args.patients:,} patients)")
+    print(f"{'='*70}")
+    print(f"{'Vectorized pass:':<34}{vectorized*1000:10.1f} ms  "
+          f"({vectorized / args.patients * 1e9:.0f} ns/patient)")
+    print(f"{'Per-patient if-chains:':<34}{looped / n_loop * 1e9:10.0f} ns/patient  "
+          f"({looped / n_loop * args.patients:.1f} s projected)")
+    print(f"{'Mismatches vs if-chains:':<34}{mismatches:10d}  ({n_loop:,} patients checked)")
+    print(f"{'='*70}\n")
+
+    if mismatches:
+        print("❌ Rules table does not match the scalar rules")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Feature scaler benchmark.
+
+Compares model/scaler.py's FeatureScaler with sklearn's StandardScaler on
+synthetic patients (model/synthetic.py): fitting in memory, chunk by chunk
+and by merging scalers fitted on separate halves; transforming a batch and
+a single row; and unpickling the artifact in a fresh process. Checks that
+the statistics match sklearn's (bit for bit where the same chunks are added
+in the same order).
+
+Usage:
+    python -m benchmarks.scaler [--rows 2000000] [--chunks 16]
+"""
+
+import argparse
+import os
+import pickle
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+from sklearn.preprocessing import StandardScaler
+
+from model.features import NUMERIC_INDEX, scale_features
+from model.scaler import FeatureScaler
+from model.synthetic import CohortGenerator
+
+# Different summation orders (merged halves vs one fit) legitimately
+# differ by rounding: ~n * eps relative for millions of rows
+TOLERANCE = 1e-10
+
+
+def timed_ms(fn, repeats=3):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return result, statistics.median(timings)
+
+
+def max_relative_diff(a, b):
+    return max(float(np.max(np.abs(getattr(a, name) - getattr(b, name)) / np.abs(getattr(b, name))))
+               for name in ['mean_', 'var_', 'scale_'])
+
+
+def same_bits(a, b):
+    return all(np.array_equal(getattr(a, name), getattr(b, name)) for name in ['mean_', 'var_', 'scale_'])
+
+
+def unpickle_ms(path, runs=5):
+    """Median time to import pickle and load the artifact in a fresh process"""
+    code = ("import time; start = time.perf_counter(); import pickle; "
+            f"pickle.load(open({path!r}, 'rb')); print((time.perf_counter() - start) * 1000)")
+    return statistics.median(
+        float(subprocess.run([sys.executable, "-W", "ignore", "-c", code], capture_output=True, text=True,
+                             check=True).stdout)
+        for _ in range(runs)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=2_000_000, help="synthetic patients to fit on")
+    parser.add_argument("--chunks", type=int, default=16, help="chunks for the streaming fits")
+    args = parser.parse_args()
+
+    X, _ = CohortGenerator().sample(args.rows, np.random.default_rng(0))
+    N = np.ascontiguousarray(X[:, NUMERIC_INDEX])
+    chunks = np.array_split(N, args.chunks)
+
+    reference, sklearn_fit_ms = timed_ms(lambda: StandardScaler().fit(N))
+    ours, fit_ms = timed_ms(lambda: FeatureScaler().fit(N))
+
+    def sklearn_partial():
+        scaler = StandardScaler()
+        for chunk in chunks:
+            scaler.partial_fit(chunk)
+        return scaler
+    streamed_reference, sklearn_partial_ms = timed_ms(sklearn_partial)
+
+    def ours_partial():
+        scaler = FeatureScaler()
+        for chunk in chunks:
+            scaler.partial_fit(chunk)
+        return scaler
+    streamed, partial_ms = timed_ms(ours_partial)
+
+    # Merging scalers fitted on halves (e.g. on two machines)
+    left, right = FeatureScaler().fit(N[:len(N) // 2]), FeatureScaler().fit(N[len(N) // 2:])
+    merged = left.merge(right)
+
+    batch = N.copy()
+    _, sklearn_transform_ms = timed_ms(lambda: reference.transform(N))
+    _, transform_ms = timed_ms(lambda: ours.transform(N))
+    _, inplace_ms = timed_ms(lambda: ours.transform(batch, copy=False))
+    row = X[:1].copy()
+    _, row_sklearn_us = timed_ms(lambda: [reference.transform(row[:, NUMERIC_INDEX]) for _ in range(1000)])
+    _, row_us = timed_ms(lambda: [scale_features(row.copy(), ours) for _ in range(1000)])
+    transform_equal = np.array_equal(reference.transform(N), ours.transform(N))
+
+    with tempfile.TemporaryDirectory() as directory:
+        sklearn_pickle = os.path.join(directory, "sklearn_scaler.pkl")
+        with open(sklearn_pickle, "wb") as f:
+            pickle.dump(reference, f)
+        ours_pickle = os.path.join(directory, "feature_scaler.pkl")
+        with open(ours_pickle, "wb") as f:
+            pickle.dump(ours, f)
+        sklearn_load_ms, load_ms = unpickle_ms(sklearn_pickle), unpickle_ms(ours_pickle)
+
+    print(f"\n{'='*70}")
+    print(f"FEATURE SCALER ({args.rows:,} patients, {args.chunks} chunks)")
+    print(f"{'='*70}")
+    print(f"{'':<34}{'sklearn':>12}{'FeatureScaler':>16}")
+    print(f"{'Fit in memory:':<34}{sklearn_fit_ms:10.1f} ms{fit_ms:14.1f} ms  (same bits: {same_bits(ours, reference)})")
+    print(f"{'Fit chunk by chunk:':<34}{sklearn_partial_ms:10.1f} ms{partial_ms:14.1f} ms  "
+          f"(same bits: {same_bits(streamed, streamed_reference)})")
+    print(f"{'Merged halves vs one fit:':<34}{'':>12}{max_relative_diff(merged, reference):14.1e}    max rel diff")
+    print(f"{'Transform batch (copy):':<34}{sklearn_transform_ms:10.1f} ms{transform_ms:14.1f} ms  "
+          f"(same bits: {transform_equal})")
+    print(f"{'Transform batch in place:':<34}{'':>12}{inplace_ms:14.1f} ms")
+    print(f"{'Transform one row:':<34}{row_sklearn_us:10.2f} µs{row_us:14.2f} µs")
+    print(f"{'Unpickle in a fresh process:':<34}{sklearn_load_ms:10.1f} ms{load_ms:14.1f} ms")
+    print(f"{'='*70}\n")
+
+    if not (same_bits(ours, reference) and same_bits(streamed, streamed_reference) and transform_equal):
+        print("❌ FeatureScaler does not reproduce sklearn's statistics")
+        sys.exit(1)
+    if max_relative_diff(merged, reference) > TOLERANCE:
+        print("❌ Merged statistics drift from a single fit")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Multi-model serving benchmark.
+
+Measures the latency of the primary prediction with and without a candidate
+model scored in shadow, and the throughput of vectorized batch scoring
+through the router.
+
+Usage:
+    python -m benchmarks.serving [--requests 5000]
+"""
+
+import argparse
+import os
+import pickle
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from model.features import encode_patient
+from model.registry import ModelRegistry
+from model.serving import CANDIDATE_MODEL, PRIMARY_MODEL, ModelRouter, candidate_artifacts
+
+
+def make_candidate(directory):
+    with open("model/logistic_model.pkl", "rb") as f:
+        model = pickle.load(f)
+    model.weights = model.weights * 1.05
+    with open(os.path.join(directory, "logistic_model.pkl"), "wb") as f:
+        pickle.dump(model, f)
+
+
+def primary_latencies(router, row, requests):
+    timings = np.empty(requests)
+    for i in range(requests):
+        start = time.perf_counter()
+        router.score(row, key=i)
+        timings[i] = time.perf_counter() - start
+    return timings * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=5000, help="single-patient requests per variant")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="cardio-serving-")
+    make_candidate(workdir)
+    row = encode_patient(age_years=55, gender=1, height=172, weight=88, ap_hi=145, ap_lo=92,
+                         cholesterol=1, gluc=0, smoke=1, alco=0, active=0)[np.newaxis, :]
+
+    single = ModelRouter({PRIMARY_MODEL: ModelRegistry()})
+    shadowed = ModelRouter({
+        PRIMARY_MODEL: ModelRegistry(),
+        CANDIDATE_MODEL: ModelRegistry(candidate_artifacts(workdir))
+    })
+    for router in (single, shadowed):
+        router.score(row)  # load artifacts outside the timed loop
+
+    alone = primary_latencies(single, row, args.requests)
+    with_shadow = primary_latencies(shadowed, row, args.requests)
+    time.sleep(0.5)  # let the shadow worker drain
+    stats = shadowed.summary()[CANDIDATE_MODEL]
+
+    print(f"\n{'='*70}")
+    print(f"PRIMARY PREDICTION LATENCY ({args.requests} requests, us)")
+    print(f"{'='*70}")
+    print(f"{'Variant':<28}{'p50':>10}{'p99':>10}")
+    print(f"{'Production only':<28}{np.percentile(alone, 50):>10.1f}{np.percentile(alone, 99):>10.1f}")
+    print(f"{'Candidate in shadow':<28}{np.percentile(with_shadow, 50):>10.1f}{np.percentile(with_shadow, 99):>10.1f}")
+    print(f"Shadow rows scored: {stats['shadowed']:,}, dropped batches: {stats['dropped']:,}, "
+          f"class agreement: {stats['agreement']:.1%}")
+
+    print(f"\n{'='*70}")
+    print("BATCH SCORING THROUGH THE ROUTER (production only)")
+    print(f"{'='*70}")
+    print(f"{'Batch size':<16}{'Time (ms)':>12}{'Rows / s':>16}")
+    for size in (1, 100, 10_000, 100_000):
+        X = np.repeat(row, size, axis=0)
+        start = time.perf_counter()
+        single.score(X)
+        elapsed = time.perf_counter() - start
+        print(f"{size:<16,}{elapsed*1000:>12.3f}{size/elapsed:>16,.0f}")
+    print(f"{'='*70}\n")
+
+    shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
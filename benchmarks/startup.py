@@ -0,0 +1,105 @@
+"""
+Startup benchmark for the Streamlit app.
+
+Measures what an autoscaled pod pays before it can serve traffic:
+
+  * cold start        - fresh interpreter -> first full run of app.py
+  * first interaction - latency of the first "Analyze" click after startup
+  * heavy imports     - which optional heavy modules the first render pulls in
+
+Every trial runs in a brand-new Python process so nothing is shared through
+sys.modules or Streamlit's resource cache.
+
+Usage:
+    python -m benchmarks.startup [--runs 5]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT, "app.py")
+
+HEAVY_MODULES = ["plotly.graph_objects", "pandas", "sklearn", "scipy"]
+
+# Executed in the child process. Prints a single JSON line on stdout.
+CHILD_SCRIPT = r"""
+import json, sys, time, warnings
+warnings.filterwarnings("ignore")
+t0 = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+t_import = time.perf_counter()
+preloaded = [m for m in sys.argv[2:] if m in sys.modules]
+
+at = AppTest.from_file(sys.argv[1], default_timeout=120).run()
+t_first = time.perf_counter()
+loaded_after_first = [m for m in sys.argv[2:] if m in sys.modules]
+
+at.button(key="analyze_btn").click().run()
+t_click = time.perf_counter()
+
+print(json.dumps({
+    "streamlit_import_s": t_import - t0,
+    "first_run_s": t_first - t_import,
+    "first_interaction_s": t_click - t_first,
+    "heavy_preloaded_by_streamlit": preloaded,
+    "heavy_after_first_run": loaded_after_first,
+    "heavy_after_interaction": [m for m in sys.argv[2:] if m in sys.modules],
+    "errors": [str(e.value) for e in at.exception],
+}))
+"""
+
+
+def run_trial():
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-c", CHILD_SCRIPT, APP_PATH] + HEAVY_MODULES,
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    wall = time.perf_counter() - start
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["cold_start_s"] = wall - result["first_interaction_s"]
+    return result
+
+
+def summarize(values):
+    return f"median {statistics.median(values)*1000:8.1f} ms   min {min(values)*1000:8.1f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=5, help="number of fresh-process trials")
+    args = parser.parse_args()
+
+    trials = [run_trial() for _ in range(args.runs)]
+
+    errors = [e for t in trials for e in t["errors"]]
+    if errors:
+        print(f"❌ App raised during benchmark: {errors[0]}")
+        sys.exit(1)
+
+    print(f"\n{'='*70}")
+    print(f"APP STARTUP BENCHMARK ({args.runs} fresh processes)")
+    print(f"{'='*70}")
+    print(f"Cold start (process -> first render): {summarize([t['cold_start_s'] for t in trials])}")
+    print(f"  streamlit import:                   {summarize([t['streamlit_import_s'] for t in trials])}")
+    print(f"  first script run:                   {summarize([t['first_run_s'] for t in trials])}")
+    print(f"First interaction (Analyze click):    {summarize([t['first_interaction_s'] for t in trials])}")
+    trial = trials[0]
+    preloaded = trial["heavy_preloaded_by_streamlit"]
+    print(f"Heavy modules imported by streamlit:  {', '.join(preloaded) or 'none'}")
+    print(f"Heavy modules added by first render:  {', '.join(m for m in trial['heavy_after_first_run'] if m not in preloaded) or 'none'}")
+    print(f"Heavy modules added by analysis:      {', '.join(m for m in trial['heavy_after_interaction'] if m not in trial['heavy_after_first_run']) or 'none'}")
+    print(f"{'='*70}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Subgroup metrics benchmark.
+
+Scores a synthetic test set (model/synthetic.py) with the production model
+and compares model/subgroups.py's one-pass evaluation of every slice
+(gender, age band and the categorical columns, alone and crossed) with
+filtering the rows slice by slice and computing each slice's metrics
+separately. Also times the vectorized ROC-AUC against the per-row loop it
+replaced in train.py. Checks that every count, metric and AUC matches the
+slice-by-slice reference (sklearn's roc_auc_score).
+
+Usage:
+    python -m benchmarks.subgroups [--rows 100000] [--model-dir model]
+"""
+
+import argparse
+import os
+import pickle
+import statistics
+import sys
+import time
+
+import numpy as np
+from sklearn.metrics import roc_auc_score
+
+from model.features import scale_features
+from model.subgroups import (SLICE_GROUPINGS, SLICE_LEVELS, metrics_from_confusion, roc_auc, slice_codes,
+                             subgroup_metrics)
+from model.synthetic import CohortGenerator
+
+TOLERANCE = 1e-9
+
+
+def timed_ms(fn, repeats=3):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return result, statistics.median(timings)
+
+
+def loop_auc(y, proba):
+    """The per-row trapezoid loop train.py used before"""
+    y_sorted = y[np.argsort(proba)[::-1]]
+    n_pos, n_neg = np.sum(y == 1), np.sum(y == 0)
+    tp = fp = 0
+    tpr_list, fpr_list = [], []
+    for label in y_sorted:
+        if label == 1:
+            tp += 1
+        else:
+            fp += 1
+        tpr_list.append(tp / n_pos)
+        fpr_list.append(fp / n_neg)
+    return sum((fpr_list[i] - fpr_list[i - 1]) * (tpr_list[i] + tpr_list[i - 1]) / 2 for i in range(1, len(fpr_list)))
+
+
+def per_slice(X_raw, y, pred, proba):
+    """Reference: one boolean mask and one set of metrics per slice"""
+    codes = slice_codes(X_raw)
+    report = []
+    for columns in SLICE_GROUPINGS:
+        slices = []
+        for index in np.ndindex(*[len(SLICE_LEVELS[name]) for name in columns]):
+            mask = np.ones(len(y), dtype=bool)
+            for name, code in zip(columns, index):
+                mask &= codes[name] == code
+            if not mask.any():
+                continue
+            y_slice, pred_slice = y[mask], pred[mask]
+            confusion = np.array([[[np.sum((y_slice == a) & (pred_slice == p)) for p in (0, 1)] for a in (0, 1)]])
+            entry = {name: None if np.isnan(values[0]) else float(values[0])
+                     for name, values in metrics_from_confusion(confusion).items()}
+            entry['n'] = int(mask.sum())
+            entry['roc_auc'] = (float(roc_auc_score(y_slice, proba[mask])) if 0 < y_slice.sum() < len(y_slice)
+                                else None)
+            slices.append(entry)
+        report.append(slices)
+    return report
+
+
+def max_difference(ours, reference):
+    worst = 0.0
+    for grouping, slices in zip(ours, reference):
+        if len(grouping['slices']) != len(slices):
+            return float('inf')
+        for entry, expected in zip(grouping['slices'], slices):
+            for name, value in expected.items():
+                if (value is None) != (entry[name] is None):
+                    return float('inf')
+                if value is not None:
+                    worst = max(worst, abs(entry[name] - value))
+    return worst
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=100_000, help="synthetic test patients")
+    parser.add_argument("--model-dir", default="model", help="directory with scaler.pkl and logistic_model.pkl")
+    args = parser.parse_args()
+
+    try:
+        with open(os.path.join(args.model_dir, "scaler.pkl"), "rb") as f:
+            scaler = pickle.load(f)
+        with open(os.path.join(args.model_dir, "logistic_model.pkl"), "rb") as f:
+            model = pickle.load(f)
+    except Exception as e:
+        print(f"❌ Error loading model: {e}")
+        sys.exit(1)
+
+    X_raw, y = CohortGenerator().sample(args.rows, np.random.default_rng(0))
+    X = scale_features(X_raw.copy(), scaler)
+    proba = model.predict_proba(X)
+    pred = model.predict(X)
+
+    ours, one_pass_ms = timed_ms(lambda: subgroup_metrics(X_raw, y, pred, proba))
+    reference, per_slice_ms = timed_ms(lambda: per_slice(X_raw, y, pred, proba), repeats=1)
+    n_slices = sum(len(grouping['slices']) for grouping in ours)
+    difference = max_difference(ours, reference)
+
+    auc, vectorized_ms = timed_ms(lambda: roc_auc(y, proba))
+    old_auc, loop_ms = timed_ms(lambda: loop_auc(y, proba), repeats=1)
+    sklearn_auc = roc_auc_score(y, proba)
+
+    print(f"\n{'='*70}")
+    print(f"SUBGROUP METRICS ({args.rows:,} patients, {len(SLICE_GROUPINGS)} groupings, {n_slices} slices)")
+    print(f"{'='*70}")
+    print(f"{'':<30}{'per slice':>14}{'one pass':>14}{'speedup':>10}")
+    print(f"{'Every slice:':<30}{per_slice_ms:11.1f} ms{one_pass_ms:11.1f} ms{per_slice_ms / one_pass_ms:9.1f}x")
+    print(f"{'Overall ROC-AUC (old loop):':<30}{loop_ms:11.1f} ms{vectorized_ms:11.1f} ms{loop_ms / vectorized_ms:9.1f}x")
+    print(f"{'Max diff vs per-slice:':<30}{difference:25.1e}")
+    print(f"{'ROC-AUC loop / ours / sklearn:':<30}  {old_auc:.6f} / {auc:.6f} / {sklearn_auc:.6f}")
+    print(f"{'='*70}\n")
+
+    if difference > TOLERANCE or abs(auc - sklearn_auc) > TOLERANCE:
+        print("❌ One-pass subgroup metrics differ from the per-slice reference")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Synthetic data generator benchmark.
+
+Times the stages of generating one chunk of patients (model/synthetic.py:
+sampling, raw columns, CSV formatting) and a full generate_data.py run of
+both forms into a temporary directory, then checks a generated cohort
+against the published training statistics the generator is fitted to:
+numeric means / standard deviations, category proportions, pairwise
+correlations, prevalence and ROC-AUC, and that the raw form's invalid
+rows are exactly the ones the week2 filters would drop.
+
+Usage:
+    python -m benchmarks.synthetic [--rows 1000000] [--workers N] [--model-dir model]
+"""
+
+import argparse
+import os
+import pickle
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+import generate_data
+from model.features import COLUMN_INDEX, DATASET_CATEGORY_COUNTS, NUMERIC_COLUMNS, compute_bmi
+from model.synthetic import (RAW_COLUMNS, SCALER_MEANS, SCALER_STDS, TARGET_CORRELATIONS, TARGET_PREVALENCE,
+                             TARGET_ROC_AUC, CohortGenerator, csv_bytes, raw_columns, roc_auc)
+from model.validation import RANGE_RULES
+
+# Largest acceptable gaps between the generated cohort and the targets
+TOLERANCES = {'mean': 0.05, 'std': 0.05, 'category': 0.01, 'correlation': 0.02,
+              'prevalence': 0.01, 'roc_auc': 0.01}
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def week2_valid(raw):
+    """Rows of the raw columns that pass the week2 filters (RANGE_RULES plus ap_hi > ap_lo)"""
+    columns = dict(zip(RAW_COLUMNS, raw))
+    columns['BMI'] = compute_bmi(columns['weight'], columns['height'])
+    keep = columns['ap_hi'] > columns['ap_lo']
+    for _, column, low, high in RANGE_RULES:
+        keep &= (columns[column] >= low) & (columns[column] <= high)
+    return keep
+
+
+def fit_errors(X, y, generator):
+    """Largest absolute gap to the targets, per statistic (mean / std in target stds)"""
+    numeric = X[:, [COLUMN_INDEX[name] for name in NUMERIC_COLUMNS]]
+    errors = {
+        'mean': np.max(np.abs(numeric.mean(axis=0) - SCALER_MEANS) / SCALER_STDS),
+        'std': np.max(np.abs(numeric.std(axis=0) - SCALER_STDS) / SCALER_STDS),
+        'category': max(
+            np.max(np.abs(np.bincount(X[:, COLUMN_INDEX[name]].astype(int), minlength=len(counts)) / len(X)
+                          - np.asarray(counts) / np.sum(counts)))
+            for name, counts in DATASET_CATEGORY_COUNTS.items()
+        ),
+        'correlation': max(
+            abs(np.corrcoef(X[:, COLUMN_INDEX[a]], X[:, COLUMN_INDEX[b]])[0, 1] - r)
+            for (a, b), r in TARGET_CORRELATIONS.items()
+        ),
+        'prevalence': abs(y.mean() - TARGET_PREVALENCE),
+        'roc_auc': abs(roc_auc(y, generator.logits(X)) - TARGET_ROC_AUC)
+    }
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="patients per chunk and per full run")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--model-dir", default="model", help="directory with scaler.pkl")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    try:
+        with open(os.path.join(args.model_dir, "scaler.pkl"), "rb") as f:
+            scaler = pickle.load(f)
+    except Exception as e:
+        print(f"❌ Error loading scaler: {e}")
+        sys.exit(1)
+
+    generator, fit_ms = timed(CohortGenerator, args.seed)
+    rng = np.random.default_rng(args.seed + 1)
+    (X, y), sample_ms = timed(generator.sample, args.rows, rng)
+    (raw, valid), raw_ms = timed(raw_columns, X, y, 0, rng)
+    raw_csv, raw_csv_ms = timed(csv_bytes, raw, generate_data.RAW_DECIMALS, ";")
+    scaled = X.copy()
+    scaled[:, generate_data.NUMERIC_INDEX] = (scaled[:, generate_data.NUMERIC_INDEX] - scaler.mean_) / scaler.scale_
+    final_csv, final_csv_ms = timed(csv_bytes, scaled.T, generate_data.FINAL_DECIMALS)
+
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        counts = generate_data.generate(args.rows, directory, {'raw', 'final'},
+                                        chunk_size=max(args.rows // (2 * args.workers), 10_000),
+                                        workers=args.workers, seed=args.seed, scaler=scaler)
+        run_s = time.perf_counter() - start
+        written_mb = sum(os.path.getsize(os.path.join(directory, name)) for name in counts) / 1e6
+
+    errors = fit_errors(X, y, generator)
+    filters_agree = np.array_equal(week2_valid(raw), valid)
+
+    print(f"\n{'='*70}")
+    print(f"SYNTHETIC DATA ({args.rows:,} patients, {args.workers} worker(s))")
+    print(f"{'='*70}")
+    print(f"{'Fit generator (once):':<34}{fit_ms:10.0f} ms")
+    print(f"{'Sample features + labels:':<34}{sample_ms:10.0f} ms")
+    print(f"{'Raw columns:':<34}{raw_ms:10.0f} ms")
+    print(f"{'Format raw CSV:':<34}{raw_csv_ms:10.0f} ms  ({len(raw_csv) / 1e6:.0f} MB)")
+    print(f"{'Format final X CSV:':<34}{final_csv_ms:10.0f} ms  ({len(final_csv) / 1e6:.0f} MB)")
+    print(f"{'Full run, both forms:':<34}{run_s:10.2f} s   "
+          f"({args.rows / run_s:,.0f} rows/s, {written_mb:.0f} MB)")
+    print(f"{'Fit to targets':<34}{'error':>10}{'tolerance':>12}")
+    for name, error in errors.items():
+        print(f"  {name:<32}{error:10.4f}{TOLERANCES[name]:12.2f}")
+    print(f"{'Invalid rows match week2 filters:':<34}{'yes' if filters_agree else 'NO':>10}  "
+          f"({np.count_nonzero(~valid) / len(valid):.2%} invalid)")
+    print(f"{'='*70}\n")
+
+    failed = [name for name, error in errors.items() if error > TOLERANCES[name]]
+    if failed:
+        print(f"❌ Generated cohort drifts from the targets: {', '.join(failed)}")
+        sys.exit(1)
+    if not filters_agree:
+        print("❌ Raw rows flagged invalid differ from the week2 filters")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
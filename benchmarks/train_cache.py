@@ -0,0 +1,117 @@
+"""
+Training cache benchmark.
+
+Generates a synthetic training set (generate_data.py, final form) and times
+what a cached train.py run does instead of training: computing the cache
+key over the datasets, scaler, settings and training code (first with a
+cold digest memo, then with every file unchanged), and looking up and
+restoring a stored result. Then checks that editing a dataset, a setting or
+the code changes the key, and that eviction keeps the most recently used
+entries within the entry and size limits.
+
+Usage:
+    python -m benchmarks.train_cache [--rows 1000000] [--model-dir model]
+"""
+
+import argparse
+import os
+import pickle
+import statistics
+import sys
+import tempfile
+import time
+
+import generate_data
+import train
+from model.train_cache import TrainingCache, code_files
+
+
+def timed_ms(fn, repeats=5):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return result, statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="patients in the generated training set")
+    parser.add_argument("--model-dir", default="model", help="directory with scaler.pkl and trained artifacts")
+    args = parser.parse_args()
+
+    scaler_path = os.path.join(args.model_dir, "scaler.pkl")
+    try:
+        with open(scaler_path, "rb") as f:
+            scaler = pickle.load(f)
+    except Exception as e:
+        print(f"❌ Error loading scaler: {e}")
+        sys.exit(1)
+    artifacts = [os.path.join(args.model_dir, name) for name in ["logistic_model.pkl", "training_report.json"]]
+    settings = train.training_settings()
+    sources = code_files(train.__file__, *train.TRAINING_MODULES)
+
+    with tempfile.TemporaryDirectory() as directory:
+        data_dir = os.path.join(directory, "data")
+        generate_data.generate(args.rows, data_dir, {'final'}, workers=os.cpu_count() or 1, scaler=scaler)
+        inputs = [os.path.join(data_dir, name) for name in generate_data.FINAL_FILES] + [scaler_path]
+        input_mb = sum(os.path.getsize(path) for path in inputs) / 1e6
+
+        cache = TrainingCache(os.path.join(directory, "cache"))
+        start = time.perf_counter()
+        key = cache.key(inputs, settings, sources)
+        cold_ms = (time.perf_counter() - start) * 1000
+        warm_key, warm_ms = timed_ms(lambda: cache.key(inputs, settings, sources))
+
+        cache.store(key, artifacts)
+        restored, lookup_ms = timed_ms(lambda: cache.lookup(key))
+
+        # Any change to what determines the result is a miss
+        with open(inputs[2], "ab") as f:
+            f.write(b"1\n")
+        data_changes = cache.key(inputs, settings, sources) != key
+        settings_change = cache.key(inputs, {**settings, "iterations": settings["iterations"] + 1}, sources) != key
+        copied = [os.path.join(directory, os.path.basename(path)) if path == os.path.abspath(train.__file__)
+                  else path for path in sources]
+        with open(train.__file__, "rb") as src, open(os.path.join(directory, "train.py"), "wb") as dst:
+            dst.write(src.read())
+        copied_key = cache.key(inputs, settings, copied)
+        with open(os.path.join(directory, "train.py"), "ab") as f:
+            f.write(b"\n# edited\n")
+        code_change = cache.key(inputs, settings, copied) != copied_key
+
+        # LRU: 3 entries of 3 kB within 10 kB; a lookup protects an old entry
+        blob = os.path.join(directory, "blob")
+        with open(blob, "wb") as f:
+            f.write(b"x" * 3000)
+        small = TrainingCache(os.path.join(directory, "lru"), max_entries=3, max_bytes=10_000)
+        for name in ["a", "b", "c", "d"]:
+            small.store(name, [blob])
+            time.sleep(0.01)
+        small.lookup("b")
+        time.sleep(0.01)
+        small.store("e", [blob])
+        lru_order = [entry[0] for entry in small.entries()]
+
+    print(f"\n{'='*70}")
+    print(f"TRAINING CACHE ({args.rows:,} patients, {input_mb:.0f} MB of inputs)")
+    print(f"{'='*70}")
+    print(f"{'Key, cold (hash every input):':<36}{cold_ms:10.1f} ms")
+    print(f"{'Key, unchanged files (memo):':<36}{warm_ms:10.1f} ms")
+    print(f"{'Lookup + read stored artifacts:':<36}{lookup_ms:10.2f} ms  ({len(restored or {})} files)")
+    print(f"{'Key changes with data / settings / code:':<36}  "
+          f"{data_changes} / {settings_change} / {code_change}")
+    print(f"{'Entries after LRU eviction:':<36}{', '.join(lru_order):>10}")
+    print(f"{'='*70}\n")
+
+    if warm_key != key or restored is None or not (data_changes and settings_change and code_change):
+        print("❌ Cache keys or lookups are inconsistent")
+        sys.exit(1)
+    if lru_order != ["e", "b", "d"]:
+        print("❌ Eviction did not keep the most recently used entries")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+What-if sensitivity benchmark.
+
+Compares scoring every what-if scenario for one patient with a single
+batched predict_proba call (model/whatif.py) against one predict_proba call
+per scenario.
+
+Usage:
+    python -m benchmarks.whatif [--repeats 200]
+"""
+
+import argparse
+import pickle
+import statistics
+import time
+
+import numpy as np
+
+from model.features import encode_patient, scale_features
+from model.whatif import build_whatif_grid, sensitivity_curves
+
+
+def load_artifacts():
+    with open("model/logistic_model.pkl", "rb") as f:
+        model = pickle.load(f)
+    with open("model/scaler.pkl", "rb") as f:
+        scaler = pickle.load(f)
+    return model, scaler
+
+
+def per_scenario(model, scaler, base_row):
+    X, _ = build_whatif_grid(base_row)
+    return [model.predict_proba(scale_features(row[np.newaxis, :].copy(), scaler))[0] for row in X]
+
+
+def timed(fn, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeats", type=int, default=200, help="timed repetitions per variant")
+    args = parser.parse_args()
+
+    model, scaler = load_artifacts()
+    base_row = encode_patient(age_years=55, gender=1, height=172, weight=88, ap_hi=145, ap_lo=92,
+                              cholesterol=1, gluc=0, smoke=1, alco=0, active=0)
+    n_scenarios = len(build_whatif_grid(base_row)[0])
+
+    batched = timed(lambda: sensitivity_curves(model, scaler, base_row), args.repeats)
+    looped = timed(lambda: per_scenario(model, scaler, base_row), args.repeats)
+
+    print(f"\n{'='*70}")
+    print(f"WHAT-IF SENSITIVITY ({n_scenarios} scenarios, median of {args.repeats})")
+    print(f"{'='*70}")
+    print(f"{'One batched predict_proba:':<34}{batched*1000:8.3f} ms")
+    print(f"{'One predict_proba per scenario:':<34}{looped*1000:8.3f} ms")
+    print(f"{'Speed-up:':<34}{looped/batched:8.1f}x")
+    print(f"{'='*70}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+Chart builders for the Streamlit app.
+
+Kept out of app.py so they are imported once per process (Streamlit
+re-executes app.py on every rerun, not the modules it imports) and can be
+benchmarked without running the app.
+"""
+
+import math
+import os
+
+import numpy as np
+import streamlit as st
+
+# Risk gauge renderer: "plotly" (default) or "svg". The SVG gauge skips plotly
+# entirely: no figure is built or validated and the browser receives ~1 KB of
+# markup instead of the full plotly figure spec.
+GAUGE_RENDERER = os.environ.get("CARDIO_GAUGE_RENDERER", "plotly")
+
+GAUGE_BANDS = [
+    (0, 30, '#d1fae5'),
+    (30, 70, '#fef3c7'),
+    (70, 100, '#fee2e2')
+]
+GAUGE_THRESHOLD = 70
+
+@st.cache_resource
+def get_gauge_template(theme):
+    text_color = '#e2e8f0' if theme == 'dark' else '#1e293b'
+    indicator = {
+        'mode': "gauge+number",
+        'domain': {'x': [0, 1], 'y': [0, 1]},
+        'title': {'text': "Risk Probability (%)", 'font': {'size': 20, 'color': text_color}},
+        'gauge': {
+            'axis': {'range': [None, 100], 'tickwidth': 2},
+            'bar': {'color': "#3b82f6"},
+            'bgcolor': "white",
+            'borderwidth': 2,
+            'bordercolor': "#cbd5e1",
+            'steps': [{'range': [start, end], 'color': color} for start, end, color in GAUGE_BANDS],
+            'threshold': {
+                'line': {'color': "red", 'width': 4},
+                'thickness': 0.75,
+                'value': GAUGE_THRESHOLD
+            }
+        }
+    }
+    layout = {
+        'paper_bgcolor': 'rgba(0,0,0,0)',
+        'plot_bgcolor': 'rgba(0,0,0,0)',
+        'font': {'color': text_color},
+        'height': 350,
+        'margin': dict(l=20, r=20, t=50, b=20)
+    }
+    return indicator, layout
+
+# Figures are cached per (displayed value, theme). The gauge shows one decimal,
+# so there are at most 2 x 1001 distinct figures; st.plotly_chart only reads
+# the figure, so sharing it between sessions is safe.
+@st.cache_resource(max_entries=512)
+def build_gauge_chart(value, theme):
+    import plotly.graph_objects as go
+
+    indicator, layout = get_gauge_template(theme)
+    return go.Figure(go.Indicator(value=value, **indicator), layout=layout)
+
+def create_gauge_chart(probability, theme):
+    return build_gauge_chart(round(probability * 100, 1), theme)
+
+SVG_GAUGE = {'cx': 150, 'cy': 185, 'r': 120, 'band_width': 36, 'bar_width': 14}
+
+def svg_gauge_point(value, radius):
+    angle = math.pi * (1 - value / 100)
+    return (SVG_GAUGE['cx'] + radius * math.cos(angle),
+            SVG_GAUGE['cy'] - radius * math.sin(angle))
+
+def svg_gauge_arc(start, end, radius):
+    x0, y0 = svg_gauge_point(start, radius)
+    x1, y1 = svg_gauge_point(end, radius)
+    return f"M {x0:.2f} {y0:.2f} A {radius} {radius} 0 0 1 {x1:.2f} {y1:.2f}"
+
+@st.cache_resource
+def get_svg_gauge_template(theme):
+    # Everything except the value bar and the number is static per theme
+    text_color = '#e2e8f0' if theme == 'dark' else '#1e293b'
+    r = SVG_GAUGE['r']
+    bands = "".join(
+        f'<path d="{svg_gauge_arc(start, end, r)}" stroke="{color}" '
+        f'stroke-width="{SVG_GAUGE["band_width"]}" fill="none"/>'
+        for start, end, color in GAUGE_BANDS
+    )
+    tx0, ty0 = svg_gauge_point(GAUGE_THRESHOLD, r - SVG_GAUGE['band_width'] / 2)
+    tx1, ty1 = svg_gauge_point(GAUGE_THRESHOLD, r + SVG_GAUGE['band_width'] / 2)
+    threshold = f'<line x1="{tx0:.2f}" y1="{ty0:.2f}" x2="{tx1:.2f}" y2="{ty1:.2f}" stroke="red" stroke-width="4"/>'
+    ticks = "".join(
+        f'<text x="{x:.1f}" y="{y:.1f}" font-size="11" text-anchor="middle" fill="{text_color}">{value}</text>'
+        for value in range(0, 101, 20)
+        for x, y in [svg_gauge_point(value, r + SVG_GAUGE['band_width'] / 2 + 12)]
+    )
+    prefix = (
+        '<div style="max-width: 420px; margin: 0 auto;">'
+        '<svg viewBox="0 0 300 215" xmlns="http://www.w3.org/2000/svg" role="img" aria-label="Risk Probability">'
+        f'<text x="150" y="18" font-size="16" text-anchor="middle" fill="{text_color}">Risk Probability (%)</text>'
+        f'{bands}{threshold}{ticks}'
+    )
+    suffix = '</svg></div>'
+    return prefix, suffix, text_color
+
+def create_svg_gauge(probability, theme):
+    value = min(max(probability * 100, 0.0), 100.0)
+    prefix, suffix, text_color = get_svg_gauge_template(theme)
+    bar = ""
+    if value > 0:
+        bar = (f'<path d="{svg_gauge_arc(0, value, SVG_GAUGE["r"])}" stroke="#3b82f6" '
+               f'stroke-width="{SVG_GAUGE["bar_width"]}" fill="none"/>')
+    number = (f'<text x="150" y="178" font-size="40" font-weight="700" text-anchor="middle" '
+              f'fill="{text_color}">{value:.1f}</text>')
+    return f"{prefix}{bar}{number}{suffix}"
+
+def create_sensitivity_chart(values, probabilities, current, label, theme):
+    import plotly.graph_objects as go
+
+    text_color = '#e2e8f0' if theme == 'dark' else '#1e293b'
+    risk = probabilities * 100
+
+    fig = go.Figure()
+    for start, end, color in GAUGE_BANDS:
+        fig.add_hrect(y0=start, y1=end, fillcolor=color, opacity=0.35, line_width=0, layer="below")
+    fig.add_trace(go.Scatter(
+        x=values, y=risk, mode="lines",
+        line={'color': "#3b82f6", 'width': 3},
+        hovertemplate=f"{label}: %{{x}}<br>Risk: %{{y:.1f}}%<extra></extra>"
+    ))
+    fig.add_trace(go.Scatter(
+        x=[current], y=[float(np.interp(current, values, risk))], mode="markers",
+        marker={'color': "red", 'size': 12},
+        hovertemplate="You: %{y:.1f}%<extra></extra>"
+    ))
+    fig.update_layout(
+        title={'text': label, 'font': {'size': 16, 'color': text_color}},
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font={'color': text_color},
+        showlegend=False,
+        height=280,
+        margin=dict(l=20, r=20, t=50, b=20),
+        yaxis={'title': "Risk (%)", 'range': [0, 100]}
+    )
+    return fig
+
+def create_contribution_chart(labels, values, theme):
+    import plotly.graph_objects as go
+
+    text_color = '#e2e8f0' if theme == 'dark' else '#1e293b'
+    fig = go.Figure(go.Bar(
+        x=values, y=labels, orientation="h",
+        marker={'color': ["#ef4444" if value > 0 else "#10b981" for value in values]},
+        hovertemplate="%{y}: %{x:+.2f} log-odds<extra></extra>"
+    ))
+    fig.update_layout(
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font={'color': text_color},
+        showlegend=False,
+        height=40 + 26 * len(labels),
+        margin=dict(l=20, r=20, t=10, b=30),
+        xaxis={'title': "Effect on risk vs. average patient (log-odds)", 'zeroline': True},
+        yaxis={'autorange': "reversed"}
+    )
+    return fig
+
+def create_bar_rows(labels, values, max_value=None, value_format="{:.0%}"):
+    """
+    Horizontal bar rows as plain HTML (styled by .stat-bars in theme.css)
+
+    Used for the dataset dashboards on the landing page, where loading
+    plotly would add to every cold start.
+    """
+    max_value = max_value or max(values, default=0) or 1
+    rows = "".join(
+        f'<div class="stat-bar-row"><span class="stat-bar-label">{label}</span>'
+        f'<div class="stat-bar-track"><div class="stat-bar-fill" style="width: {min(value / max_value, 1) * 100:.1f}%"></div></div>'
+        f'<span class="stat-bar-value">{value_format.format(value)}</span></div>'
+        for label, value in zip(labels, values)
+    )
+    return f'<div class="stat-bars">{rows}</div>'
@@ -0,0 +1,157 @@
+"""
+Export the trained model as a standalone, dependency-free scoring module.
+
+The generated file needs nothing but the Python standard library: the
+scaler is folded into the logistic regression weights, and the encodings,
+BMI derivation, calibrator and risk bands are inlined as constants. It is
+meant for machines that cannot install numpy, scikit-learn or Streamlit.
+
+Usage:
+    python export_scorer.py [output.py]
+"""
+
+import argparse
+
+from model.calibration import IsotonicCalibrator, PlattCalibrator
+from model.features import FEATURE_COLUMNS, GENDER_OPTIONS, LEVEL_OPTIONS
+from model.registry import ModelRegistry
+from model.rules import RISK_CUTS, RISK_LEVELS
+from model.scaler import fold
+
+DEFAULT_OUTPUT = "model/cardio_scorer.py"
+
+# ============================================================================
+# SOURCE TEMPLATE
+# ============================================================================
+TEMPLATE = '''"""
+Cardiovascular disease risk scorer (generated by export_scorer.py).
+
+Model version {version}. Pure Python, no third-party dependencies; do not
+edit by hand, re-export after retraining instead.
+
+    from cardio_scorer import score
+    p, level = score(age_years=55, gender="Male", height=175, weight=85,
+                     ap_hi=140, ap_lo=90, cholesterol="Above Normal",
+                     gluc="Normal", smoke=0, alco=0, active=1)
+"""
+
+from bisect import bisect_right
+from math import exp, log
+
+MODEL_VERSION = {version!r}
+
+# Encodings of the app's categorical inputs
+GENDER = {gender!r}
+LEVEL = {level!r}
+
+# Risk bands: probability < cut -> level
+RISK_CUTS = {risk_cuts!r}
+RISK_LEVELS = {risk_levels!r}
+
+{calibration}
+
+def _encode(value, labels):
+    return labels[value] if isinstance(value, str) else value
+
+def probability(age_years, gender, height, weight, ap_hi, ap_lo,
+                cholesterol, gluc, smoke, alco, active):
+    """Disease probability; categorical inputs take labels or encoded values"""
+    gender = _encode(gender, GENDER)
+    cholesterol = _encode(cholesterol, LEVEL)
+    gluc = _encode(gluc, LEVEL)
+    BMI = weight / ((height / 100) ** 2)
+    z = ({logit})
+    z = -20.0 if z < -20.0 else 20.0 if z > 20.0 else z
+    return _calibrate(1 / (1 + exp(-z)))
+
+def risk_level(p):
+    for cut, level in zip(RISK_CUTS, RISK_LEVELS):
+        if p < cut:
+            return level
+    return RISK_LEVELS[-1]
+
+def score(**patient):
+    """(probability, risk level) for one patient"""
+    p = probability(**patient)
+    return p, risk_level(p)
+'''
+
+IDENTITY_CALIBRATION = '''def _calibrate(p):
+    return p'''
+
+ISOTONIC_CALIBRATION = '''# Isotonic calibration: piecewise-linear map through these points
+_THRESHOLDS = {thresholds!r}
+_VALUES = {values!r}
+
+def _calibrate(p):
+    if p <= _THRESHOLDS[0]:
+        return _VALUES[0]
+    if p >= _THRESHOLDS[-1]:
+        return _VALUES[-1]
+    i = bisect_right(_THRESHOLDS, p)
+    x0, x1 = _THRESHOLDS[i - 1], _THRESHOLDS[i]
+    y0, y1 = _VALUES[i - 1], _VALUES[i]
+    return y0 + (y1 - y0) * (p - x0) / (x1 - x0)'''
+
+PLATT_CALIBRATION = '''# Platt calibration: sigmoid(a * logit(p) + b)
+_A = {a!r}
+_B = {b!r}
+
+def _calibrate(p):
+    p = min(max(p, 1e-9), 1 - 1e-9)
+    return 1 / (1 + exp(-(_A * log(p / (1 - p)) + _B)))'''
+
+# ============================================================================
+# CODE GENERATION
+# ============================================================================
+
+def folded_coefficients(model, scaler):
+    """Weights by feature name and bias on the raw (unscaled) features"""
+    weights, bias = fold(scaler, model.weights, model.bias)
+    return {name: float(w) for name, w in zip(FEATURE_COLUMNS, weights)}, bias
+
+def calibration_source(calibrator):
+    if calibrator is None:
+        return IDENTITY_CALIBRATION
+    if isinstance(calibrator, IsotonicCalibrator):
+        return ISOTONIC_CALIBRATION.format(
+            thresholds=tuple(calibrator.thresholds.tolist()), values=tuple(calibrator.values.tolist())
+        )
+    if isinstance(calibrator, PlattCalibrator):
+        return PLATT_CALIBRATION.format(a=calibrator.a, b=calibrator.b)
+    raise TypeError(f"cannot export calibrator {type(calibrator).__name__}")
+
+def generate_scorer(model, scaler, version):
+    """Source of the standalone scoring module"""
+    weights, bias = folded_coefficients(model, scaler)
+    terms = [repr(bias)] + [
+        f"{'-' if weights[name] < 0 else '+'} {abs(weights[name])!r} * {name}" for name in FEATURE_COLUMNS
+    ]
+    return TEMPLATE.format(
+        version=version,
+        gender={label: i for i, label in enumerate(GENDER_OPTIONS)},
+        level={label: i for i, label in enumerate(LEVEL_OPTIONS)},
+        risk_cuts=tuple(RISK_CUTS),
+        risk_levels=tuple(label for label, _, _ in RISK_LEVELS),
+        calibration=calibration_source(getattr(model, 'calibrator', None)),
+        logit="\n         ".join(terms)
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("output", nargs="?", default=DEFAULT_OUTPUT, help="where to write the module")
+    args = parser.parse_args()
+
+    active = ModelRegistry().get()
+    if active is None:
+        print("❌ Could not load the model artifacts")
+        return
+
+    source = generate_scorer(active.model, active.scaler, active.version)
+    compile(source, args.output, "exec")
+    with open(args.output, "w") as f:
+        f.write(source)
+    print(f"✅ Exported model {active.version} to: {args.output}")
+
+if __name__ == "__main__":
+    main()
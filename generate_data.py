@@ -0,0 +1,157 @@
+"""
+Generate a synthetic cardio dataset for scale and load testing.
+
+Patients are drawn by model/synthetic.py's generator, whose marginals,
+correlations, prevalence and ROC-AUC are fitted to the published training
+statistics. Two forms can be written, chunk by chunk:
+
+- raw: cardio_train.csv as in the Kaggle download (';'-separated, age in
+  days), including a realistic share of rows the week2 filters reject
+- final: X_train_final.csv / X_test_final.csv / y_train_final.csv /
+  y_test_final.csv as written by the week2 notebook (valid rows only,
+  numeric columns scaled with model/scaler.pkl), ready for train.py
+
+Usage:
+    python generate_data.py [--rows 70000] [--form both] [--output data] [--workers N]
+"""
+
+import argparse
+import os
+import pickle
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from model.features import CATEGORICAL_COLUMNS, FEATURE_COLUMNS, NUMERIC_INDEX
+from model.synthetic import RAW_COLUMNS, CohortGenerator, csv_bytes, raw_columns
+
+DEFAULT_CHUNK_SIZE = 1_000_000
+TEST_SIZE = 0.2
+
+RAW_FILE = "cardio_train.csv"
+FINAL_FILES = ["X_train_final.csv", "X_test_final.csv", "y_train_final.csv", "y_test_final.csv"]
+
+# Decimals per column: integers except the raw weight (one decimal, as in the
+# download) and the scaled numeric features, written at full precision so
+# unscaling gives back the raw values
+RAW_DECIMALS = [1 if name == 'weight' else 0 for name in RAW_COLUMNS]
+FINAL_DECIMALS = [0 if name in CATEGORICAL_COLUMNS else None for name in FEATURE_COLUMNS]
+
+HEADERS = {
+    RAW_FILE: ";".join(RAW_COLUMNS),
+    "X_train_final.csv": ",".join(FEATURE_COLUMNS),
+    "X_test_final.csv": ",".join(FEATURE_COLUMNS),
+    "y_train_final.csv": "cardio",
+    "y_test_final.csv": "cardio"
+}
+
+# ============================================================================
+# CHUNK WORKERS
+# ============================================================================
+# Worker processes receive the fitted generator and the scaler once, through
+# the pool initializer
+_generator = _scaler_mean = _scaler_scale = None
+
+def _init_worker(generator, scaler_mean, scaler_scale):
+    global _generator, _scaler_mean, _scaler_scale
+    _generator, _scaler_mean, _scaler_scale = generator, scaler_mean, scaler_scale
+
+def _generate_chunk(seed, n, first_id, forms, test_size):
+    """CSV bytes per output file for one chunk of patients"""
+    rng = np.random.default_rng(seed)
+    X, y = _generator.sample(n, rng)
+    raw, valid = raw_columns(X, y, first_id, rng)
+    output = {}
+    if 'raw' in forms:
+        output[RAW_FILE] = csv_bytes(raw, RAW_DECIMALS, sep=";")
+    if 'final' in forms:
+        X, y = X[valid], y[valid]
+        X[:, NUMERIC_INDEX] = (X[:, NUMERIC_INDEX] - _scaler_mean) / _scaler_scale
+        n_train = round(len(X) * (1 - test_size))
+        for name, rows in [("train", slice(None, n_train)), ("test", slice(n_train, None))]:
+            output[f"X_{name}_final.csv"] = csv_bytes(X[rows].T, FINAL_DECIMALS)
+            output[f"y_{name}_final.csv"] = csv_bytes([y[rows]], [0])
+    return output
+
+def generate(n_rows, output_dir, forms, chunk_size=DEFAULT_CHUNK_SIZE, workers=1, seed=0,
+             test_size=TEST_SIZE, scaler=None):
+    """
+    Write the requested forms to output_dir, chunk by chunk (in order),
+    keeping at most 2 chunks per worker in flight
+
+    Returns:
+        {file name: rows written}
+    """
+    generator = CohortGenerator(seed=seed)
+    mean = np.asarray(scaler.mean_) if scaler is not None else None
+    scale = np.asarray(scaler.scale_) if scaler is not None else None
+    files = ([RAW_FILE] if 'raw' in forms else []) + (FINAL_FILES if 'final' in forms else [])
+    n_chunks = -(-n_rows // chunk_size)
+    tasks = [
+        (child, min(chunk_size, n_rows - i * chunk_size), i * chunk_size, forms, test_size)
+        for i, child in enumerate(np.random.SeedSequence(seed).spawn(n_chunks))
+    ]
+
+    os.makedirs(output_dir, exist_ok=True)
+    handles = {name: open(os.path.join(output_dir, name), "wb") for name in files}
+    counts = dict.fromkeys(files, 0)
+
+    def write(chunk):
+        for name, data in chunk.items():
+            handles[name].write(data)
+            counts[name] += data.count(b"\n")
+
+    try:
+        for name in files:
+            handles[name].write(HEADERS[name].encode() + b"\n")
+        if workers <= 1:
+            _init_worker(generator, mean, scale)
+            for task in tasks:
+                write(_generate_chunk(*task))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(generator, mean, scale)) as pool:
+                pending = deque()
+                for task in tasks:
+                    pending.append(pool.submit(_generate_chunk, *task))
+                    if len(pending) >= 2 * workers:
+                        write(pending.popleft().result())
+                while pending:
+                    write(pending.popleft().result())
+    finally:
+        for handle in handles.values():
+            handle.close()
+    return counts
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=70000, help="patients to generate (raw rows)")
+    parser.add_argument("--form", choices=["raw", "final", "both"], default="both")
+    parser.add_argument("--output", default="data", help="directory to write the CSVs to")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    forms = {"raw", "final"} if args.form == "both" else {args.form}
+
+    scaler = None
+    if 'final' in forms:
+        try:
+            with open("model/scaler.pkl", "rb") as f:
+                scaler = pickle.load(f)
+        except Exception as e:
+            print(f"❌ Error loading scaler: {e}")
+            return
+
+    start = time.perf_counter()
+    counts = generate(args.rows, args.output, forms, args.chunk_size, args.workers, args.seed, scaler=scaler)
+    elapsed = time.perf_counter() - start
+
+    print(f"✅ Generated {args.rows:,} patients in {elapsed:.1f}s ({args.rows / elapsed:,.0f} rows/s)")
+    for name, rows in counts.items():
+        print(f"   {os.path.join(args.output, name)}: {rows:,} rows")
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,7 @@ class LogisticRegression():
         self.n_iters = n_iters
         self.weights = None
         self.bias = None
+        self.calibrator = None
 
     def fit(self, X, y):
         n_samples, n_features = X.shape
@@ -29,7 +30,10 @@ class LogisticRegression():
 
     def predict_proba(self, X):
         linear_pred = np.dot(X, self.weights) + self.bias
-        return sigmoid(linear_pred)
+        probs = sigmoid(linear_pred)
+        # Models pickled before calibration was added have no calibrator
+        calibrator = getattr(self, 'calibrator', None)
+        return calibrator(probs) if calibrator is not None else probs
 
     def predict(self, X):
         probs = self.predict_proba(X)
@@ -0,0 +1,210 @@
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+
+from model.features import FEATURE_COLUMNS
+from model.metrics import AUDIT_BUFFERED, AUDIT_RECORDS_TOTAL, ERRORS_TOTAL, REGISTRY
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# AUDIT LOG CONFIGURATION
+# ============================================================================
+# Append-only JSON-lines file of every assessment; an empty path disables it
+AUDIT_PATH = os.environ.get("CARDIO_AUDIT_PATH", "logs/audit.jsonl")
+# Size-based rotation: audit.jsonl -> audit.jsonl.1 -> ... -> audit.jsonl.N
+AUDIT_MAX_BYTES = int(os.environ.get("CARDIO_AUDIT_MAX_BYTES", str(10 * 1024 * 1024)))
+AUDIT_BACKUPS = int(os.environ.get("CARDIO_AUDIT_BACKUPS", "10"))
+
+# Records held in memory waiting for the writer
+BUFFER_CAPACITY = 4096
+# The writer wakes when this many records are waiting, or every FLUSH_INTERVAL seconds
+BATCH_SIZE = 256
+FLUSH_INTERVAL = 1.0
+# Backpressure: when the buffer is full, record() waits up to this long for
+# the writer to make room, then drops the record. Drops are counted and
+# written to the log as a "dropped" marker, so gaps in the trail are visible.
+# 0 never blocks the prediction path.
+BLOCK_TIMEOUT = float(os.environ.get("CARDIO_AUDIT_BLOCK_TIMEOUT", "0.05"))
+
+SCHEMA_VERSION = 1
+
+_encode = json.JSONEncoder(separators=(',', ':')).encode
+
+# ============================================================================
+# AUDIT LOG
+# ============================================================================
+
+class AuditLog:
+    """
+    Buffered, append-only prediction audit log
+
+    record() copies the assessment into a preallocated ring buffer and
+    returns; a background thread drains the buffer in batches, encodes the
+    records as compact JSON lines (inputs as a list in FEATURE_COLUMNS
+    order, named in a header line at the top of every file) and appends
+    them with one write and one fsync per batch, rotating the file by size.
+    """
+
+    def __init__(self, path=AUDIT_PATH, max_bytes=AUDIT_MAX_BYTES, backups=AUDIT_BACKUPS,
+                 capacity=BUFFER_CAPACITY, batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL,
+                 block_timeout=BLOCK_TIMEOUT, fsync=True):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.block_timeout = block_timeout
+        self.fsync = fsync
+
+        self._slots = [None] * capacity
+        self._head = 0   # next slot to fill
+        self._size = 0
+        self._cond = threading.Condition()
+        self._closed = False
+
+        self.recorded = 0
+        self.written = 0
+        self.dropped = 0
+        self._dropped_unlogged = 0
+        self.write_errors = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = None
+        self._writer = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._writer.start()
+
+    def record(self, row, probability, risk_level, model, version, session=None):
+        """Queue one assessment; never does I/O"""
+        record = (time.time(), session, model, version, float(probability), risk_level, row.tolist())
+        with self._cond:
+            capacity = len(self._slots)
+            if self._size == capacity and self.block_timeout > 0:
+                self._cond.notify()
+                self._cond.wait_for(lambda: self._size < capacity or self._closed, self.block_timeout)
+            if self._size == capacity or self._closed:
+                self.dropped += 1
+                self._dropped_unlogged += 1
+                return False
+            self._slots[self._head] = record
+            self._head = (self._head + 1) % capacity
+            self._size += 1
+            self.recorded += 1
+            if self._size == self.batch_size:
+                self._cond.notify()
+        return True
+
+    def _drain(self):
+        """Take every buffered record (oldest first); caller holds the lock"""
+        capacity = len(self._slots)
+        start = (self._head - self._size) % capacity
+        if start + self._size <= capacity:
+            batch = self._slots[start:start + self._size]
+        else:
+            batch = self._slots[start:] + self._slots[:self._head]
+        self._size = 0
+        dropped, self._dropped_unlogged = self._dropped_unlogged, 0
+        self._cond.notify_all()  # wake producers waiting for room
+        return batch, dropped
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._size >= self.batch_size or self._closed, self.flush_interval)
+                batch, dropped = self._drain()
+                closing = self._closed
+            if batch or dropped:
+                self._write(batch, dropped)
+            if closing:
+                return
+
+    def _write(self, batch, dropped):
+        lines = [
+            _encode({'ts': round(ts, 3), 'session': session, 'model': model, 'version': version,
+                     'probability': round(probability, 6), 'risk': risk, 'x': x})
+            for ts, session, model, version, probability, risk, x in batch
+        ]
+        if dropped:
+            lines.append(_encode({'ts': round(time.time(), 3), 'event': 'dropped', 'count': dropped}))
+        try:
+            if self._file is None:
+                self._open()
+            self._file.write("\n".join(lines) + "\n")
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+        except OSError as e:
+            # dropped is shared with record(); write_errors is only touched here.
+            # The lost batch and the drops its marker carried go into the next
+            # marker, so the gap still shows in the log.
+            with self._cond:
+                self.dropped += len(batch)
+                self._dropped_unlogged += dropped + len(batch)
+            self.write_errors += 1
+            logger.error("Audit log write failed, %d records lost: %s", len(batch), e)
+            self._close()
+            return
+        self.written += len(batch)
+        # The batch is on disk: a failed rotation loses nothing, the next
+        # batch reopens the file and the size check retries
+        try:
+            if self._file.tell() >= self.max_bytes:
+                self._rotate()
+        except OSError as e:
+            self.write_errors += 1
+            logger.error("Audit log rotation failed: %s", e)
+            self._close()
+
+    def _close(self):
+        """Close the current file, ignoring errors from a handle that already failed"""
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
+
+    def _open(self):
+        self._file = open(self.path, 'a', encoding='utf-8')
+        if self._file.tell() == 0:
+            self._file.write(_encode({'schema': SCHEMA_VERSION, 'features': FEATURE_COLUMNS}) + "\n")
+
+    def _rotate(self):
+        self._file.close()
+        self._file = None
+        for i in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{i}"):
+                os.replace(f"{self.path}.{i}", f"{self.path}.{i + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+    def close(self):
+        """Flush every buffered record and stop the writer"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._writer.join()
+        self._close()
+
+    def collect(self):
+        """Samples for the metrics endpoint (model/metrics.py)"""
+        yield AUDIT_RECORDS_TOTAL, {'outcome': 'written'}, self.written
+        yield AUDIT_RECORDS_TOTAL, {'outcome': 'dropped'}, self.dropped
+        yield ERRORS_TOTAL, {'stage': 'audit'}, self.write_errors
+        yield AUDIT_BUFFERED, {}, self._size
+
+def open_audit_log(path=AUDIT_PATH, registry=REGISTRY):
+    """Process-wide audit log, flushed at exit; None when disabled"""
+    if not path:
+        return None
+    audit = AuditLog(path)
+    atexit.register(audit.close)
+    registry.add_collector(audit.collect)
+    return audit
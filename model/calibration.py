@@ -0,0 +1,135 @@
+import numpy as np
+
+# ============================================================================
+# CALIBRATORS
+# ============================================================================
+# A calibrator maps the model's raw probability to a calibrated one. It is
+# stored on the model artifact (model.calibrator) and applied at the end of
+# LogisticRegression.predict_proba.
+
+class IsotonicCalibrator:
+    """
+    Monotone piecewise-linear map fitted with pool-adjacent-violators
+
+    Serving is one np.interp call: a binary search over the k thresholds,
+    O(log k) per probability.
+    """
+
+    def __init__(self, thresholds, values):
+        self.thresholds = np.asarray(thresholds, dtype=float)
+        self.values = np.asarray(values, dtype=float)
+
+    def __call__(self, proba):
+        return np.interp(proba, self.thresholds, self.values)
+
+class PlattCalibrator:
+    """Logistic map on the raw logit: sigmoid(a * logit(p) + b)"""
+
+    def __init__(self, a, b):
+        self.a = float(a)
+        self.b = float(b)
+
+    def __call__(self, proba):
+        return 1 / (1 + np.exp(-(self.a * _logit(proba) + self.b)))
+
+def _logit(proba):
+    proba = np.clip(proba, 1e-9, 1 - 1e-9)
+    return np.log(proba / (1 - proba))
+
+# ============================================================================
+# FITTING
+# ============================================================================
+
+def fit_isotonic(proba, y):
+    """Isotonic calibrator fitted on held-out probabilities and labels"""
+    x, inverse, counts = np.unique(proba, return_inverse=True, return_counts=True)
+    sums = np.bincount(inverse, weights=y.astype(float))
+
+    # Pool adjacent violators over the distinct probabilities; each block
+    # keeps its value, total weight and the index range it covers
+    values, weights, starts = [], [], []
+    for i in range(len(x)):
+        value, weight, start = sums[i] / counts[i], counts[i], i
+        while values and values[-1] >= value:
+            previous, previous_weight = values.pop(), weights.pop()
+            start = starts.pop()
+            value = (previous * previous_weight + value * weight) / (previous_weight + weight)
+            weight += previous_weight
+        values.append(value)
+        weights.append(weight)
+        starts.append(start)
+
+    # Each block becomes a flat segment from its first to its last probability
+    ends = starts[1:] + [len(x)]
+    thresholds, block_values = [], []
+    for value, start, end in zip(values, starts, ends):
+        thresholds.extend([x[start], x[end - 1]])
+        block_values.extend([value, value])
+    thresholds, keep = np.unique(thresholds, return_index=True)
+    return IsotonicCalibrator(thresholds, np.asarray(block_values)[keep])
+
+def fit_platt(proba, y, n_iters=50):
+    """Platt calibrator fitted by Newton's method on the log-loss"""
+    z = _logit(proba)
+    y = y.astype(float)
+    a, b = 1.0, 0.0
+    for _ in range(n_iters):
+        p = 1 / (1 + np.exp(-(a * z + b)))
+        w = p * (1 - p) + 1e-12
+        gradient = np.array([np.dot(p - y, z), np.sum(p - y)])
+        hessian = np.array([[np.dot(w, z * z), np.dot(w, z)], [np.dot(w, z), np.sum(w)]])
+        step = np.linalg.solve(hessian, gradient)
+        a, b = a - step[0], b - step[1]
+        if np.max(np.abs(step)) < 1e-10:
+            break
+    return PlattCalibrator(a, b)
+
+CALIBRATORS = {
+    'isotonic': fit_isotonic,
+    'platt': fit_platt
+}
+
+def select_calibrator(proba, y, seed=42):
+    """
+    Pick the calibration method by held-out ECE
+
+    Every method is fitted on one half of the data and scored on the other;
+    the winner is refitted on all of it.
+
+    Returns:
+        (method name, fitted calibrator, {method: held-out ECE})
+    """
+    half = np.random.default_rng(seed).permutation(len(proba)) < len(proba) // 2
+    scores = {
+        name: expected_calibration_error(y[~half], fit(proba[half], y[half])(proba[~half]))
+        for name, fit in CALIBRATORS.items()
+    }
+    best = min(scores, key=scores.get)
+    return best, CALIBRATORS[best](proba, y), scores
+
+# ============================================================================
+# CALIBRATION METRICS
+# ============================================================================
+
+def reliability_curve(y_true, y_proba, n_bins=10):
+    """
+    Per-bin mean predicted probability, observed positive rate and count,
+    over equal-width probability bins (one bincount pass per quantity)
+    """
+    bins = np.minimum((y_proba * n_bins).astype(int), n_bins - 1)
+    count = np.bincount(bins, minlength=n_bins)
+    predicted = np.bincount(bins, weights=y_proba, minlength=n_bins)
+    observed = np.bincount(bins, weights=y_true.astype(float), minlength=n_bins)
+    return {
+        'bin_edges': np.linspace(0, 1, n_bins + 1).tolist(),
+        'mean_predicted': [float(p / c) if c else None for p, c in zip(predicted, count)],
+        'observed_rate': [float(o / c) if c else None for o, c in zip(observed, count)],
+        'count': count.tolist()
+    }
+
+def expected_calibration_error(y_true, y_proba, n_bins=10):
+    """Count-weighted mean |observed rate - mean predicted| over the bins"""
+    bins = np.minimum((y_proba * n_bins).astype(int), n_bins - 1)
+    predicted = np.bincount(bins, weights=y_proba, minlength=n_bins)
+    observed = np.bincount(bins, weights=y_true.astype(float), minlength=n_bins)
+    return float(np.sum(np.abs(observed - predicted)) / len(y_proba))
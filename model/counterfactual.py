@@ -0,0 +1,199 @@
+import numpy as np
+from model.LogisticRegression import sigmoid
+from model.features import COLUMN_INDEX, compute_bmi, scale_features
+from model.rules import RISK_CUTS
+
+# ============================================================================
+# COUNTERFACTUAL RISK-REDUCTION SEARCH
+# ============================================================================
+# Upper bound of the LOW RISK band
+LOW_RISK_THRESHOLD = RISK_CUTS[0]
+
+# Effort cost of each unit of change; a plan's cost is the sum over inputs.
+# Roughly: 10 mmHg systolic ~ 5 kg ~ starting exercise ~ 1 unit of effort.
+EFFORT_COST = {
+    'ap_hi': 1 / 10,      # per mmHg lowered
+    'ap_lo': 1 / 10,      # per mmHg lowered
+    'weight': 1 / 5,      # per kg lost
+    'smoke': 1.5,         # quitting
+    'alco': 1.0,          # stopping
+    'active': 1.0         # starting regular activity
+}
+
+# Limits of what counts as a realistic change
+MAX_SYSTOLIC_DROP = 40
+MIN_SYSTOLIC = 100
+MAX_DIASTOLIC_DROP = 20
+MIN_DIASTOLIC = 60
+MAX_WEIGHT_LOSS_FRACTION = 0.15
+MIN_BMI = 18.5
+
+def candidate_moves(base_row):
+    """
+    Realistic target values for each modifiable input, including "no change"
+
+    Only changes in the healthy direction are offered: lower blood pressure,
+    lower weight, quitting smoking or alcohol, becoming active.
+    """
+    ap_hi = base_row[COLUMN_INDEX['ap_hi']]
+    ap_lo = base_row[COLUMN_INDEX['ap_lo']]
+    weight = base_row[COLUMN_INDEX['weight']]
+    height = base_row[COLUMN_INDEX['height']]
+    min_weight = min(weight, max(weight * (1 - MAX_WEIGHT_LOSS_FRACTION), MIN_BMI * (height / 100) ** 2))
+
+    moves = {
+        'ap_hi': ap_hi - np.arange(0, MAX_SYSTOLIC_DROP + 1, 5),
+        'ap_lo': ap_lo - np.arange(0, MAX_DIASTOLIC_DROP + 1, 5),
+        'weight': weight - np.arange(0, weight - min_weight + 1e-9, 2)
+    }
+    moves['ap_hi'] = moves['ap_hi'][(moves['ap_hi'] >= MIN_SYSTOLIC) | (moves['ap_hi'] == ap_hi)]
+    moves['ap_lo'] = moves['ap_lo'][(moves['ap_lo'] >= MIN_DIASTOLIC) | (moves['ap_lo'] == ap_lo)]
+
+    for name, healthy in (('smoke', 0), ('alco', 0), ('active', 1)):
+        current = base_row[COLUMN_INDEX[name]]
+        moves[name] = np.array([current, healthy]) if current != healthy else np.array([current])
+    return moves
+
+def move_costs(base_row, moves):
+    return {
+        name: np.abs(values - base_row[COLUMN_INDEX[name]]) * EFFORT_COST[name]
+        for name, values in moves.items()
+    }
+
+def apply_moves(base_row, names, values):
+    """Raw feature matrix with the given input columns replaced; BMI follows weight"""
+    X = np.repeat(base_row[np.newaxis, :], len(values), axis=0)
+    for j, name in enumerate(names):
+        X[:, COLUMN_INDEX[name]] = values[:, j]
+    X[:, COLUMN_INDEX['BMI']] = compute_bmi(X[:, COLUMN_INDEX['weight']], X[:, COLUMN_INDEX['height']])
+    return X
+
+def raw_logits(model, scaler, base_row, names, values):
+    """
+    Uncalibrated logits of the given plans
+
+    Plans are pruned and ranked on these: the logit is additive over the
+    inputs, so dominance between options is exact, and a calibrator (even a
+    flat isotonic step) can only merge, never reorder, them.
+    """
+    X = scale_features(apply_moves(base_row, names, values), scaler)
+    return np.dot(X, model.weights) + model.bias
+
+def calibrated(model, logits):
+    """Probabilities as predict_proba reports them, from raw logits"""
+    probs = sigmoid(logits)
+    calibrator = getattr(model, 'calibrator', None)
+    return calibrator(probs) if calibrator is not None else probs
+
+def prune_moves(model, scaler, base_row, moves, costs):
+    """
+    Drop options that cannot be part of a minimal plan
+
+    Every option is scored on its own in one batch. An option is kept only if
+    its raw logit is lower than with no change, and than with every cheaper
+    option for the same input.
+    """
+    names = list(moves)
+    rows, owners = [], []
+    for j, name in enumerate(names):
+        values = np.tile(base_row[[COLUMN_INDEX[n] for n in names]], (len(moves[name]), 1))
+        values[:, j] = moves[name]
+        rows.append(values)
+        owners.append(np.full(len(moves[name]), j))
+    values = np.vstack(rows)
+    owner = np.concatenate(owners)
+    logits = raw_logits(model, scaler, base_row, names, values)
+
+    pruned_moves, pruned_costs = {}, {}
+    for j, name in enumerate(names):
+        p = logits[owner == j]
+        order = np.argsort(costs[name], kind='stable')
+        best_so_far = np.minimum.accumulate(p[order])
+        keep = np.zeros(len(p), dtype=bool)
+        keep[order[0]] = True  # the "no change" option costs 0
+        keep[order[1:]] = p[order[1:]] < best_so_far[:-1]
+        pruned_moves[name] = moves[name][keep]
+        pruned_costs[name] = costs[name][keep]
+    return pruned_moves, pruned_costs, len(values)
+
+def find_counterfactual(model, scaler, base_row, target=LOW_RISK_THRESHOLD, batch_size=1024):
+    """
+    Cheapest realistic change to the modifiable inputs that brings the
+    predicted probability below target
+
+    Candidate plans are the cartesian product of the pruned per-input options,
+    sorted by effort cost and scored in vectorized batches. The scan stops at
+    the first batch that contains a plan under the target; within that batch
+    the cheapest such plan wins. Pruning and ranking use the raw logit; the
+    model's calibrator is applied only for the target check and the
+    reported probability.
+
+    Returns:
+        dict with keys
+            reached:      whether a plan under the target exists
+            probability:  predicted probability after the plan
+            cost:         effort cost of the plan
+            changes:      {input name: (current value, target value)}
+            evaluated:    number of candidate rows scored
+            candidates:   size of the candidate space after pruning
+        If no plan reaches the target, the lowest-risk plan found is returned.
+    """
+    moves = candidate_moves(base_row)
+    costs = move_costs(base_row, moves)
+    moves, costs, evaluated = prune_moves(model, scaler, base_row, moves, costs)
+
+    names = list(moves)
+    grid = np.indices([len(moves[name]) for name in names]).reshape(len(names), -1).T
+    values = np.column_stack([moves[name][grid[:, j]] for j, name in enumerate(names)])
+    cost = np.sum([costs[name][grid[:, j]] for j, name in enumerate(names)], axis=0)
+
+    ap_hi, ap_lo = names.index('ap_hi'), names.index('ap_lo')
+    plausible = values[:, ap_hi] > values[:, ap_lo]
+    order = np.argsort(cost[plausible], kind='stable')
+    values, cost = values[plausible][order], cost[plausible][order]
+
+    best = None
+    for start in range(0, len(values), batch_size):
+        batch = values[start:start + batch_size]
+        logits = raw_logits(model, scaler, base_row, names, batch)
+        proba = calibrated(model, logits)
+        evaluated += len(batch)
+
+        hits = np.flatnonzero(proba < target)
+        if len(hits):
+            i = hits[0]
+            best = (start + i, logits[i], True)
+            break
+        i = np.argmin(logits)
+        if best is None or logits[i] < best[1]:
+            best = (start + i, logits[i], False)
+
+    index, logit, reached = best
+    probability = calibrated(model, np.array([logit]))[0]
+    changes = {
+        name: (float(base_row[COLUMN_INDEX[name]]), float(values[index, j]))
+        for j, name in enumerate(names)
+        if values[index, j] != base_row[COLUMN_INDEX[name]]
+    }
+    return {
+        'reached': bool(reached),
+        'probability': float(probability),
+        'cost': float(cost[index]),
+        'changes': changes,
+        'evaluated': int(evaluated),
+        'candidates': int(len(values))
+    }
+
+def describe_change(name, before, after):
+    """Human-readable wording for one change in a plan"""
+    if name == 'ap_hi':
+        return f"Lower systolic blood pressure from {before:.0f} to {after:.0f} mmHg"
+    if name == 'ap_lo':
+        return f"Lower diastolic blood pressure from {before:.0f} to {after:.0f} mmHg"
+    if name == 'weight':
+        return f"Lose {before - after:.0f} kg ({before:.0f} → {after:.0f} kg)"
+    if name == 'smoke':
+        return "Quit smoking"
+    if name == 'alco':
+        return "Stop drinking alcohol"
+    return "Become physically active"
@@ -0,0 +1,96 @@
+import numpy as np
+from model.features import CATEGORICAL_COLUMNS, COLUMN_INDEX, GENDER_OPTIONS
+
+# ============================================================================
+# DATASET STATISTICS ARTIFACT
+# ============================================================================
+# Aggregates of the preprocessed dataset written by train.py, so the app's
+# Stats section never has to load the training CSVs: a few KB of JSON.
+STATS_PATH = 'model/dataset_stats.json'
+
+# Display bins (lower edge, upper edge, width); values outside are counted
+# in the first / last bin
+HISTOGRAM_BINS = {
+    'age_years': (30, 65, 5),
+    'height': (140, 200, 5),
+    'weight': (40, 140, 10),
+    'ap_hi': (90, 190, 10),
+    'ap_lo': (60, 120, 10),
+    'BMI': (15, 45, 2.5)
+}
+
+# Lower bounds of the age bands for the prevalence table
+AGE_BANDS = [0, 40, 50, 60]
+
+TEST_METRICS = ['accuracy', 'precision', 'recall', 'f1_score', 'specificity', 'roc_auc']
+
+def age_band_labels(bands=AGE_BANDS):
+    labels = [f"<{bands[1]}"]
+    labels += [f"{low}–{high - 1}" for low, high in zip(bands[1:-1], bands[2:])]
+    labels.append(f"{bands[-1]}+")
+    return labels
+
+def histogram(values, y, low, high, width):
+    """Patients and positive cases per display bin"""
+    edges = np.arange(low, high + width / 2, width)
+    bins = np.clip(np.searchsorted(edges, values, side='right') - 1, 0, len(edges) - 2)
+    return {
+        'edges': edges.tolist(),
+        'count': np.bincount(bins, minlength=len(edges) - 1).tolist(),
+        'positive': np.bincount(bins, weights=y, minlength=len(edges) - 1).astype(int).tolist()
+    }
+
+def bin_labels(hist):
+    """Display labels of a histogram's bins; the end bins are open-ended"""
+    edges = hist['edges']
+    labels = [f"{low:g}–{high:g}" for low, high in zip(edges[:-1], edges[1:])]
+    labels[0] = f"<{edges[1]:g}"
+    labels[-1] = f"≥{edges[-2]:g}"
+    return labels
+
+def summary_metrics(report):
+    """Headline metrics from a training report (None without one)"""
+    if not report or 'test_metrics' not in report:
+        return None
+    info = report.get('training_info', {})
+    metrics = {name: report['test_metrics'][name] for name in TEST_METRICS if name in report['test_metrics']}
+    metrics['n_features'] = info.get('n_features')
+    metrics['n_samples'] = sum(
+        info.get(name) or 0 for name in ('training_samples', 'calibration_samples', 'test_samples')
+    )
+    return metrics
+
+def build_stats(X_raw, y, report):
+    """
+    Dataset aggregates: per-feature histograms with positive counts,
+    category counts, prevalence by age band and gender, and the model's
+    test metrics
+    """
+    y = np.asarray(y, dtype=float)
+    stats = {
+        'n_samples': int(len(y)),
+        'n_positive': int(y.sum()),
+        'histograms': {
+            name: histogram(X_raw[:, COLUMN_INDEX[name]], y, *bins) for name, bins in HISTOGRAM_BINS.items()
+        },
+        'categories': {}
+    }
+    for name in CATEGORICAL_COLUMNS:
+        codes = X_raw[:, COLUMN_INDEX[name]].astype(int)
+        stats['categories'][name] = {
+            'count': np.bincount(codes).tolist(),
+            'positive': np.bincount(codes, weights=y).astype(int).tolist()
+        }
+
+    # Patients and positives per (age band, gender) cell, one bincount each
+    bands = np.searchsorted(AGE_BANDS, X_raw[:, COLUMN_INDEX['age_years']], side='right') - 1
+    cells = bands * len(GENDER_OPTIONS) + X_raw[:, COLUMN_INDEX['gender']].astype(int)
+    shape = (len(AGE_BANDS), len(GENDER_OPTIONS))
+    stats['age_gender'] = {
+        'age_bands': age_band_labels(),
+        'genders': GENDER_OPTIONS,
+        'count': np.bincount(cells, minlength=shape[0] * shape[1]).reshape(shape).tolist(),
+        'positive': np.bincount(cells, weights=y, minlength=shape[0] * shape[1]).reshape(shape).astype(int).tolist()
+    }
+    stats['metrics'] = summary_metrics(report)
+    return stats
@@ -0,0 +1,260 @@
+import json
+import logging
+import math
+import threading
+
+import numpy as np
+from model.features import DATASET_CATEGORY_COUNTS, FEATURE_COLUMNS, NUMERIC_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# DRIFT MONITOR CONFIGURATION
+# ============================================================================
+REFERENCE_PATH = "model/drift_reference.json"
+
+# (low, high, bins) in raw units for the numeric features. The ranges are the
+# week2 outlier filters (age: the dataset's 29-65 years, padded); values
+# outside them land in an underflow / overflow bin.
+NUMERIC_BINS = {
+    'age_years': (25, 70, 18),
+    'height': (120, 220, 20),
+    'weight': (30, 200, 34),
+    'ap_hi': (50, 250, 40),
+    'ap_lo': (30, 150, 24),
+    'BMI': (10, 60, 25)
+}
+
+# Population Stability Index thresholds (the usual rule of thumb)
+PSI_WARN = 0.1
+PSI_ALERT = 0.2
+# Observations before drift is evaluated, and how often it is re-evaluated
+MIN_SAMPLES = 500
+CHECK_EVERY = 500
+
+def bin_layout():
+    """
+    Per-feature histogram layout over one flat counts array
+
+    Feature j uses slots offsets[j] .. offsets[j] + max_slot[j]; slot 0 is
+    underflow and slot max_slot is overflow. Categorical features get one
+    bin per encoded value (low 0, width 1).
+    """
+    low, inv_width, n_bins = [], [], []
+    for name in FEATURE_COLUMNS:
+        if name in NUMERIC_BINS:
+            lo, hi, bins = NUMERIC_BINS[name]
+        else:
+            lo, hi, bins = 0, len(DATASET_CATEGORY_COUNTS[name]), len(DATASET_CATEGORY_COUNTS[name])
+        low.append(lo)
+        inv_width.append(bins / (hi - lo))
+        n_bins.append(bins)
+    n_bins = np.array(n_bins)
+    offsets = np.concatenate([[0], np.cumsum(n_bins + 2)[:-1]])
+    return np.array(low, dtype=float), np.array(inv_width), n_bins + 1, offsets
+
+# ============================================================================
+# STREAMING STATISTICS
+# ============================================================================
+
+class DriftMonitor:
+    """
+    Streaming per-feature statistics over every scored input, compared
+    against a training snapshot
+
+    observe() is O(1) and works entirely in preallocated buffers: Welford
+    mean/variance updates and one histogram increment per feature. Monitors
+    are mergeable (Chan et al.), so per-process or per-batch monitors can be
+    combined. PSI and a binned KS statistic are evaluated every
+    CHECK_EVERY observations, and a warning is logged when a feature's PSI
+    first crosses PSI_ALERT.
+    """
+
+    def __init__(self, reference=None, check_every=CHECK_EVERY):
+        self.low, self.inv_width, self.max_slot, self.offsets = bin_layout()
+        self.counts = np.zeros(int(self.offsets[-1] + self.max_slot[-1] + 1), dtype=np.int64)
+        self.n = 0
+        self.mean = np.zeros(len(FEATURE_COLUMNS))
+        self.m2 = np.zeros(len(FEATURE_COLUMNS))
+        self.reference = reference
+        self.check_every = check_every
+        self.alerting = set()
+        self._delta = np.empty(len(FEATURE_COLUMNS))
+        self._delta2 = np.empty(len(FEATURE_COLUMNS))
+        self._slot = np.empty(len(FEATURE_COLUMNS))
+        self._index = np.empty(len(FEATURE_COLUMNS), dtype=np.intp)
+        self._lock = threading.Lock()
+
+    def _slots(self, X, out=None):
+        """Flat histogram slot of every value (X may be one row or a matrix)"""
+        slot = np.subtract(X, self.low, out=out)
+        np.multiply(slot, self.inv_width, out=slot)
+        np.floor(slot, out=slot)
+        np.add(slot, 1, out=slot)
+        np.clip(slot, 0, self.max_slot, out=slot)
+        np.add(slot, self.offsets, out=slot)
+        return slot
+
+    def observe(self, row):
+        """Add one raw (unscaled) feature row"""
+        with self._lock:
+            self.n += 1
+            np.subtract(row, self.mean, out=self._delta)
+            np.divide(self._delta, self.n, out=self._delta2)
+            np.add(self.mean, self._delta2, out=self.mean)
+            np.subtract(row, self.mean, out=self._delta2)
+            np.multiply(self._delta, self._delta2, out=self._delta)
+            np.add(self.m2, self._delta, out=self.m2)
+
+            self._slots(row, out=self._slot)
+            np.copyto(self._index, self._slot, casting='unsafe')
+            np.add.at(self.counts, self._index, 1)
+            due = self.n >= MIN_SAMPLES and self.n % self.check_every == 0
+        if due:
+            self.check()
+
+    def update(self, X):
+        """Add a batch of raw feature rows"""
+        batch = DriftMonitor(check_every=self.check_every)
+        batch.n = len(X)
+        batch.mean = X.mean(axis=0)
+        batch.m2 = ((X - batch.mean) ** 2).sum(axis=0)
+        slots = batch._slots(X).astype(np.intp)
+        batch.counts = np.bincount(slots.ravel(), minlength=len(self.counts))
+        self.merge(batch)
+
+    def merge(self, other):
+        """Fold another monitor's statistics into this one"""
+        with self._lock:
+            n = self.n + other.n
+            if n == 0:
+                return
+            delta = other.mean - self.mean
+            self.m2 = self.m2 + other.m2 + delta ** 2 * self.n * other.n / n
+            self.mean = self.mean + delta * other.n / n
+            self.counts += other.counts
+            self.n = n
+
+    def std(self):
+        return np.sqrt(self.m2 / self.n) if self.n else np.zeros_like(self.m2)
+
+    def to_reference(self):
+        """Compact JSON-serializable snapshot used as the comparison baseline"""
+        return {
+            'features': FEATURE_COLUMNS,
+            'numeric_bins': NUMERIC_BINS,
+            'n': int(self.n),
+            'mean': self.mean.tolist(),
+            'std': self.std().tolist(),
+            'counts': self.counts.tolist()
+        }
+
+    def drift(self):
+        """
+        PSI and binned KS statistic per feature against the reference
+
+        Returns:
+            {feature: {'psi', 'ks', 'mean', 'reference_mean', 'status'}}
+            where status is "ok", "warn" or "alert"
+        """
+        with self._lock:
+            live = self.counts.astype(float)
+            n = self.n
+            mean = self.mean.copy()
+        reference = np.asarray(self.reference['counts'], dtype=float)
+
+        report = {}
+        for j, name in enumerate(FEATURE_COLUMNS):
+            slots = slice(self.offsets[j], self.offsets[j] + self.max_slot[j] + 1)
+            p = np.clip(live[slots] / max(n, 1), 1e-4, None)
+            q = np.clip(reference[slots] / reference[slots].sum(), 1e-4, None)
+            psi = float(np.sum((p - q) * np.log(p / q)))
+            ks = float(np.max(np.abs(
+                np.cumsum(live[slots]) / max(n, 1) - np.cumsum(reference[slots]) / reference[slots].sum()
+            )))
+            status = "alert" if psi >= PSI_ALERT else "warn" if psi >= PSI_WARN else "ok"
+            report[name] = {
+                'psi': psi,
+                'ks': ks,
+                'mean': float(mean[j]),
+                'reference_mean': float(self.reference['mean'][j]),
+                'status': status
+            }
+        return report
+
+    def check(self):
+        """Evaluate drift and log features that newly crossed the alert threshold"""
+        if self.reference is None or self.n < MIN_SAMPLES:
+            return {}
+        report = self.drift()
+        alerting = {name for name, stats in report.items() if stats['status'] == "alert"}
+        for name in sorted(alerting - self.alerting):
+            stats = report[name]
+            logger.warning(
+                "Input drift on %s: PSI %.3f, KS %.3f, mean %.2f vs %.2f in training (n=%d)",
+                name, stats['psi'], stats['ks'], stats['mean'], stats['reference_mean'], self.n
+            )
+        self.alerting = alerting
+        return report
+
+# ============================================================================
+# TRAINING REFERENCE
+# ============================================================================
+
+def build_reference(X_raw):
+    """Training-distribution snapshot from raw (unscaled) training rows"""
+    monitor = DriftMonitor()
+    monitor.update(X_raw)
+    return monitor.to_reference()
+
+def approximate_reference(scaler):
+    """
+    Snapshot for when model/drift_reference.json has not been generated yet
+
+    Numeric features are taken as normal with the scaler's training mean and
+    standard deviation; categorical features use the full dataset's counts.
+    """
+    monitor = DriftMonitor()
+    n = int(scaler.n_samples_seen_)
+    counts = np.zeros(len(monitor.counts))
+    mean = np.zeros(len(FEATURE_COLUMNS))
+    std = np.zeros(len(FEATURE_COLUMNS))
+    for j, name in enumerate(FEATURE_COLUMNS):
+        start = monitor.offsets[j]
+        if name in NUMERIC_BINS:
+            k = NUMERIC_COLUMNS.index(name)
+            mu, sigma = scaler.mean_[k], scaler.scale_[k]
+            lo, hi, bins = NUMERIC_BINS[name]
+            edges = np.linspace(lo, hi, bins + 1)
+            cdf = np.array([0.5 * (1 + math.erf((edge - mu) / (sigma * math.sqrt(2)))) for edge in edges])
+            probs = np.concatenate([[cdf[0]], np.diff(cdf), [1 - cdf[-1]]])
+            mean[j], std[j] = mu, sigma
+        else:
+            shares = np.asarray(DATASET_CATEGORY_COUNTS[name], dtype=float)
+            shares /= shares.sum()
+            probs = np.concatenate([[0], shares, [0]])
+            values = np.arange(len(shares))
+            mean[j] = np.dot(values, shares)
+            std[j] = np.sqrt(np.dot((values - mean[j]) ** 2, shares))
+        counts[start:start + len(probs)] = probs * n
+    return {
+        'features': FEATURE_COLUMNS,
+        'numeric_bins': NUMERIC_BINS,
+        'n': n,
+        'mean': mean.tolist(),
+        'std': std.tolist(),
+        'counts': counts.tolist(),
+        'approximate': True
+    }
+
+def version_reference(version):
+    """Training snapshot saved with a model version (model/registry.py), or an approximation from its scaler"""
+    return version.reference if version.reference is not None else approximate_reference(version.scaler)
+
+def load_reference(scaler=None, path=REFERENCE_PATH):
+    """Training snapshot written by train.py, or an approximation from the scaler"""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return approximate_reference(scaler) if scaler is not None else None
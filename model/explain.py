@@ -0,0 +1,92 @@
+import numpy as np
+from model.features import DATASET_CATEGORY_COUNTS, FEATURE_COLUMNS, GENDER_OPTIONS, LEVEL_OPTIONS, NUMERIC_COLUMNS
+
+# ============================================================================
+# FEATURE CONTRIBUTIONS
+# ============================================================================
+# Explanations are exact for the linear model: the patient's logit is
+#     bias + w · baseline  +  sum_j w_j * (x_j - baseline_j)
+# so each term of the sum is how far feature j moves the patient's log-odds
+# away from an average training patient.
+
+FEATURE_LABELS = {
+    'gender': "Gender",
+    'height': "Height",
+    'weight': "Weight",
+    'ap_hi': "Systolic blood pressure",
+    'ap_lo': "Diastolic blood pressure",
+    'cholesterol': "Cholesterol",
+    'gluc': "Glucose",
+    'smoke': "Smoking",
+    'alco': "Alcohol",
+    'active': "Physical activity",
+    'age_years': "Age",
+    'BMI': "BMI"
+}
+
+# Contributions smaller than this (in log-odds) are not called out as
+# risk-increasing or protective factors
+SIGNIFICANT_CONTRIBUTION = 0.05
+
+# Used when the training report predates "feature_baseline". The numeric
+# columns are standardized on the training set, so their scaled mean is 0;
+# the categorical means come from the full dataset's category counts.
+DATASET_CATEGORY_MEANS = {
+    name: float(np.dot(np.arange(len(counts)), counts) / np.sum(counts))
+    for name, counts in DATASET_CATEGORY_COUNTS.items()
+}
+
+def feature_baseline(report=None):
+    """
+    Mean scaled feature vector of the training population, in training
+    column order
+
+    Taken from the training report when train.py recorded it, otherwise
+    approximated (see DATASET_CATEGORY_MEANS).
+    """
+    if report and 'feature_baseline' in report:
+        return np.array([report['feature_baseline'][name] for name in FEATURE_COLUMNS])
+    baseline = {name: 0.0 for name in NUMERIC_COLUMNS}
+    baseline.update(DATASET_CATEGORY_MEANS)
+    return np.array([baseline[name] for name in FEATURE_COLUMNS])
+
+def contributions(model, X_scaled, baseline):
+    """
+    Per-feature logit contributions for a batch of scaled rows
+
+    One broadcasted operation: (X - baseline) * weights, shape (n, 12).
+    """
+    return (X_scaled - baseline) * model.weights
+
+def baseline_logit(model, baseline):
+    """Log-odds of the average training patient; adding a row's contributions gives its logit"""
+    return float(np.dot(baseline, model.weights) + model.bias)
+
+def ranked_contributions(contribution_row):
+    """(feature name, contribution) pairs for one patient, largest effect first"""
+    order = np.argsort(-np.abs(contribution_row), kind='stable')
+    return [(FEATURE_COLUMNS[j], float(contribution_row[j])) for j in order]
+
+def top_features(C, k=3):
+    """Column indices of the k largest risk-increasing contributions per row"""
+    return np.argsort(-C, axis=1, kind='stable')[:, :k]
+
+def format_feature_value(name, raw_value):
+    """Patient-facing value for a raw (unscaled, encoded) feature"""
+    if name in ('ap_hi', 'ap_lo'):
+        return f"{raw_value:.0f} mmHg"
+    if name == 'weight':
+        return f"{raw_value:.0f} kg"
+    if name == 'height':
+        return f"{raw_value:.0f} cm"
+    if name == 'BMI':
+        return f"{raw_value:.1f}"
+    if name == 'age_years':
+        return f"{raw_value:.0f} years"
+    if name == 'gender':
+        return GENDER_OPTIONS[int(raw_value)]
+    if name in ('cholesterol', 'gluc'):
+        return LEVEL_OPTIONS[int(raw_value)]
+    if name == 'active':
+        return "Active" if raw_value else "Inactive"
+    return "Yes" if raw_value else "No"
@@ -0,0 +1,95 @@
+import numpy as np
+
+# ============================================================================
+# FEATURE LAYOUT
+# ============================================================================
+# Column order of data/X_*_final.csv as written by the week2 preprocessing
+# notebook: the raw cardio_train.csv columns (minus id/age/cardio) followed by
+# the derived age_years and BMI. The model weights are in this order.
+FEATURE_COLUMNS = [
+    'gender', 'height', 'weight', 'ap_hi', 'ap_lo',
+    'cholesterol', 'gluc', 'smoke', 'alco', 'active',
+    'age_years', 'BMI'
+]
+
+# Columns standardized by model/scaler.pkl, in the scaler's own order
+NUMERIC_COLUMNS = ['age_years', 'height', 'weight', 'ap_hi', 'ap_lo', 'BMI']
+
+CATEGORICAL_COLUMNS = ['gender', 'cholesterol', 'gluc', 'smoke', 'alco', 'active']
+
+COLUMN_INDEX = {name: i for i, name in enumerate(FEATURE_COLUMNS)}
+NUMERIC_INDEX = np.array([COLUMN_INDEX[name] for name in NUMERIC_COLUMNS])
+
+# Numeric columns that hold whole numbers in the raw data; values unscaled from
+# the standardized CSVs are rounded back onto them
+INTEGER_COLUMNS = ['age_years', 'height', 'ap_hi', 'ap_lo']
+INTEGER_INDEX = np.array([COLUMN_INDEX[name] for name in INTEGER_COLUMNS])
+
+# Labels used by the app for the encoded categorical values
+GENDER_OPTIONS = ["Female", "Male"]
+LEVEL_OPTIONS = ["Normal", "Above Normal", "Well Above Normal"]
+
+# Rows per encoded category value in the full cardio_train.csv (week1
+# exploration notebook, before outlier filtering). Used where the training
+# set itself is not available.
+DATASET_CATEGORY_COUNTS = {
+    'gender': [45530, 24470],
+    'cholesterol': [52385, 9549, 8066],
+    'gluc': [59479, 5190, 5331],
+    'smoke': [63831, 6169],
+    'alco': [66236, 3764],
+    'active': [13739, 56261]
+}
+
+# ============================================================================
+# ENCODING
+# ============================================================================
+
+def compute_bmi(weight, height):
+    """BMI from weight (kg) and height (cm); works on scalars and arrays"""
+    return weight / ((height / 100) ** 2)
+
+def encode_patient(age_years, gender, height, weight, ap_hi, ap_lo,
+                   cholesterol, gluc, smoke, alco, active):
+    """Raw (unscaled) feature row from already-encoded patient values"""
+    row = np.empty(len(FEATURE_COLUMNS))
+    row[COLUMN_INDEX['gender']] = gender
+    row[COLUMN_INDEX['height']] = height
+    row[COLUMN_INDEX['weight']] = weight
+    row[COLUMN_INDEX['ap_hi']] = ap_hi
+    row[COLUMN_INDEX['ap_lo']] = ap_lo
+    row[COLUMN_INDEX['cholesterol']] = cholesterol
+    row[COLUMN_INDEX['gluc']] = gluc
+    row[COLUMN_INDEX['smoke']] = smoke
+    row[COLUMN_INDEX['alco']] = alco
+    row[COLUMN_INDEX['active']] = active
+    row[COLUMN_INDEX['age_years']] = age_years
+    row[COLUMN_INDEX['BMI']] = compute_bmi(weight, height)
+    return row
+
+def patient_features(data):
+    """Raw feature row from the app's prediction_data dictionary"""
+    return encode_patient(
+        age_years=data['age_years'],
+        gender=GENDER_OPTIONS.index(data['gender']),
+        height=data['height'],
+        weight=data['weight'],
+        ap_hi=data['ap_hi'],
+        ap_lo=data['ap_lo'],
+        cholesterol=LEVEL_OPTIONS.index(data['cholesterol']),
+        gluc=LEVEL_OPTIONS.index(data['gluc']),
+        smoke=data['smoke_encoded'],
+        alco=data['alco_encoded'],
+        active=data['active_encoded']
+    )
+
+def scale_features(X, scaler):
+    """
+    Standardize the numeric columns of a raw feature matrix in place
+
+    Equivalent to scaler.transform() on those columns, without the per-call
+    validation overhead, so it stays cheap for both single rows and large
+    batches.
+    """
+    X[:, NUMERIC_INDEX] = (X[:, NUMERIC_INDEX] - scaler.mean_) / scaler.scale_
+    return X
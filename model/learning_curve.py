@@ -0,0 +1,86 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from model.LogisticRegression import LogisticRegression
+from model.subgroups import roc_auc
+
+# ============================================================================
+# LEARNING CURVE
+# ============================================================================
+CURVE_METRICS = ['accuracy', 'roc_auc', 'log_loss']
+
+def curve_metrics(y, proba):
+    """Accuracy, ROC-AUC and log loss of (uncalibrated) probabilities"""
+    y = np.asarray(y, dtype=float)
+    clipped = np.clip(proba, 1e-15, 1 - 1e-15)
+    return {
+        'accuracy': float(np.mean((proba >= 0.5) == y)),
+        'roc_auc': roc_auc(y, proba),
+        'log_loss': float(-np.mean(y * np.log(clipped) + (1 - y) * np.log(1 - clipped)))
+    }
+
+# Worker processes receive the training and test sets once, through the
+# pool initializer, instead of once per task.
+_data = None
+
+def _init_worker(X_train, y_train, X_test, y_test):
+    global _data
+    _data = X_train, y_train, X_test, y_test
+
+def _fit_point(fraction, seed, lr, n_iters):
+    X_train, y_train, X_test, y_test = _data
+    # Same seed at every fraction: the subsets of one repeat are nested
+    rows = np.random.default_rng(seed).permutation(len(X_train))[:max(int(len(X_train) * fraction), 2)]
+    model = LogisticRegression(lr=lr, n_iters=n_iters)
+    start = time.perf_counter()
+    model.fit(X_train[rows], y_train[rows])
+    fit_seconds = time.perf_counter() - start
+    return {
+        'n_samples': len(rows),
+        'fit_seconds': fit_seconds,
+        'train': curve_metrics(y_train[rows], model.predict_proba(X_train[rows])),
+        'test': curve_metrics(y_test, model.predict_proba(X_test))
+    }
+
+def _mean_std(values):
+    return {'mean': float(np.mean(values)), 'std': float(np.std(values))}
+
+def learning_curve(X_train, y_train, X_test, y_test, fractions, n_seeds=5, lr=0.005, n_iters=3000,
+                   n_jobs=None, seed=42):
+    """
+    Fit LogisticRegression on increasing fractions of the training set,
+    n_seeds random subsets each, across a process pool
+
+    Fits are submitted largest first so the long ones do not end up last on
+    a single worker. Each point reports the mean and standard deviation over
+    the seeds of the train / test metrics and of the fit time.
+    """
+    seeds = [s.generate_state(1)[0] for s in np.random.SeedSequence(seed).spawn(n_seeds)]
+    tasks = sorted(((fraction, s) for fraction in fractions for s in seeds), key=lambda task: -task[0])
+    n_jobs = n_jobs or min(len(tasks), os.cpu_count() or 1)
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker,
+                             initargs=(X_train, y_train, X_test, y_test)) as pool:
+        runs = list(pool.map(_fit_point, *zip(*tasks), [lr] * len(tasks), [n_iters] * len(tasks)))
+    wall_seconds = time.perf_counter() - start
+
+    points = []
+    for fraction in sorted(fractions):
+        results = [run for (f, _), run in zip(tasks, runs) if f == fraction]
+        points.append({
+            'fraction': float(fraction),
+            'n_samples': results[0]['n_samples'],
+            'fit_seconds': _mean_std([run['fit_seconds'] for run in results]),
+            'train': {name: _mean_std([run['train'][name] for run in results]) for name in CURVE_METRICS},
+            'test': {name: _mean_std([run['test'][name] for run in results]) for name in CURVE_METRICS}
+        })
+    return {
+        'seeds': n_seeds,
+        'learning_rate': lr,
+        'iterations': n_iters,
+        'workers': n_jobs,
+        'wall_seconds': wall_seconds,
+        'points': points
+    }
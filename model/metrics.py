@@ -0,0 +1,200 @@
+import logging
+import os
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# METRICS CONFIGURATION
+# ============================================================================
+# Local endpoint serving the metrics in Prometheus text format; an empty
+# port disables it
+METRICS_ADDR = os.environ.get("CARDIO_METRICS_ADDR", "127.0.0.1")
+METRICS_PORT = os.environ.get("CARDIO_METRICS_PORT", "9108")
+
+# Latency bucket upper bounds (seconds), from 50 µs to 2.5 s
+LATENCY_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5
+)
+
+# Stages of one prediction: encoding + validation, feature scaling,
+# predict_proba, and building the results page
+STAGES = ['preprocess', 'scale', 'model', 'render']
+
+STAGE_SECONDS = 'cardio_prediction_stage_seconds'
+PREDICTIONS_TOTAL = 'cardio_predictions_total'
+ERRORS_TOTAL = 'cardio_prediction_errors_total'
+REJECTED_TOTAL = 'cardio_rejected_inputs_total'
+MODEL_INFO = 'cardio_model_info'
+AUDIT_RECORDS_TOTAL = 'cardio_audit_records_total'
+AUDIT_BUFFERED = 'cardio_audit_buffered_records'
+
+METRIC_HELP = {
+    STAGE_SECONDS: ('histogram', "Time spent in each stage of the prediction path"),
+    PREDICTIONS_TOTAL: ('counter', "Rows scored, by serving model"),
+    ERRORS_TOTAL: ('counter', "Predictions that raised, by stage, and failed audit log writes"),
+    REJECTED_TOTAL: ('counter', "Inputs refused by validation before scoring, by reason code"),
+    MODEL_INFO: ('gauge', "Model version currently loaded (value is always 1)"),
+    AUDIT_RECORDS_TOTAL: ('counter', "Audit records written to disk or dropped under backpressure"),
+    AUDIT_BUFFERED: ('gauge', "Audit records waiting for the background writer")
+}
+
+# ============================================================================
+# METRIC TYPES
+# ============================================================================
+
+class Histogram:
+    """
+    Fixed-bucket histogram
+
+    observe() is one C-level binary search plus two in-place additions; the
+    cumulative `le` counts Prometheus expects are only built at scrape time.
+    Updates take no lock: two threads can only lose an increment if the
+    interpreter switches between the load and store of the same slot, which
+    is an acceptable error for monitoring and keeps observe() well under a
+    microsecond.
+    """
+    __slots__ = ('buckets', 'counts', 'sum')
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    def snapshot(self):
+        return list(self.counts), self.sum
+
+class Counter:
+    """Monotonic counter (unlocked, like Histogram)"""
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+class MetricsRegistry:
+    """
+    Named, labelled metrics plus collectors evaluated at scrape time
+
+    histogram() and counter() return the same object for the same name and
+    labels; hot paths look them up once and keep the reference. Collectors
+    are callables returning (name, labels, value) samples, for values that
+    are cheaper to read when scraped than to maintain per prediction.
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def _get(self, factory, name, labels):
+        key = (name, tuple(sorted(labels.items())))
+        metric = self._metrics.get(key)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.setdefault(key, factory())
+        return metric
+
+    def histogram(self, name, **labels):
+        return self._get(Histogram, name, labels)
+
+    def counter(self, name, **labels):
+        return self._get(Counter, name, labels)
+
+    def add_collector(self, collect):
+        self._collectors.append(collect)
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format"""
+        samples = {}
+        for (name, labels), metric in sorted(self._metrics.items(), key=lambda item: item[0]):
+            lines = samples.setdefault(name, [])
+            if isinstance(metric, Histogram):
+                counts, total = metric.snapshot()
+                cumulative = 0
+                for bound, count in zip(metric.buckets + (float('inf'),), counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float('inf') else repr(bound)
+                    lines.append(f"{name}_bucket{_labels(labels + (('le', le),))} {cumulative}")
+                lines.append(f"{name}_sum{_labels(labels)} {total!r}")
+                lines.append(f"{name}_count{_labels(labels)} {cumulative}")
+            else:
+                lines.append(f"{name}{_labels(labels)} {metric.value}")
+        for collect in self._collectors:
+            for name, labels, value in collect():
+                samples.setdefault(name, []).append(f"{name}{_labels(tuple(sorted(labels.items())))} {value}")
+
+        output = []
+        for name, lines in samples.items():
+            kind, help_text = METRIC_HELP.get(name, ('untyped', name))
+            output.append(f"# HELP {name} {help_text}")
+            output.append(f"# TYPE {name} {kind}")
+            output.extend(lines)
+        return "\n".join(output) + "\n"
+
+def _labels(labels):
+    if not labels:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in labels)
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(labels, escaped)) + "}"
+
+# Process-wide registry shared by the router and the app
+REGISTRY = MetricsRegistry()
+
+class PredictionMetrics:
+    """
+    Pre-resolved metrics of one serving model, so the prediction path does
+    attribute lookups instead of label lookups
+    """
+
+    def __init__(self, model, registry=REGISTRY):
+        self.stages = {stage: registry.histogram(STAGE_SECONDS, stage=stage, model=model) for stage in STAGES}
+        self.errors = {stage: registry.counter(ERRORS_TOTAL, stage=stage, model=model) for stage in STAGES}
+        self.predictions = registry.counter(PREDICTIONS_TOTAL, model=model)
+
+# ============================================================================
+# HTTP ENDPOINT
+# ============================================================================
+
+def start_server(registry=REGISTRY, addr=METRICS_ADDR, port=METRICS_PORT):
+    """
+    Serve registry.render() at http://addr:port/metrics on a daemon thread
+
+    Returns the server, or None when disabled or the port is taken (e.g. by
+    another worker process on the same host).
+    """
+    if port is None or port == "":
+        return None
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    try:
+        server = ThreadingHTTPServer((addr, int(port)), MetricsHandler)
+    except OSError as e:
+        logger.warning("Metrics endpoint not started on %s:%s: %s", addr, port, e)
+        return None
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-endpoint", daemon=True).start()
+    return server
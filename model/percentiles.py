@@ -0,0 +1,70 @@
+from bisect import bisect_left
+
+import numpy as np
+from model.features import COLUMN_INDEX
+
+# ============================================================================
+# POPULATION QUANTILE INDEX
+# ============================================================================
+# Quantiles of the training population's predicted risk and of a few raw
+# features, written by train.py next to the model. 1001 points (every 0.1%)
+# keep the artifact small while any percentile query is one binary search.
+QUANTILE_POINTS = 1001
+INDEXED_FEATURES = ['ap_hi', 'ap_lo', 'BMI']
+
+class PopulationIndex:
+    """Sorted quantiles per quantity; answers "what share of the population is below x" """
+
+    def __init__(self, quantiles, n_samples):
+        self.quantiles = {name: np.asarray(values, dtype=float) for name, values in quantiles.items()}
+        self.n_samples = n_samples
+        # Plain lists for single-value queries, where bisect beats numpy's call overhead
+        self._lists = {name: values.tolist() for name, values in self.quantiles.items()}
+
+    def percentile(self, name, value):
+        """
+        Percentage of the population strictly below value (scalar or array)
+
+        Binary search for the quantile bracket, then linear interpolation
+        inside it; ties resolve to the start of a run of equal quantiles.
+        """
+        if isinstance(value, (int, float)):
+            return self._scalar_percentile(self._lists[name], value)
+        q = self.quantiles[name]
+        value = np.asarray(value, dtype=float)
+        i = np.searchsorted(q, value, side='left')
+        lower = q[np.clip(i - 1, 0, len(q) - 1)]
+        upper = q[np.minimum(i, len(q) - 1)]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            fraction = np.where(upper > lower, (value - lower) / (upper - lower), 1.0)
+        rank = np.where(i == 0, 0.0, np.where(i == len(q), len(q) - 1, i - 1 + fraction))
+        return rank / (len(q) - 1) * 100
+
+    @staticmethod
+    def _scalar_percentile(q, value):
+        i = bisect_left(q, value)
+        if i == 0:
+            return 0.0
+        if i == len(q):
+            return 100.0
+        lower, upper = q[i - 1], q[i]
+        fraction = (value - lower) / (upper - lower) if upper > lower else 1.0
+        return (i - 1 + fraction) / (len(q) - 1) * 100
+
+    def to_dict(self):
+        return {
+            'n_samples': self.n_samples,
+            'quantiles': {name: [round(float(v), 6) for v in values] for name, values in self.quantiles.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['quantiles'], data['n_samples'])
+
+def build_index(proba, X_raw, n_points=QUANTILE_POINTS):
+    """Index over predicted probabilities and raw (unscaled) feature rows"""
+    levels = np.linspace(0, 1, n_points)
+    quantiles = {'risk': np.quantile(proba, levels)}
+    for name in INDEXED_FEATURES:
+        quantiles[name] = np.quantile(X_raw[:, COLUMN_INDEX[name]], levels)
+    return PopulationIndex(quantiles, int(len(proba)))
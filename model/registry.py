@@ -0,0 +1,152 @@
+import hashlib
+import json
+import os
+import pickle
+import threading
+import time
+from collections import namedtuple
+
+from model.percentiles import PopulationIndex
+
+# ============================================================================
+# MODEL REGISTRY
+# ============================================================================
+ARTIFACTS = {
+    'model': 'model/logistic_model.pkl',
+    'scaler': 'model/scaler.pkl',
+    'report': 'model/training_report.json',
+    'ensemble': 'model/ensemble.pkl',
+    'population': 'model/population_index.json',
+    'reference': 'model/drift_reference.json'
+}
+# Artifacts a version can be served without
+OPTIONAL_ARTIFACTS = {'report', 'ensemble', 'population', 'reference'}
+
+# Seconds between artifact checks (shared by all sessions of one server)
+CHECK_INTERVAL = float(os.environ.get("CARDIO_MODEL_CHECK_INTERVAL", "5"))
+
+ModelVersion = namedtuple('ModelVersion', ['model', 'scaler', 'report', 'ensemble', 'population', 'reference',
+                                           'version', 'loaded_at'])
+
+def stat_signature(paths):
+    """(mtime_ns, size) of every artifact, None for missing files"""
+    signature = []
+    for path in paths.values():
+        try:
+            info = os.stat(path)
+            signature.append((info.st_mtime_ns, info.st_size))
+        except OSError:
+            signature.append(None)
+    return tuple(signature)
+
+def read_artifacts(paths):
+    """Raw bytes of every artifact; None for missing optional ones"""
+    blobs = {}
+    for name, path in paths.items():
+        try:
+            with open(path, 'rb') as f:
+                blobs[name] = f.read()
+        except OSError:
+            if name not in OPTIONAL_ARTIFACTS:
+                raise
+            blobs[name] = None
+    return blobs
+
+def artifacts_checksum(blobs):
+    """Short sha256 over all artifacts, used as the version id"""
+    digest = hashlib.sha256()
+    for name in sorted(blobs):
+        digest.update(name.encode())
+        digest.update(hashlib.sha256(blobs[name] or b'').digest())
+    return digest.hexdigest()[:12]
+
+def load_version(blobs, version):
+    """Deserialize one consistent set of artifacts"""
+    try:
+        report = json.loads(blobs['report']) if blobs['report'] is not None else None
+    except ValueError:
+        report = None
+    try:
+        reference = json.loads(blobs['reference']) if blobs.get('reference') is not None else None
+    except ValueError:
+        reference = None
+    return ModelVersion(
+        model=pickle.loads(blobs['model']),
+        scaler=pickle.loads(blobs['scaler']),
+        report=report,
+        ensemble=pickle.loads(blobs['ensemble']) if blobs.get('ensemble') is not None else None,
+        population=PopulationIndex.from_dict(json.loads(blobs['population']))
+        if blobs.get('population') is not None else None,
+        reference=reference,
+        version=version,
+        loaded_at=time.time()
+    )
+
+class ModelRegistry:
+    """
+    Serves the current model version and hot-reloads it when the artifacts
+    on disk change
+
+    get() never blocks once a version is loaded. At most one caller per
+    check interval stats the artifacts; when they changed, a single
+    background thread reads them, compares checksums and unpickles the new
+    version, then swaps it in with one reference assignment. Callers keep
+    whatever version they got for the rest of their run, so a model is
+    never paired with another version's scaler.
+    """
+
+    def __init__(self, paths=ARTIFACTS, check_interval=CHECK_INTERVAL):
+        self.paths = dict(paths)
+        self.check_interval = check_interval
+        self.current = None
+        self.error = None
+        self.reloads = 0
+        self._signature = None
+        self._next_check = 0.0
+        self._loader = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        """Version to use for the next prediction, or None if none could be loaded"""
+        if self.current is None:
+            # Nothing to serve yet: load synchronously, one caller at a time
+            with self._lock:
+                if self.current is None and time.monotonic() >= self._next_check:
+                    self._next_check = time.monotonic() + self.check_interval
+                    self._refresh()
+            return self.current
+
+        if time.monotonic() >= self._next_check and self._lock.acquire(blocking=False):
+            try:
+                if time.monotonic() >= self._next_check:
+                    self._next_check = time.monotonic() + self.check_interval
+                    if self._loader is None and stat_signature(self.paths) != self._signature:
+                        self._loader = threading.Thread(
+                            target=self._background_refresh, name="model-registry-reload", daemon=True
+                        )
+                        self._loader.start()
+            finally:
+                self._lock.release()
+        return self.current
+
+    def _background_refresh(self):
+        try:
+            self._refresh()
+        finally:
+            self._loader = None
+
+    def _refresh(self):
+        # Taken before reading, so a write racing with the read is seen again
+        # at the next check and re-verified by checksum.
+        signature = stat_signature(self.paths)
+        try:
+            blobs = read_artifacts(self.paths)
+            version = artifacts_checksum(blobs)
+            if self.current is None or version != self.current.version:
+                self.current = load_version(blobs, version)
+                self.reloads += 1
+            self.error = None
+        except Exception as e:
+            # Keep serving the previous version; retried when the files change
+            self.error = str(e)
+        self._signature = signature
@@ -0,0 +1,119 @@
+import numpy as np
+from model.features import COLUMN_INDEX
+
+# ============================================================================
+# RULE TABLES
+# ============================================================================
+# The app's patient categories and recommendations as data. Every rule is
+# evaluated over whole arrays (np.digitize for cut points, np.select for
+# ordered conditions), so one patient and a million patients go through the
+# same code.
+
+# BMI: lower bounds of Normal, Overweight and Obese
+BMI_CUTS = [18.5, 25, 30]
+BMI_CATEGORIES = [
+    # (label, emoji, advice)
+    ("Underweight", "🔵", "Consider gaining weight"),
+    ("Normal", "🟢", "Maintain current weight"),
+    ("Overweight", "🟡", "Weight management advised"),
+    ("Obese", "🔴", "Weight loss recommended")
+]
+
+# Blood pressure: the first matching condition wins; no match is Stage 2
+BP_CATEGORIES = [
+    # (label, emoji, condition on systolic s and diastolic d)
+    ("Normal", "🟢", lambda s, d: (s < 120) & (d < 80)),
+    ("Elevated", "🟡", lambda s, d: (s >= 120) & (s < 130) & (d < 80)),
+    ("Stage 1 High BP", "🟠", lambda s, d: ((s >= 130) & (s < 140)) | ((d >= 80) & (d < 90))),
+    ("Stage 2 High BP", "🔴", None)
+]
+HIGH_BP = np.array(["High" in label for label, _, _ in BP_CATEGORIES])
+
+# Risk bands: upper bounds of LOW and MODERATE
+RISK_CUTS = [0.3, 0.7]
+RISK_LEVELS = [
+    # (label, css class, emoji)
+    ("LOW RISK", "low", "🟢"),
+    ("MODERATE RISK", "moderate", "🟡"),
+    ("HIGH RISK", "high", "🔴")
+]
+
+# General advice per risk band: (emoji, heading, actions)
+RISK_ADVICE = [
+    ("✅", "Maintain Healthy Habits", ["Continue current lifestyle", "Annual health check-ups", "Stay physically active"]),
+    ("⚠️", "Preventive Action Needed", ["Regular health monitoring", "Implement lifestyle modifications",
+                                        "Consult healthcare provider"]),
+    ("🏥", "Immediate Action Required", ["Schedule cardiologist appointment", "Get comprehensive cardiac evaluation",
+                                         "Consider cardiac screening tests"])
+]
+
+# Targeted recommendations, in display order: (condition, emoji, text).
+# Conditions see the categorized batch from categorize().
+RECOMMENDATIONS = [
+    (lambda c: c['smoke'] == 1, "🚭", "Quit smoking immediately"),
+    (lambda c: c['BMI'] >= 25, "🏃", "Start weight management program"),
+    (lambda c: HIGH_BP[c['bp_category']], "🧂", "Reduce sodium intake"),
+    (lambda c: HIGH_BP[c['bp_category']], "💊", "Monitor blood pressure daily")
+]
+
+# ============================================================================
+# EVALUATION
+# ============================================================================
+
+def bmi_category(bmi):
+    """Index into BMI_CATEGORIES for each BMI"""
+    return np.digitize(bmi, BMI_CUTS)
+
+def bp_category(systolic, diastolic):
+    """Index into BP_CATEGORIES for each systolic/diastolic pair"""
+    systolic, diastolic = np.asarray(systolic), np.asarray(diastolic)
+    conditions = [rule(systolic, diastolic) for _, _, rule in BP_CATEGORIES[:-1]]
+    return np.select(conditions, np.arange(len(conditions)), default=len(BP_CATEGORIES) - 1)
+
+def risk_level(proba):
+    """Index into RISK_LEVELS (and RISK_ADVICE) for each probability"""
+    return np.digitize(proba, RISK_CUTS)
+
+def categorize(X, proba):
+    """
+    Category indices for a batch of raw (unscaled) feature rows
+
+    Returns:
+        dict with the 'BMI' and 'smoke' columns, 'bmi_category',
+        'bp_category', 'risk_level' and a boolean (n_samples,
+        len(RECOMMENDATIONS)) 'recommendations' matrix
+    """
+    categories = {
+        'BMI': X[:, COLUMN_INDEX['BMI']],
+        'smoke': X[:, COLUMN_INDEX['smoke']],
+        'bmi_category': bmi_category(X[:, COLUMN_INDEX['BMI']]),
+        'bp_category': bp_category(X[:, COLUMN_INDEX['ap_hi']], X[:, COLUMN_INDEX['ap_lo']]),
+        'risk_level': risk_level(proba)
+    }
+    categories['recommendations'] = np.column_stack([rule(categories) for rule, _, _ in RECOMMENDATIONS])
+    return categories
+
+def recommendation_list(risk, recommended):
+    """Actions for one patient: the risk band's advice, then the targeted ones"""
+    actions = list(RISK_ADVICE[risk][2])
+    actions.extend(text for (_, _, text), on in zip(RECOMMENDATIONS, recommended) if on)
+    return actions
+
+# Every distinct recommendation text a patient can get, keyed by risk band
+# and targeted-recommendation bitmask, so labelling a batch is one gather
+_RECOMMENDATION_BITS = 1 << np.arange(len(RECOMMENDATIONS))
+_RECOMMENDATION_TEXTS = np.array([
+    "; ".join(recommendation_list(risk, [mask >> i & 1 for i in range(len(RECOMMENDATIONS))]))
+    for risk in range(len(RISK_ADVICE)) for mask in range(1 << len(RECOMMENDATIONS))
+], dtype=object)
+
+def cohort_labels(X, proba):
+    """Category labels and joined recommendations for a batch, as string arrays"""
+    categories = categorize(X, proba)
+    masks = categories['recommendations'] @ _RECOMMENDATION_BITS
+    return {
+        'bmi_category': np.array([label for label, _, _ in BMI_CATEGORIES], dtype=object)[categories['bmi_category']],
+        'bp_category': np.array([label for label, _, _ in BP_CATEGORIES], dtype=object)[categories['bp_category']],
+        'risk_level': np.array([label for label, _, _ in RISK_LEVELS], dtype=object)[categories['risk_level']],
+        'recommendations': _RECOMMENDATION_TEXTS[categories['risk_level'] * (1 << len(RECOMMENDATIONS)) + masks]
+    }
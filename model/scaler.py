@@ -0,0 +1,141 @@
+import numpy as np
+
+from model.features import NUMERIC_COLUMNS, NUMERIC_INDEX
+
+# ============================================================================
+# PARTIAL MOMENTS
+# ============================================================================
+
+def chunk_moments(X):
+    """
+    (rows, column sums, centred sums of squares) of one chunk
+
+    The sums of squares use the corrected two-pass formula, as sklearn's
+    StandardScaler does, so a single chunk gives bit-identical statistics.
+    Rows are summed in C order whatever the input layout, so the result does
+    not depend on which process computed it.
+    """
+    X = np.ascontiguousarray(X, dtype=float)
+    n = len(X)
+    total = X.sum(axis=0)
+    deviations = X - total / n
+    correction = deviations.sum(axis=0)
+    deviations **= 2
+    return n, total, deviations.sum(axis=0) - correction ** 2 / n
+
+# ============================================================================
+# SCALER
+# ============================================================================
+
+class FeatureScaler:
+    """
+    Standardizes the numeric features; a drop-in for the fitted sklearn
+    StandardScaler the week2 notebook pickled
+
+    Fitting keeps mergeable partial moments (row count, mean, variance):
+    chunks can be added one at a time with partial_fit, or fitted on
+    separate processes and combined with merge (Chan et al.'s pairwise
+    update, in the same arithmetic as sklearn's partial_fit, so merging the
+    same chunks in the same order gives the same bits). Exposes sklearn's
+    fitted attributes (mean_, var_, scale_, n_samples_seen_), so code
+    written against the old artifact keeps working, but unpickling it does
+    not import sklearn.
+    """
+
+    def __init__(self, feature_names=NUMERIC_COLUMNS):
+        self.feature_names_in_ = list(feature_names)
+        self.n_features_in_ = len(self.feature_names_in_)
+        self.n_samples_seen_ = 0
+        self.mean_ = self.var_ = self.scale_ = None
+
+    @classmethod
+    def from_fitted(cls, scaler):
+        """Copy of any fitted scaler exposing sklearn's attributes"""
+        names = getattr(scaler, 'feature_names_in_', None)
+        fitted = cls(NUMERIC_COLUMNS if names is None else [str(name) for name in names])
+        fitted.n_samples_seen_ = int(scaler.n_samples_seen_)
+        fitted.mean_ = np.array(scaler.mean_, dtype=float)
+        fitted.var_ = np.array(scaler.var_, dtype=float)
+        fitted.scale_ = np.array(scaler.scale_, dtype=float)
+        return fitted
+
+    def _set_moments(self, count, mean, var):
+        self.n_samples_seen_, self.mean_, self.var_ = count, mean, var
+        # Near-constant features (variance within rounding error) keep scale 1
+        eps = np.finfo(float).eps
+        constant = var <= count * eps * var + (count * mean * eps) ** 2
+        self.scale_ = np.where(constant, 1.0, np.sqrt(var))
+        return self
+
+    def _add(self, n, total, m2):
+        """Fold one chunk's moments into the running statistics"""
+        if n == 0:
+            return self
+        seen = self.n_samples_seen_
+        if seen == 0:
+            return self._set_moments(n, total / n, m2 / n)
+        last_sum = self.mean_ * seen
+        ratio = seen / n
+        count = seen + n
+        return self._set_moments(
+            count, (last_sum + total) / count,
+            (self.var_ * seen + m2 + ratio / count * (last_sum / ratio - total) ** 2) / count
+        )
+
+    def partial_fit(self, X):
+        """Add a chunk of rows (NUMERIC_COLUMNS order)"""
+        return self._add(*chunk_moments(X))
+
+    def fit(self, X):
+        self.n_samples_seen_ = 0
+        return self.partial_fit(X)
+
+    def merge(self, other):
+        """Combine with a scaler fitted on other rows"""
+        n_a, n_b = self.n_samples_seen_, other.n_samples_seen_
+        if n_b == 0:
+            return self
+        if n_a == 0:
+            return self._set_moments(n_b, other.mean_.copy(), other.var_.copy())
+        # Chan et al.'s update on the means, without rebuilding rounded sums
+        count = n_a + n_b
+        delta = other.mean_ - self.mean_
+        return self._set_moments(
+            count, self.mean_ + delta * (n_b / count),
+            (self.var_ * n_a + other.var_ * n_b + delta ** 2 * (n_a * n_b / count)) / count
+        )
+
+    def transform(self, X, copy=True):
+        """Standardized rows; copy=False scales a float array in place"""
+        X = np.array(X, dtype=float, copy=copy)
+        X -= self.mean_
+        X /= self.scale_
+        return X
+
+    def inverse_transform(self, X, copy=True):
+        X = np.array(X, dtype=float, copy=copy)
+        X *= self.scale_
+        X += self.mean_
+        return X
+
+    def fit_transform(self, X):
+        return self.fit(X).transform(X)
+
+# ============================================================================
+# FUSED SCORING
+# ============================================================================
+
+def fold(scaler, weights, bias, index=NUMERIC_INDEX):
+    """
+    Linear-model weights and bias on the raw (unscaled) features
+
+    w * (x - mean) / scale == (w / scale) * x - w * mean / scale, so the
+    standardization disappears into the coefficients and raw rows can be
+    scored without scaling them first. Works with any fitted scaler.
+    """
+    weights = np.array(weights, dtype=float)
+    bias = float(bias)
+    for i, mean, scale in zip(index, scaler.mean_, scaler.scale_):
+        weights[i] /= float(scale)
+        bias -= float(weights[i]) * float(mean)
+    return weights, bias
@@ -0,0 +1,244 @@
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from model.features import scale_features
+from model.metrics import MODEL_INFO, REGISTRY, PredictionMetrics
+from model.registry import ARTIFACTS, ModelRegistry
+from model.rules import RISK_CUTS
+
+# ============================================================================
+# SERVING CONFIGURATION
+# ============================================================================
+PRIMARY_MODEL = 'production'
+CANDIDATE_MODEL = 'candidate'
+
+# Directory with a candidate logistic_model.pkl (and optionally its own
+# scaler.pkl / training_report.json / ensemble.pkl / population_index.json /
+# drift_reference.json) to evaluate on live traffic
+CANDIDATE_DIR = os.environ.get("CARDIO_CANDIDATE_DIR")
+# Share of sessions whose predictions are served by the candidate (A/B);
+# with 0 the candidate only runs in shadow
+CANDIDATE_TRAFFIC = float(os.environ.get("CARDIO_CANDIDATE_TRAFFIC", "0"))
+
+LATENCY_WINDOW = 2048
+MAX_PENDING_SHADOW = 64
+
+def candidate_artifacts(directory):
+    """Artifact paths for a candidate; a missing scaler falls back to production's"""
+    paths = {}
+    for name, path in ARTIFACTS.items():
+        candidate_path = os.path.join(directory, os.path.basename(path))
+        use_production = name == 'scaler' and not os.path.exists(candidate_path)
+        paths[name] = path if use_production else candidate_path
+    return paths
+
+# ============================================================================
+# PER-MODEL STATISTICS
+# ============================================================================
+
+class ModelStats:
+    """Counters for one model plus a fixed window of recent scoring latencies"""
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self.served = 0           # rows scored as the primary model
+        self.shadowed = 0         # rows scored in shadow
+        self.dropped = 0          # shadow batches skipped because the queue was full
+        self.errors = 0
+        self.agreements = 0       # shadow rows with the primary's predicted class
+        self.band_agreements = 0  # shadow rows with the primary's risk band
+        self.abs_diff_sum = 0.0
+        self._latencies = np.zeros(window)
+        self._n_latencies = 0
+        self._lock = threading.Lock()
+
+    def _record_latency(self, seconds):
+        self._latencies[self._n_latencies % len(self._latencies)] = seconds
+        self._n_latencies += 1
+
+    def record_served(self, rows, seconds):
+        with self._lock:
+            self.served += rows
+            self._record_latency(seconds)
+
+    def record_shadow(self, rows, seconds, agreements, band_agreements, abs_diff_sum):
+        with self._lock:
+            self.shadowed += rows
+            self.agreements += agreements
+            self.band_agreements += band_agreements
+            self.abs_diff_sum += abs_diff_sum
+            self._record_latency(seconds)
+
+    def record_dropped(self):
+        with self._lock:
+            self.dropped += 1
+
+    def record_error(self):
+        with self._lock:
+            self.errors += 1
+
+    def summary(self):
+        with self._lock:
+            latencies = self._latencies[:min(self._n_latencies, len(self._latencies))] * 1000
+            shadowed = self.shadowed
+            return {
+                'served': self.served,
+                'shadowed': shadowed,
+                'dropped': self.dropped,
+                'errors': self.errors,
+                'agreement': self.agreements / shadowed if shadowed else None,
+                'band_agreement': self.band_agreements / shadowed if shadowed else None,
+                'mean_abs_diff': self.abs_diff_sum / shadowed if shadowed else None,
+                'latency_p50_ms': float(np.percentile(latencies, 50)) if len(latencies) else None,
+                'latency_p99_ms': float(np.percentile(latencies, 99)) if len(latencies) else None
+            }
+
+# ============================================================================
+# ROUTER
+# ============================================================================
+
+class ModelRouter:
+    """
+    Holds several model registries, routes each request to one of them and
+    scores the others in shadow
+
+    Routing is sticky: the same key (e.g. a session id) always lands on the
+    same model. Shadow scoring runs on a background worker after the primary
+    result is returned; when more than max_pending_shadow batches are
+    waiting, new shadow work is dropped rather than queued, so the primary
+    path never waits on it.
+    """
+
+    def __init__(self, registries, primary=PRIMARY_MODEL, traffic=None, max_pending_shadow=MAX_PENDING_SHADOW,
+                 metrics=REGISTRY):
+        self.registries = dict(registries)
+        self.primary = primary
+        self.traffic = {name: share for name, share in (traffic or {}).items() if share > 0}
+        self.stats = {name: ModelStats() for name in self.registries}
+        # Prometheus metrics (model/metrics.py); versions are read at scrape time
+        self.metrics = {name: PredictionMetrics(name, metrics) for name in self.registries}
+        metrics.add_collector(self._collect_versions)
+        self.max_pending_shadow = max_pending_shadow
+        self._pending = 0
+        self._pending_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="shadow-scoring") \
+            if len(self.registries) > 1 else None
+
+    def route(self, key):
+        """Name of the model that serves requests for this key"""
+        if not self.traffic or key is None:
+            return self.primary
+        digest = hashlib.sha256(str(key).encode()).digest()
+        bucket = int.from_bytes(digest[:8], 'big') / 2 ** 64
+        cumulative = 0.0
+        for name, share in self.traffic.items():
+            cumulative += share
+            if bucket < cumulative:
+                return name
+        return self.primary
+
+    def select(self, key=None):
+        """(model name, ModelVersion) serving this key; falls back to the primary"""
+        name = self.route(key)
+        active = self.registries[name].get()
+        if active is None and name != self.primary:
+            name = self.primary
+            active = self.registries[name].get()
+        return name, active
+
+    def error(self, name=None):
+        return self.registries[name or self.primary].error
+
+    def score(self, X, key=None):
+        """
+        Disease probabilities for a batch of raw (unscaled) feature rows
+
+        The rows are scored in one vectorized call by the model this key is
+        routed to; every other model is queued to score the same rows in
+        shadow.
+
+        Returns:
+            (probabilities, model name, ModelVersion)
+        """
+        name, active = self.select(key)
+        metrics = self.metrics[name]
+        stage = 'scale'
+        try:
+            start = time.perf_counter()
+            X_scaled = scale_features(X.copy(), active.scaler)
+            scaled = time.perf_counter()
+            stage = 'model'
+            proba = active.model.predict_proba(X_scaled)
+            end = time.perf_counter()
+        except Exception:
+            metrics.errors[stage].inc()
+            raise
+        metrics.stages['scale'].observe(scaled - start)
+        metrics.stages['model'].observe(end - scaled)
+        metrics.predictions.inc(len(X))
+        self.stats[name].record_served(len(X), end - start)
+
+        for shadow in self.registries:
+            if shadow != name:
+                self._submit_shadow(shadow, X, proba)
+        return proba, name, active
+
+    def _submit_shadow(self, name, X, primary_proba):
+        with self._pending_lock:
+            if self._pending >= self.max_pending_shadow:
+                self.stats[name].record_dropped()
+                return
+            self._pending += 1
+        self._executor.submit(self._score_shadow, name, X.copy(), primary_proba)
+
+    def _score_shadow(self, name, X, primary_proba):
+        try:
+            active = self.registries[name].get()
+            if active is None:
+                self.stats[name].record_error()
+                return
+            start = time.perf_counter()
+            proba = active.model.predict_proba(scale_features(X, active.scaler))
+            elapsed = time.perf_counter() - start
+            self.stats[name].record_shadow(
+                len(X), elapsed,
+                agreements=int(np.count_nonzero((proba >= 0.5) == (primary_proba >= 0.5))),
+                band_agreements=int(np.count_nonzero(
+                    np.digitize(proba, RISK_CUTS) == np.digitize(primary_proba, RISK_CUTS)
+                )),
+                abs_diff_sum=float(np.abs(proba - primary_proba).sum())
+            )
+        except Exception:
+            self.stats[name].record_error()
+        finally:
+            with self._pending_lock:
+                self._pending -= 1
+
+    def _collect_versions(self):
+        for name, registry in self.registries.items():
+            active = registry.current
+            if active is not None:
+                yield MODEL_INFO, {'model': name, 'version': active.version}, 1
+
+    def summary(self):
+        """Per-model statistics, including the version each model is serving"""
+        summary = {}
+        for name, registry in self.registries.items():
+            active = registry.current
+            summary[name] = {
+                'version': active.version if active is not None else None,
+                **self.stats[name].summary()
+            }
+        return summary
+
+def build_router():
+    """Router over the production model plus the candidate configured in the environment"""
+    registries = {PRIMARY_MODEL: ModelRegistry()}
+    traffic = {}
+    if CANDIDATE_DIR:
+        registries[CANDIDATE_MODEL] = ModelRegistry(candidate_artifacts(CANDIDATE_DIR))
+        traffic[CANDIDATE_MODEL] = CANDIDATE_TRAFFIC
+    return ModelRouter(registries, PRIMARY_MODEL, traffic)
@@ -0,0 +1,197 @@
+import numpy as np
+
+from model.dataset_stats import AGE_BANDS, age_band_labels
+from model.features import COLUMN_INDEX, GENDER_OPTIONS, LEVEL_OPTIONS
+
+# ============================================================================
+# SLICE DEFINITIONS
+# ============================================================================
+# Demographic / clinical columns the test set is sliced by, with the label
+# of each code. age_band is derived from age_years with the Stats section's
+# AGE_BANDS.
+SLICE_LEVELS = {
+    'gender': GENDER_OPTIONS,
+    'age_band': age_band_labels(),
+    'cholesterol': LEVEL_OPTIONS,
+    'gluc': LEVEL_OPTIONS,
+    'smoke': ["No", "Yes"],
+    'alco': ["No", "Yes"],
+    'active': ["No", "Yes"]
+}
+SLICE_COLUMNS = list(SLICE_LEVELS)
+
+# Reported groupings: every column alone, gender x age band, gender x age
+# band x each other column, and the full cross of all of them
+_OTHER_COLUMNS = [name for name in SLICE_COLUMNS if name not in ('gender', 'age_band')]
+SLICE_GROUPINGS = (
+    [(name,) for name in SLICE_COLUMNS]
+    + [('gender', 'age_band')]
+    + [('gender', 'age_band', name) for name in _OTHER_COLUMNS]
+    + [tuple(SLICE_COLUMNS)]
+)
+
+# ============================================================================
+# GROUPED METRICS
+# ============================================================================
+
+def grouped_confusion(groups, y, pred, n_groups):
+    """(n_groups, 2, 2) counts indexed [group, actual, predicted], from one bincount"""
+    codes = groups * 4 + np.asarray(y, dtype=np.int64) * 2 + np.asarray(pred, dtype=np.int64)
+    return np.bincount(codes, minlength=n_groups * 4).reshape(n_groups, 2, 2)
+
+def grouped_auc(groups, y, scores, n_groups):
+    """
+    ROC-AUC of every group from one sort
+
+    Rows are sorted by score, then stably by group (a radix sort when the
+    ids fit 16 bits), giving (group, score) order; each row's rank within
+    its group is its position minus the group's start, tied scores share
+    their average rank, and the Mann-Whitney statistic of each group comes
+    from one weighted bincount of the positives' ranks. NaN for groups
+    without both classes.
+    """
+    groups = np.asarray(groups, dtype=np.int64)
+    y = np.asarray(y, dtype=float)
+    scores = np.asarray(scores, dtype=float)
+    n = len(groups)
+    order = np.argsort(scores)
+    keys = groups[order].astype(np.uint16 if n_groups <= 1 << 16 else np.int64)
+    order = order[np.argsort(keys, kind='stable')]
+    g, s, positive = groups[order], scores[order], y[order]
+
+    new_run = np.ones(n, dtype=bool)
+    new_run[1:] = (g[1:] != g[:-1]) | (s[1:] != s[:-1])
+    run_start = np.flatnonzero(new_run)
+    run_end = np.append(run_start[1:], n)
+    mean_position = (run_start + run_end - 1) / 2
+    rank = mean_position[np.cumsum(new_run) - 1] - np.searchsorted(g, np.arange(n_groups))[g] + 1
+
+    n_pos = np.bincount(g, weights=positive, minlength=n_groups)
+    n_neg = np.bincount(g, minlength=n_groups) - n_pos
+    rank_sum = np.bincount(g, weights=rank * positive, minlength=n_groups)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        auc = (rank_sum - n_pos * (n_pos + 1) / 2) / (n_pos * n_neg)
+    auc[(n_pos == 0) | (n_neg == 0)] = np.nan
+    return auc
+
+def row_auc(y, scores):
+    """
+    ROC-AUC of every row of a (n_rows, n_samples) score matrix against the
+    same labels y
+
+    Each row is sorted on its own (short sorts instead of one over every
+    score) and the positives' ranks are their positions, one matrix-vector
+    product; only the elements of tied runs are then corrected to their
+    run's average rank.
+    """
+    scores = np.asarray(scores, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n_samples = scores.shape[1]
+    order = np.argsort(scores, axis=1)
+    s = np.take_along_axis(scores, order, axis=1)
+    positive = y[order]
+    rank_sum = positive @ np.arange(1.0, n_samples + 1)
+
+    starts = np.ones(s.shape, dtype=bool)
+    starts[:, 1:] = s[:, 1:] != s[:, :-1]
+    ends = np.ones(s.shape, dtype=bool)
+    ends[:, :-1] = starts[:, 1:]
+    rows, cols = np.nonzero(~(starts & ends))
+    if len(rows):
+        first = starts[rows, cols]
+        run = np.cumsum(first) - 1
+        middle = (cols[first] + cols[ends[rows, cols]]) / 2
+        rank_sum += np.bincount(rows, weights=(middle[run] - cols) * positive[rows, cols], minlength=len(s))
+
+    n_pos = y.sum()
+    n_neg = n_samples - n_pos
+    if n_pos == 0 or n_neg == 0:
+        return np.full(len(s), np.nan)
+    return (rank_sum - n_pos * (n_pos + 1) / 2) / (n_pos * n_neg)
+
+def roc_auc(y, scores):
+    """Area under the ROC curve (ties count one half), vectorized"""
+    return float(grouped_auc(np.zeros(len(y), dtype=np.int64), y, scores, 1)[0])
+
+def metrics_from_confusion(confusion):
+    """Derived metrics per group from [group, actual, predicted] counts; NaN where undefined"""
+    tn, fp = confusion[:, 0, 0].astype(float), confusion[:, 0, 1].astype(float)
+    fn, tp = confusion[:, 1, 0].astype(float), confusion[:, 1, 1].astype(float)
+    n = tn + fp + fn + tp
+    with np.errstate(divide='ignore', invalid='ignore'):
+        precision = tp / (tp + fp)
+        recall = tp / (tp + fn)
+        return {
+            'accuracy': (tp + tn) / n,
+            'precision': precision,
+            'recall': recall,
+            'f1_score': 2 * precision * recall / (precision + recall),
+            'specificity': tn / (tn + fp),
+            'prevalence': (tp + fn) / n
+        }
+
+# ============================================================================
+# SUBGROUP REPORT
+# ============================================================================
+
+def slice_codes(X_raw):
+    """Integer code per row for every slice column (raw, unscaled rows)"""
+    codes = {
+        name: X_raw[:, COLUMN_INDEX[name]].astype(np.int64) for name in SLICE_COLUMNS if name != 'age_band'
+    }
+    codes['age_band'] = np.searchsorted(AGE_BANDS, X_raw[:, COLUMN_INDEX['age_years']], side='right') - 1
+    return codes
+
+def _number(value):
+    return None if np.isnan(value) else float(value)
+
+def subgroup_metrics(X_raw, y, pred, proba, groupings=SLICE_GROUPINGS, min_count=1):
+    """
+    Confusion counts, derived metrics and ROC-AUC for every slice of every
+    grouping, in one pass
+
+    Each grouping's cells get a mixed-radix id, offset so all groupings
+    share one id space; the rows are stacked once per grouping and a single
+    bincount / sort computes every slice. Slices with fewer than min_count
+    patients are left out.
+    """
+    y = np.asarray(y, dtype=np.int64)
+    pred = np.asarray(pred, dtype=np.int64)
+    codes = slice_codes(X_raw)
+
+    ids, offsets, offset = [], [], 0
+    for columns in groupings:
+        cell = np.zeros(len(y), dtype=np.int64)
+        for name in columns:
+            cell = cell * len(SLICE_LEVELS[name]) + codes[name]
+        ids.append(cell + offset)
+        offsets.append(offset)
+        offset += int(np.prod([len(SLICE_LEVELS[name]) for name in columns]))
+    stacked = np.concatenate(ids)
+    repeat = len(groupings)
+
+    confusion = grouped_confusion(stacked, np.tile(y, repeat), np.tile(pred, repeat), offset)
+    auc = grouped_auc(stacked, np.tile(y, repeat), np.tile(proba, repeat), offset)
+    derived = metrics_from_confusion(confusion)
+    counts = confusion.sum(axis=(1, 2))
+
+    report = []
+    for columns, start in zip(groupings, offsets):
+        shape = [len(SLICE_LEVELS[name]) for name in columns]
+        slices = []
+        for local in range(int(np.prod(shape))):
+            cell = start + local
+            if counts[cell] < min_count:
+                continue
+            index = np.unravel_index(local, shape)
+            (tn, fp), (fn, tp) = confusion[cell].tolist()
+            entry = {
+                'values': [SLICE_LEVELS[name][i] for name, i in zip(columns, index)],
+                'n': int(counts[cell]),
+                'confusion_matrix': {"TP": tp, "TN": tn, "FP": fp, "FN": fn}
+            }
+            entry.update({name: _number(values[cell]) for name, values in derived.items()})
+            entry['roc_auc'] = _number(auc[cell])
+            slices.append(entry)
+        report.append({'columns': list(columns), 'slices': slices})
+    return report
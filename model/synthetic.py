@@ -0,0 +1,285 @@
+from statistics import NormalDist
+
+import numpy as np
+from model.features import COLUMN_INDEX, DATASET_CATEGORY_COUNTS, FEATURE_COLUMNS, NUMERIC_COLUMNS, compute_bmi
+from model.validation import RANGE_RULES
+
+# ============================================================================
+# PUBLISHED TRAINING STATISTICS
+# ============================================================================
+# Means / standard deviations of the numeric features in the training split
+# (model/scaler.pkl, 52,326 rows after the week2 filters), NUMERIC_COLUMNS order
+SCALER_MEANS = [52.8169, 164.4082, 74.4381, 127.0261, 81.3919, 27.5778]
+SCALER_STDS = [6.8088, 8.0159, 14.4074, 16.9829, 9.5935, 5.2694]
+
+# age_years is int(age in days / 365.25); the dataset spans 29.6-65.0 years
+AGE_RANGE = (29, 64)
+
+# Target pairwise correlations of the cleaned, encoded dataset (rounded;
+# age-cholesterol from the week1 report). Unlisted pairs are uncorrelated.
+TARGET_CORRELATIONS = {
+    ('gender', 'height'): 0.50,
+    ('gender', 'weight'): 0.16,
+    ('gender', 'smoke'): 0.34,
+    ('gender', 'alco'): 0.17,
+    ('height', 'weight'): 0.29,
+    ('weight', 'ap_hi'): 0.27,
+    ('weight', 'ap_lo'): 0.25,
+    ('weight', 'cholesterol'): 0.14,
+    ('weight', 'gluc'): 0.11,
+    ('ap_hi', 'ap_lo'): 0.70,
+    ('ap_hi', 'cholesterol'): 0.19,
+    ('ap_lo', 'cholesterol'): 0.16,
+    ('ap_hi', 'age_years'): 0.21,
+    ('ap_lo', 'age_years'): 0.15,
+    ('cholesterol', 'gluc'): 0.45,
+    ('cholesterol', 'age_years'): 0.25,
+    ('gluc', 'age_years'): 0.10,
+    ('smoke', 'alco'): 0.34
+}
+
+# Labels: the shipped model's weights over the scaled features
+# (FEATURE_COLUMNS order), with a temperature and intercept refitted so the
+# cohort matches the training split's prevalence (26,531 / 52,326 positive)
+# and ROC-AUC (training_report.json)
+LABEL_WEIGHTS = [-0.0215, -0.0091, 0.0837, 0.6908, 0.2911, 0.3256,
+                 0.0099, -0.0411, -0.0356, -0.0711, 0.3414, 0.0847]
+TARGET_PREVALENCE = 26531 / 52326
+TARGET_ROC_AUC = 0.7851
+
+# Share of cardio_train.csv rows the week2 filters removed (70,000 -> 68,594);
+# the raw form gets the same share of invalid rows
+RAW_INVALID_RATE = (70000 - 68594) / 70000
+
+# Raw cardio_train.csv layout (';'-separated, age in days, 1-based codes)
+RAW_COLUMNS = ['id', 'age', 'gender', 'height', 'weight', 'ap_hi', 'ap_lo',
+               'cholesterol', 'gluc', 'smoke', 'alco', 'active', 'cardio']
+
+# Every feature but BMI is drawn; BMI follows from height and weight
+LATENT_COLUMNS = [name for name in FEATURE_COLUMNS if name != 'BMI']
+
+BMI_RANGE = next((low, high) for _, column, low, high in RANGE_RULES if column == 'BMI')
+
+FIT_ROWS = 200_000
+FIT_ITERATIONS = 12
+
+def _category_thresholds(counts):
+    """Standard-normal cut points giving the category proportions"""
+    cumulative = np.cumsum(counts)[:-1] / np.sum(counts)
+    return np.array([NormalDist().inv_cdf(p) for p in cumulative])
+
+def _nearest_correlation(R):
+    """Closest positive definite matrix with a unit diagonal (eigenvalue clipping)"""
+    values, vectors = np.linalg.eigh((R + R.T) / 2)
+    R = vectors @ np.diag(np.maximum(values, 1e-4)) @ vectors.T
+    d = np.sqrt(np.diag(R))
+    return R / np.outer(d, d)
+
+def roc_auc(y, scores):
+    """Area under the ROC curve via the rank-sum statistic (ties ignored)"""
+    ranks = np.empty(len(scores))
+    ranks[np.argsort(scores)] = np.arange(1, len(scores) + 1)
+    n_pos = np.count_nonzero(y)
+    n_neg = len(y) - n_pos
+    return (ranks[y == 1].sum() - n_pos * (n_pos + 1) / 2) / (n_pos * n_neg)
+
+# ============================================================================
+# GENERATOR
+# ============================================================================
+
+class CohortGenerator:
+    """
+    Gaussian-copula generator of cardio-schema patients
+
+    A correlated standard-normal draw per latent column is mapped onto the
+    training marginals (normal numeric features rounded and clipped to the
+    week2 filter ranges, categories by normal cut points), and labels are
+    drawn from a logistic model of the scaled features. The latent
+    correlation and the label temperature / intercept are fitted on a
+    sample so the generated data reproduce TARGET_CORRELATIONS,
+    TARGET_PREVALENCE and TARGET_ROC_AUC.
+    """
+
+    def __init__(self, seed=0, fit_rows=FIT_ROWS, iterations=FIT_ITERATIONS):
+        self.thresholds = {
+            name: _category_thresholds(DATASET_CATEGORY_COUNTS[name]) for name in DATASET_CATEGORY_COUNTS
+        }
+        self.target = np.eye(len(LATENT_COLUMNS))
+        for (a, b), r in TARGET_CORRELATIONS.items():
+            i, j = LATENT_COLUMNS.index(a), LATENT_COLUMNS.index(b)
+            self.target[i, j] = self.target[j, i] = r
+
+        # Fixed-point fit of the latent correlation: rounding, clipping and
+        # thresholding attenuate it, so raise it by the observed shortfall
+        rng = np.random.default_rng(seed)
+        normals = rng.standard_normal((fit_rows, len(LATENT_COLUMNS)))
+        latent = self.target.copy()
+        for _ in range(iterations):
+            self._cholesky = np.linalg.cholesky(latent)
+            observed = np.corrcoef(self.features(normals)[:, [COLUMN_INDEX[c] for c in LATENT_COLUMNS]],
+                                   rowvar=False)
+            latent = _nearest_correlation(latent + (self.target - observed))
+        self._cholesky = np.linalg.cholesky(latent)
+        self.latent_correlation = latent
+
+        self.temperature, self.bias = 1.0, 0.0
+        self._fit_labels(self.features(normals), rng)
+
+    def features(self, normals):
+        """Raw (unscaled) feature rows from independent standard normals"""
+        Z = normals @ self._cholesky.T
+        X = np.empty((len(Z), len(FEATURE_COLUMNS)))
+        for j, name in enumerate(LATENT_COLUMNS):
+            if name in self.thresholds:
+                X[:, COLUMN_INDEX[name]] = np.searchsorted(self.thresholds[name], Z[:, j])
+            else:
+                k = NUMERIC_COLUMNS.index(name)
+                X[:, COLUMN_INDEX[name]] = np.rint(SCALER_MEANS[k] + SCALER_STDS[k] * Z[:, j])
+
+        np.clip(X[:, COLUMN_INDEX['age_years']], *AGE_RANGE, out=X[:, COLUMN_INDEX['age_years']])
+        for _, column, low, high in RANGE_RULES:
+            if column != 'BMI':
+                np.clip(X[:, COLUMN_INDEX[column]], low, high, out=X[:, COLUMN_INDEX[column]])
+        ap_hi, ap_lo = X[:, COLUMN_INDEX['ap_hi']], X[:, COLUMN_INDEX['ap_lo']]
+        np.minimum(ap_lo, ap_hi - 1, out=ap_lo)
+        # Keep BMI inside its filter range by clipping the weight
+        height_m2 = (X[:, COLUMN_INDEX['height']] / 100) ** 2
+        weight = X[:, COLUMN_INDEX['weight']]
+        np.clip(weight, np.ceil(BMI_RANGE[0] * height_m2), np.floor(BMI_RANGE[1] * height_m2), out=weight)
+        X[:, COLUMN_INDEX['BMI']] = compute_bmi(weight, X[:, COLUMN_INDEX['height']])
+        return X
+
+    def logits(self, X):
+        scaled = X.copy()
+        numeric = [COLUMN_INDEX[name] for name in NUMERIC_COLUMNS]
+        scaled[:, numeric] = (scaled[:, numeric] - SCALER_MEANS) / SCALER_STDS
+        return (scaled @ np.array(LABEL_WEIGHTS)) * self.temperature + self.bias
+
+    def _fit_labels(self, X, rng):
+        base = self.logits(X)
+        uniforms = rng.random(len(X))
+
+        def fit_bias(temperature):
+            # Newton steps on mean(sigmoid) = prevalence
+            bias = 0.0
+            for _ in range(20):
+                p = 1 / (1 + np.exp(-(base * temperature + bias)))
+                bias -= (p.mean() - TARGET_PREVALENCE) / max((p * (1 - p)).mean(), 1e-9)
+            return bias
+
+        # AUC grows with the temperature: bisect on it
+        low, high = 0.1, 20.0
+        for _ in range(30):
+            temperature = (low + high) / 2
+            bias = fit_bias(temperature)
+            y = uniforms < 1 / (1 + np.exp(-(base * temperature + bias)))
+            if roc_auc(y, base) < TARGET_ROC_AUC:
+                low = temperature
+            else:
+                high = temperature
+        self.temperature = (low + high) / 2
+        self.bias = fit_bias(self.temperature)
+
+    def sample(self, n, rng):
+        """(raw feature rows, labels) for n patients"""
+        X = self.features(rng.standard_normal((n, len(LATENT_COLUMNS))))
+        y = (rng.random(n) < 1 / (1 + np.exp(-self.logits(X)))).astype(np.int8)
+        return X, y
+
+# ============================================================================
+# OUTPUT FORMS
+# ============================================================================
+
+def raw_columns(X, y, first_id, rng, invalid_rate=RAW_INVALID_RATE):
+    """
+    Columns of cardio_train.csv for a chunk: age in days, 1-based codes, and
+    a share of rows made invalid the way the raw data is (swapped blood
+    pressures, an extra digit, heights in the wrong unit)
+
+    Returns:
+        (columns in RAW_COLUMNS order, mask of the rows left valid)
+    """
+    n = len(X)
+    age_days = np.floor((X[:, COLUMN_INDEX['age_years']] + rng.random(n)) * 365.25).astype(np.int64)
+    ap_hi = X[:, COLUMN_INDEX['ap_hi']].astype(np.int64)
+    ap_lo = X[:, COLUMN_INDEX['ap_lo']].astype(np.int64)
+    height = X[:, COLUMN_INDEX['height']].astype(np.int64)
+
+    kind = np.where(rng.random(n) < invalid_rate, rng.integers(1, 4, n), 0)
+    swapped = kind == 1
+    ap_hi[swapped], ap_lo[swapped] = ap_lo[swapped].copy(), ap_hi[swapped].copy()
+    ap_lo[kind == 2] *= 10
+    height[kind == 3] = np.rint(height[kind == 3] / 2.54)
+
+    columns = [
+        np.arange(first_id, first_id + n), age_days,
+        X[:, COLUMN_INDEX['gender']].astype(np.int64) + 1, height, X[:, COLUMN_INDEX['weight']],
+        ap_hi, ap_lo,
+        X[:, COLUMN_INDEX['cholesterol']].astype(np.int64) + 1, X[:, COLUMN_INDEX['gluc']].astype(np.int64) + 1,
+        X[:, COLUMN_INDEX['smoke']].astype(np.int64), X[:, COLUMN_INDEX['alco']].astype(np.int64),
+        X[:, COLUMN_INDEX['active']].astype(np.int64), y.astype(np.int64)
+    ]
+    return columns, kind == 0
+
+def csv_bytes(columns, decimals, sep=","):
+    """
+    CSV rows for equal-length numeric columns, formatted without a Python
+    loop over rows
+
+    Every output byte position (sign, integer digits, point, decimals,
+    separator of each column) is one contiguous row of a byte matrix,
+    filled with a few integer operations over the whole chunk; a mask drops
+    the sign of non-negative values and leading zeros, and the masked bytes
+    read patient by patient are the CSV text. decimals[i] is the fixed
+    number of decimals of column i (0 for integers), or None for full
+    precision ('%.17g', which reads back to the same float).
+
+    Full-precision columns have no fixed width, so when there are any the
+    rows are formatted with one '%' row template per block of rows instead.
+    """
+    if any(d is None for d in decimals):
+        return _template_csv_bytes(columns, decimals, sep)
+    fields = []
+    for values, d in zip(columns, decimals):
+        values = np.asarray(values, dtype=float)
+        scaled = np.rint(np.abs(values) * 10 ** d)
+        top = int(scaled.max()) if len(scaled) else 0
+        scaled = scaled.astype(np.int32 if top < 2 ** 31 else np.int64)
+        integer = scaled // 10 ** d if d else scaled
+        fields.append((values, scaled, integer, d, len(str(top // 10 ** d))))
+
+    width = sum(n_int + (d + 1 if d else 0) + 2 for _, _, _, d, n_int in fields)
+    block = np.empty((width, len(fields[0][0])), dtype=np.uint8)
+    mask = np.ones(block.shape, dtype=bool)
+    row = 0
+    for k, (values, scaled, integer, d, n_int) in enumerate(fields):
+        block[row] = ord("-")
+        np.logical_and(values < 0, scaled > 0, out=mask[row])
+        row += 1
+        for p in range(n_int):
+            power = 10 ** (n_int - 1 - p)
+            np.add(integer // power % 10, 48, out=block[row], casting='unsafe')
+            if p < n_int - 1:
+                np.greater_equal(integer, power, out=mask[row])
+            row += 1
+        if d:
+            block[row] = ord(".")
+            row += 1
+            for p in range(d):
+                np.add(scaled // 10 ** (d - 1 - p) % 10, 48, out=block[row], casting='unsafe')
+                row += 1
+        block[row] = ord("\n") if k == len(fields) - 1 else ord(sep)
+        row += 1
+    return np.ascontiguousarray(block.T)[np.ascontiguousarray(mask.T)].tobytes()
+
+# Rows formatted per '%' call in _template_csv_bytes (bounds the argument tuple)
+TEMPLATE_BLOCK_ROWS = 100_000
+
+def _template_csv_bytes(columns, decimals, sep):
+    row = sep.join('%.17g' if d is None else f'%.{d}f' for d in decimals) + '\n'
+    values = np.column_stack([np.asarray(column, dtype=float) for column in columns])
+    blocks = []
+    for start in range(0, len(values), TEMPLATE_BLOCK_ROWS):
+        block = values[start:start + TEMPLATE_BLOCK_ROWS]
+        blocks.append(((row * len(block)) % tuple(block.ravel().tolist())).encode())
+    return b''.join(blocks)
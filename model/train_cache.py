@@ -0,0 +1,169 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+
+# ============================================================================
+# TRAINING CACHE CONFIGURATION
+# ============================================================================
+# Content-addressed store of training results; an empty path disables it
+CACHE_DIR = os.environ.get("CARDIO_TRAIN_CACHE", ".cache/train")
+# Least recently used entries are evicted beyond either limit
+CACHE_MAX_ENTRIES = int(os.environ.get("CARDIO_TRAIN_CACHE_MAX_ENTRIES", "20"))
+CACHE_MAX_BYTES = int(os.environ.get("CARDIO_TRAIN_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+
+MANIFEST = "manifest.json"
+# Digests of input files by stat signature, so unchanged large datasets are
+# not re-read on every run
+DIGEST_MEMO = "digests.json"
+
+def _signature(info):
+    return [info.st_size, info.st_mtime_ns, info.st_ctime_ns, info.st_ino]
+
+def file_digest(path, memo=None):
+    """sha256 of a file's contents, reused from memo while its stat signature is unchanged"""
+    key = os.path.abspath(path)
+    info = os.stat(path)
+    if memo is not None and key in memo and memo[key][0] == _signature(info):
+        return memo[key][1]
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    digest = h.hexdigest()
+    if memo is not None:
+        memo[key] = [_signature(info), digest]
+    return digest
+
+def code_files(*paths):
+    """Absolute paths of the given source files, deduplicated and sorted for a stable key"""
+    return sorted(set(os.path.abspath(path) for path in paths))
+
+# ============================================================================
+# TRAINING CACHE
+# ============================================================================
+
+class TrainingCache:
+    """
+    Training results stored under a hash of everything that determines them
+
+    The key covers the contents of the input files (datasets, scaler), the
+    hyperparameters and the source of the training code (plus the numpy
+    version), so any change to one of them is a miss. An entry is a
+    directory of the artifacts a run wrote and a manifest mapping them back
+    to their paths; it is written to a temporary directory and renamed into
+    place, so concurrent runs never see a partial entry. Lookups refresh the
+    manifest's mtime, and stores evict the least recently used entries
+    beyond max_entries / max_bytes.
+    """
+
+    def __init__(self, directory=CACHE_DIR, max_entries=CACHE_MAX_ENTRIES, max_bytes=CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+    def key(self, input_files, settings, source_files):
+        """Hex sha256 identifying a training run"""
+        memo_path = os.path.join(self.directory, DIGEST_MEMO)
+        try:
+            with open(memo_path) as f:
+                memo = json.load(f)
+        except (OSError, ValueError):
+            memo = {}
+        memo = {path: value for path, value in memo.items() if os.path.exists(path)}
+        before = json.dumps(memo, sort_keys=True)
+
+        description = {
+            'inputs': {path: file_digest(path, memo) for path in input_files},
+            'settings': settings,
+            'code': {os.path.relpath(path): file_digest(path, memo) for path in source_files},
+            'numpy': np.__version__
+        }
+        if json.dumps(memo, sort_keys=True) != before:
+            self._write_json(memo_path, memo)
+        return hashlib.sha256(json.dumps(description, sort_keys=True).encode()).hexdigest()
+
+    def lookup(self, key):
+        """{artifact path: bytes} of a stored result, or None on a miss"""
+        entry = os.path.join(self.directory, key)
+        try:
+            with open(os.path.join(entry, MANIFEST)) as f:
+                manifest = json.load(f)
+            artifacts = {}
+            for name, path in manifest['files'].items():
+                with open(os.path.join(entry, name), 'rb') as f:
+                    artifacts[path] = f.read()
+            os.utime(os.path.join(entry, MANIFEST))
+        except (OSError, ValueError, KeyError):
+            return None
+        return artifacts
+
+    def store(self, key, paths):
+        """Copy the artifacts at paths into the entry for key, then evict"""
+        entry = os.path.join(self.directory, key)
+        tmp_entry = f"{entry}.tmp.{os.getpid()}"
+        try:
+            os.makedirs(tmp_entry, exist_ok=True)
+            files = {}
+            for path in paths:
+                name = os.path.basename(path)
+                shutil.copyfile(path, os.path.join(tmp_entry, name))
+                files[name] = path
+            with open(os.path.join(tmp_entry, MANIFEST), 'w') as f:
+                json.dump({'key': key, 'created': time.time(), 'files': files}, f, indent=2)
+            os.replace(tmp_entry, entry)
+        except OSError:
+            # Another run stored the same key first (or the disk is full)
+            return False
+        finally:
+            shutil.rmtree(tmp_entry, ignore_errors=True)
+        self.evict()
+        return True
+
+    def entries(self):
+        """(key, last used, bytes) of every stored entry, most recent first"""
+        found = []
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return found
+        for name in names:
+            if '.tmp.' in name:
+                continue  # being written by another run
+            entry = os.path.join(self.directory, name)
+            try:
+                last_used = os.stat(os.path.join(entry, MANIFEST)).st_mtime
+                size = sum(os.path.getsize(os.path.join(entry, f)) for f in os.listdir(entry))
+            except OSError:
+                continue  # not an entry, or being evicted
+            found.append((name, last_used, size))
+        return sorted(found, key=lambda e: e[1], reverse=True)
+
+    def evict(self):
+        """Remove least recently used entries beyond the limits; returns the keys removed"""
+        removed = []
+        kept = total = 0
+        for key, _, size in self.entries():
+            if not removed and kept < self.max_entries and total + size <= self.max_bytes:
+                kept += 1
+                total += size
+            else:
+                shutil.rmtree(os.path.join(self.directory, key), ignore_errors=True)
+                removed.append(key)
+        return removed
+
+    def _write_json(self, path, data):
+        tmp_path = f"{path}.tmp.{os.getpid()}"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
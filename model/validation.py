@@ -0,0 +1,86 @@
+import numpy as np
+from model.features import CATEGORICAL_COLUMNS, COLUMN_INDEX, DATASET_CATEGORY_COUNTS
+
+# ============================================================================
+# VALIDATION RULES
+# ============================================================================
+# Outlier filters applied to the training data by the week2 preprocessing
+# notebook (bounds inclusive). Rows outside them are out of distribution for
+# the model, whatever it predicts for them.
+RANGE_RULES = [
+    # (reason code, column, low, high)
+    ('AP_HI_RANGE', 'ap_hi', 50, 250),
+    ('AP_LO_RANGE', 'ap_lo', 30, 150),
+    ('HEIGHT_RANGE', 'height', 120, 220),
+    ('WEIGHT_RANGE', 'weight', 30, 200),
+    ('BMI_RANGE', 'BMI', 10, 60)
+]
+
+REASON_MESSAGES = {
+    'MISSING_VALUE': "A feature is missing or not a number",
+    'AP_HI_RANGE': "Systolic blood pressure is outside 50–250 mmHg",
+    'AP_LO_RANGE': "Diastolic blood pressure is outside 30–150 mmHg",
+    'AP_ORDER': "Systolic blood pressure is not above diastolic",
+    'HEIGHT_RANGE': "Height is outside 120–220 cm",
+    'WEIGHT_RANGE': "Weight is outside 30–200 kg",
+    'BMI_RANGE': "BMI is outside 10–60",
+    'CATEGORY_CODE': "A categorical feature has an unknown code"
+}
+# Bit i of a row's violation mask is REASON_CODES[i]
+REASON_CODES = list(REASON_MESSAGES)
+
+_RANGE_INDEX = np.array([COLUMN_INDEX[column] for _, column, _, _ in RANGE_RULES])
+_RANGE_LOW = np.array([low for _, _, low, _ in RANGE_RULES], dtype=float)
+_RANGE_HIGH = np.array([high for _, _, _, high in RANGE_RULES], dtype=float)
+_RANGE_BITS = np.array([1 << REASON_CODES.index(code) for code, _, _, _ in RANGE_RULES])
+_CATEGORY_INDEX = np.array([COLUMN_INDEX[column] for column in CATEGORICAL_COLUMNS])
+_CATEGORY_LEVELS = np.array([len(DATASET_CATEGORY_COUNTS[column]) for column in CATEGORICAL_COLUMNS])
+
+def _bit(code):
+    return 1 << REASON_CODES.index(code)
+
+# ============================================================================
+# BATCH VALIDATION
+# ============================================================================
+
+def violation_masks(X):
+    """
+    Bitmask of failed rules per row of a raw (unscaled) feature matrix
+
+    Every rule is a comparison over whole columns, so a batch costs a few
+    array passes regardless of its size.
+
+    Returns:
+        int64 array of shape (n_samples,); 0 means the row passed every rule
+    """
+    X = np.asarray(X, dtype=float)
+    masks = np.where(np.isnan(X).any(axis=1), _bit('MISSING_VALUE'), 0)
+
+    numeric = X[:, _RANGE_INDEX]
+    out_of_range = (numeric < _RANGE_LOW) | (numeric > _RANGE_HIGH)
+    masks |= out_of_range @ _RANGE_BITS
+
+    masks |= np.where(X[:, COLUMN_INDEX['ap_hi']] <= X[:, COLUMN_INDEX['ap_lo']], _bit('AP_ORDER'), 0)
+
+    categories = X[:, _CATEGORY_INDEX]
+    bad_category = (categories != np.round(categories)) | (categories < 0) | (categories >= _CATEGORY_LEVELS)
+    masks |= np.where(bad_category.any(axis=1), _bit('CATEGORY_CODE'), 0)
+    return masks
+
+def reason_codes(mask):
+    """Reason codes set in one violation mask"""
+    return [code for i, code in enumerate(REASON_CODES) if mask >> i & 1]
+
+# Joined reason codes for every possible mask, so decoding a batch is one gather
+_REASON_LABELS = np.array([";".join(reason_codes(mask)) for mask in range(1 << len(REASON_CODES))], dtype=object)
+
+def validate(X):
+    """
+    Validate a batch of raw feature rows
+
+    Returns:
+        (valid, reasons): a boolean array and an object array with the
+        ';'-joined reason codes of each row ('' for valid rows)
+    """
+    masks = violation_masks(X)
+    return masks == 0, _REASON_LABELS[masks]
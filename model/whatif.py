@@ -0,0 +1,70 @@
+import numpy as np
+from model.features import COLUMN_INDEX, compute_bmi, scale_features
+
+# ============================================================================
+# WHAT-IF SENSITIVITY ANALYSIS
+# ============================================================================
+# Values tried for each modifiable input. Everything else stays at the
+# patient's own values.
+WHATIF_RANGES = {
+    'ap_hi': np.arange(90, 205, 5),
+    'ap_lo': np.arange(60, 125, 5),
+    'weight': np.arange(40, 155, 5),
+    'smoke': np.array([0, 1]),
+    'alco': np.array([0, 1]),
+    'active': np.array([0, 1])
+}
+
+def build_whatif_grid(base_row, ranges=WHATIF_RANGES):
+    """
+    Stack every perturbed version of one patient into a single raw matrix
+
+    Each input gets a contiguous block of rows in which only that input
+    changes. Changing weight also updates BMI, and blood pressure values that
+    would put systolic at or below diastolic are left out.
+
+    Returns:
+        X: raw (unscaled) feature matrix, one row per scenario
+        blocks: {input name: (values, row slice into X)}
+    """
+    ap_hi = base_row[COLUMN_INDEX['ap_hi']]
+    ap_lo = base_row[COLUMN_INDEX['ap_lo']]
+    valid = {
+        'ap_hi': lambda values: values[values > ap_lo],
+        'ap_lo': lambda values: values[values < ap_hi]
+    }
+
+    sizes, grid_values = [], {}
+    for name, values in ranges.items():
+        values = np.asarray(values, dtype=float)
+        if name in valid:
+            values = valid[name](values)
+        grid_values[name] = values
+        sizes.append(len(values))
+
+    X = np.repeat(base_row[np.newaxis, :], sum(sizes), axis=0)
+    blocks = {}
+    start = 0
+    for (name, values), size in zip(grid_values.items(), sizes):
+        rows = slice(start, start + size)
+        X[rows, COLUMN_INDEX[name]] = values
+        if name in ('weight', 'height'):
+            X[rows, COLUMN_INDEX['BMI']] = compute_bmi(
+                X[rows, COLUMN_INDEX['weight']], X[rows, COLUMN_INDEX['height']]
+            )
+        blocks[name] = (values, rows)
+        start += size
+    return X, blocks
+
+def sensitivity_curves(model, scaler, base_row, ranges=WHATIF_RANGES):
+    """
+    Disease probability across the range of each modifiable input
+
+    All scenarios are scored with one batched predict_proba call.
+
+    Returns:
+        {input name: (values, probabilities)}
+    """
+    X, blocks = build_whatif_grid(base_row, ranges)
+    proba = model.predict_proba(scale_features(X, scaler))
+    return {name: (values, proba[rows]) for name, (values, rows) in blocks.items()}
@@ -0,0 +1,109 @@
+"""
+Batch scoring for a cohort of patients.
+
+Reads a CSV with one patient per row, using the training feature columns
+(model/features.py FEATURE_COLUMNS, encoded but not scaled; BMI is derived
+when missing), and writes it back with the disease probability, risk level,
+BMI and blood pressure categories, the app's recommendations, per-feature
+logit contributions and the top risk-increasing features.
+
+Usage:
+    python score.py patients.csv scored.csv
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from model.drift import DriftMonitor, version_reference
+from model.explain import SIGNIFICANT_CONTRIBUTION, contributions, feature_baseline, top_features
+from model.features import FEATURE_COLUMNS, compute_bmi, scale_features
+from model.registry import ModelRegistry
+from model.rules import cohort_labels
+from model.validation import validate
+
+TOP_FACTORS = 3
+
+def load_cohort(path):
+    """Raw feature matrix in training column order"""
+    df = pd.read_csv(path)
+    if 'BMI' not in df.columns:
+        df['BMI'] = compute_bmi(df['weight'], df['height'])
+    missing = [column for column in FEATURE_COLUMNS if column not in df.columns]
+    if missing:
+        raise ValueError(f"missing columns: {', '.join(missing)}")
+    return df, df[FEATURE_COLUMNS].to_numpy(dtype=float)
+
+def score_cohort(active, X_raw):
+    """Probabilities, contributions and top factors for every row in one vectorized pass"""
+    X = scale_features(X_raw.copy(), active.scaler)
+    proba = active.model.predict_proba(X)
+    C = contributions(active.model, X, feature_baseline(active.report))
+
+    top = top_features(C, TOP_FACTORS)
+    top_names = np.array(FEATURE_COLUMNS, dtype=object)[top]
+    top_names[np.take_along_axis(C, top, axis=1) < SIGNIFICANT_CONTRIBUTION] = ""
+    return proba, C, top_names
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("input", help="CSV of patients to score")
+    parser.add_argument("output", help="where to write the scored CSV")
+    parser.add_argument("--invalid", choices=["reject", "flag"], default="reject",
+                        help="leave rows that fail validation unscored, or score and flag them")
+    args = parser.parse_args()
+
+    active = ModelRegistry().get()
+    if active is None:
+        print("❌ Could not load the model artifacts")
+        return
+
+    df, X_raw = load_cohort(args.input)
+    start = time.perf_counter()
+    valid, reasons = validate(X_raw)
+    scored = valid if args.invalid == "reject" else np.ones(len(X_raw), dtype=bool)
+    proba, C, top_names = score_cohort(active, X_raw[scored])
+    elapsed = time.perf_counter() - start
+
+    df['valid'] = valid
+    df['validation_reasons'] = reasons
+    df['probability'] = np.nan
+    df.loc[scored, 'probability'] = proba
+    for column, labels in cohort_labels(X_raw[scored], proba).items():
+        df[column] = ""
+        df.loc[scored, column] = labels
+    if active.population is not None:
+        df['risk_percentile'] = np.nan
+        df.loc[scored, 'risk_percentile'] = active.population.percentile('risk', proba)
+    for j, column in enumerate(FEATURE_COLUMNS):
+        df[f'contribution_{column}'] = np.nan
+        df.loc[scored, f'contribution_{column}'] = C[:, j]
+    for k in range(TOP_FACTORS):
+        df[f'risk_factor_{k + 1}'] = ""
+        df.loc[scored, f'risk_factor_{k + 1}'] = top_names[:, k]
+    df['model_version'] = active.version
+    df.to_csv(args.output, index=False)
+
+    print(f"✅ Scored {int(scored.sum()):,} patients in {elapsed*1000:.1f} ms (model {active.version})")
+    n_invalid = int((~valid).sum())
+    if n_invalid:
+        action = "rejected" if args.invalid == "reject" else "flagged"
+        print(f"⚠️  {n_invalid:,} rows failed validation and were {action}:")
+        for code, count in pd.Series(reasons[~valid]).str.split(";").explode().value_counts().items():
+            print(f"   - {code}: {count:,}")
+    print(f"✅ Results saved to: {args.output}")
+
+    # Compare the cohort with the training distribution
+    monitor = DriftMonitor(version_reference(active))
+    monitor.update(X_raw[scored])
+    drifted = {name: stats for name, stats in monitor.drift().items() if stats['status'] != "ok"}
+    if drifted:
+        print(f"\n⚠️  Cohort differs from the training population:")
+        for name, stats in drifted.items():
+            print(f"   - {name}: PSI {stats['psi']:.3f} ({stats['status']}), "
+                  f"mean {stats['mean']:.2f} vs {stats['reference_mean']:.2f}")
+
+if __name__ == "__main__":
+    main()
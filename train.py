@@ -1,9 +1,106 @@
+import argparse
+import os
 import numpy as np
 import pandas as pd
 import pickle
 import json
 from datetime import datetime
 from model.LogisticRegression import LogisticRegression
+from model.calibration import CALIBRATORS, expected_calibration_error, reliability_curve, select_calibrator
+from model.dataset_stats import STATS_PATH, build_stats
+from model.drift import REFERENCE_PATH, build_reference
+from model.ensemble import fit_bagged
+from model.features import FEATURE_COLUMNS, INTEGER_INDEX, NUMERIC_INDEX
+from model.importance import permutation_importance
+from model.learning_curve import learning_curve
+from model.percentiles import build_index
+from model.subgroups import roc_auc, subgroup_metrics
+from model.train_cache import CACHE_DIR, TrainingCache, code_files
+
+# ============================================================================
+# ARTIFACT OUTPUT
+# ============================================================================
+
+def atomic_write(path, data):
+    """Write bytes via a temp file and os.replace so a running app never reads a partial artifact"""
+    tmp_path = f"{path}.tmp.{os.getpid()}"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+# ============================================================================
+# MODEL SETTINGS
+# ============================================================================
+LEARNING_RATE = 0.005
+N_ITERATIONS = 3000
+
+DATA_FILES = {
+    'X_train': "data/X_train_final.csv",
+    'X_test': "data/X_test_final.csv",
+    'y_train': "data/y_train_final.csv",
+    'y_test': "data/y_test_final.csv"
+}
+SCALER_PATH = "model/scaler.pkl"
+
+# Every model/ module this script runs, directly or through another module
+# (part of the cache key; generated files such as model/cardio_scorer.py are
+# left out so writing them does not invalidate the cache)
+TRAINING_MODULES = [
+    "model/LogisticRegression.py", "model/calibration.py", "model/dataset_stats.py", "model/drift.py",
+    "model/ensemble.py", "model/features.py", "model/importance.py", "model/learning_curve.py",
+    "model/percentiles.py", "model/subgroups.py", "model/train_cache.py"
+]
+
+# ============================================================================
+# CALIBRATION SETTINGS
+# ============================================================================
+# Share of the training set held out to fit the probability calibrator
+CALIBRATION_FRACTION = 0.2
+# "isotonic", "platt", or "auto" to pick the one with the lower held-out ECE
+CALIBRATION_METHOD = "auto"
+
+# ============================================================================
+# ENSEMBLE SETTINGS
+# ============================================================================
+# Bootstrap models trained alongside the main model to estimate prediction
+# uncertainty (0 disables the ensemble)
+ENSEMBLE_MODELS = 25
+
+# ============================================================================
+# FEATURE IMPORTANCE SETTINGS
+# ============================================================================
+# Shuffles per feature for the permutation importance on the test set
+# (0 disables it)
+IMPORTANCE_REPEATS = 10
+# Test rows scored for it; larger test sets are subsampled to this many
+IMPORTANCE_MAX_SAMPLES = 100_000
+
+# ============================================================================
+# LEARNING CURVE SETTINGS
+# ============================================================================
+# Training-set fractions and random subsets per fraction fitted by
+# `train.py --learning-curve`
+LEARNING_CURVE_FRACTIONS = [0.02, 0.05, 0.1, 0.2, 0.4, 0.6, 0.8, 1.0]
+LEARNING_CURVE_SEEDS = 5
+LEARNING_CURVE_PATH = "model/learning_curve.json"
+
+def training_settings():
+    """Every setting that changes the trained artifacts (part of the cache key)"""
+    return {
+        "learning_rate": LEARNING_RATE,
+        "iterations": N_ITERATIONS,
+        "calibration_fraction": CALIBRATION_FRACTION,
+        "calibration_method": CALIBRATION_METHOD,
+        "ensemble_models": ENSEMBLE_MODELS,
+        "importance_repeats": IMPORTANCE_REPEATS,
+        "importance_max_samples": IMPORTANCE_MAX_SAMPLES
+    }
 
 # ============================================================================
 # PERFORMANCE METRICS FUNCTIONS
@@ -46,39 +143,8 @@ def confusion_matrix(y_true, y_pred):
     return {"TP": int(tp), "TN": int(tn), "FP": int(fp), "FN": int(fn)}
 
 def roc_auc_score(y_true, y_proba):
-    """Calculate ROC AUC score"""
-    # Sort by predicted probability
-    desc_score_indices = np.argsort(y_proba)[::-1]
-    y_true_sorted = y_true[desc_score_indices]
-    
-    # Calculate TPR and FPR at different thresholds
-    tpr_list = []
-    fpr_list = []
-    
-    n_pos = np.sum(y_true == 1)
-    n_neg = np.sum(y_true == 0)
-    
-    tp = 0
-    fp = 0
-    
-    for i in range(len(y_true_sorted)):
-        if y_true_sorted[i] == 1:
-            tp += 1
-        else:
-            fp += 1
-        
-        tpr = tp / n_pos if n_pos > 0 else 0
-        fpr = fp / n_neg if n_neg > 0 else 0
-        
-        tpr_list.append(tpr)
-        fpr_list.append(fpr)
-    
-    # Calculate AUC using trapezoidal rule
-    auc = 0.0
-    for i in range(1, len(fpr_list)):
-        auc += (fpr_list[i] - fpr_list[i-1]) * (tpr_list[i] + tpr_list[i-1]) / 2
-    
-    return auc
+    """Calculate ROC AUC score (Mann-Whitney rank sum; tied scores count one half)"""
+    return roc_auc(y_true, y_proba)
 
 def classification_report(y_true, y_pred, y_proba=None):
     """Generate comprehensive classification report"""
@@ -186,23 +252,113 @@ def print_metrics(metrics, dataset_name):
     print(f"  False Negatives: {cm['FN']:>6}")
     print(f"{'='*60}\n")
 
+def print_subgroups(subgroups):
+    """Print test ROC-AUC / recall by gender and age band"""
+    grouping = next(g for g in subgroups if g['columns'] == ['gender', 'age_band'])
+    print(f"\n{'='*60}")
+    print("TEST METRICS BY GENDER AND AGE BAND")
+    print(f"{'='*60}")
+    print(f"{'Gender':<8}{'Age':<8}{'n':>8}{'ROC-AUC':>10}{'Recall':>10}{'Precision':>11}")
+    for entry in grouping['slices']:
+        auc, rec, prec = (
+            "-" if entry[name] is None else f"{entry[name]:.4f}" for name in ['roc_auc', 'recall', 'precision']
+        )
+        print(f"{entry['values'][0]:<8}{entry['values'][1]:<8}{entry['n']:>8}{auc:>10}{rec:>10}{prec:>11}")
+    print(f"{'='*60}\n")
+
+def print_importance(importance):
+    """Print the test ROC-AUC drop per shuffled feature"""
+    print(f"\n{'='*60}")
+    print(f"PERMUTATION IMPORTANCE (test ROC-AUC {importance['baseline']:.4f})")
+    print(f"{'='*60}")
+    print(f"{'Feature':<14}{'AUC drop':>12}{'± std':>10}")
+    for feature in importance['features']:
+        print(f"{feature['feature']:<14}{feature['mean']:>12.4f}{feature['std']:>10.4f}")
+    print(f"{'='*60}\n")
+
+def restore_cached(artifacts, key):
+    """Write a cached run's artifacts back in place and print its results"""
+    for path, data in artifacts.items():
+        atomic_write(path, data)
+    report = json.loads(artifacts["model/training_report.json"])
+    print(f"⚡ Cache hit ({key[:12]}): data, settings and code match the run of "
+          f"{report['training_info']['timestamp']}")
+    print_metrics(report['training_metrics'], "Training Set")
+    print_metrics(report['test_metrics'], "Test Set")
+    print(f"{'='*70}")
+    print("TRAINING SUMMARY (cached)")
+    print(f"{'='*70}")
+    print(f"✅ Test Accuracy: {report['test_metrics']['accuracy']:.4f} ({report['test_metrics']['accuracy']*100:.2f}%)")
+    print(f"✅ Test ROC-AUC: {report['test_metrics']['roc_auc']:.4f}")
+    print(f"✅ Model Status: {report['model_analysis']['status'].upper()}")
+    print(f"✅ Files restored:")
+    for path in artifacts:
+        print(f"   - {path}")
+    print(f"{'='*70}\n")
+
 # ============================================================================
 # MAIN TRAINING SCRIPT
 # ============================================================================
 
+def run_learning_curve(X_train, y_train, X_test, y_test, n_jobs=None):
+    """Fit every (fraction, seed) in parallel, print the curve and save it"""
+    print(f"\n📈 Fitting learning curve: {len(LEARNING_CURVE_FRACTIONS)} sizes x {LEARNING_CURVE_SEEDS} seeds...")
+    curve = learning_curve(X_train, y_train, X_test, y_test, LEARNING_CURVE_FRACTIONS, LEARNING_CURVE_SEEDS,
+                           lr=LEARNING_RATE, n_iters=N_ITERATIONS, n_jobs=n_jobs)
+    curve["timestamp"] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    
+    print(f"\n{'='*70}")
+    print(f"LEARNING CURVE ({curve['workers']} workers, {curve['wall_seconds']:.1f}s)")
+    print(f"{'='*70}")
+    print(f"{'Fraction':>9}{'Samples':>9}{'Train AUC':>12}{'Test AUC':>18}{'Test Acc':>10}{'Fit (s)':>10}")
+    for point in curve["points"]:
+        train, test = point["train"], point["test"]
+        print(f"{point['fraction']:>9.0%}{point['n_samples']:>9}{train['roc_auc']['mean']:>12.4f}"
+              f"{test['roc_auc']['mean']:>10.4f} ±{test['roc_auc']['std']:.4f}{test['accuracy']['mean']:>10.4f}"
+              f"{point['fit_seconds']['mean']:>10.2f}")
+    print(f"{'='*70}\n")
+    
+    try:
+        atomic_write(LEARNING_CURVE_PATH, json.dumps(curve, indent=2).encode())
+        print(f"✅ Learning curve saved to: {LEARNING_CURVE_PATH}")
+    except Exception as e:
+        print(f"❌ Error saving learning curve: {e}")
+
 def main():
+    parser = argparse.ArgumentParser(description="Train the cardiovascular disease model")
+    parser.add_argument("--no-cache", action="store_true", help="retrain even if a cached result matches")
+    parser.add_argument("--learning-curve", action="store_true",
+                        help="fit on increasing training fractions and save the learning curve instead of training")
+    parser.add_argument("--workers", type=int, default=None, help="processes for the learning curve (default: all cores)")
+    args = parser.parse_args()
+    
     print("\n" + "="*70)
     print("CARDIOVASCULAR DISEASE PREDICTION - MODEL TRAINING")
     print("="*70)
     print(f"Training started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
     
+    # Reuse the stored result of an identical earlier run
+    cache = cache_key = None
+    if CACHE_DIR and not args.no_cache and not args.learning_curve:
+        cache = TrainingCache()
+        try:
+            cache_key = cache.key(list(DATA_FILES.values()) + [SCALER_PATH], training_settings(),
+                                  code_files(__file__, *TRAINING_MODULES))
+        except OSError:
+            cache = None  # missing inputs; reported below
+        if cache is not None:
+            cached = cache.lookup(cache_key)
+            if cached is not None and "model/training_report.json" in cached:
+                restore_cached(cached, cache_key)
+                return
+    
     # Load data
     print("📂 Loading preprocessed data...")
     try:
-        X_train = pd.read_csv("data/X_train_final.csv")
-        X_test = pd.read_csv("data/X_test_final.csv")
-        y_train = pd.read_csv("data/y_train_final.csv").values.ravel()
-        y_test = pd.read_csv("data/y_test_final.csv").values.ravel()
+        X_train = pd.read_csv(DATA_FILES['X_train'])
+        X_test = pd.read_csv(DATA_FILES['X_test'])
+        y_train = pd.read_csv(DATA_FILES['y_train']).values.ravel()
+        y_test = pd.read_csv(DATA_FILES['y_test']).values.ravel()
         
         print(f"✅ Data loaded successfully")
         print(f"   Training samples: {len(X_train)}")
@@ -214,33 +370,91 @@ def main():
         print(f"❌ Error loading data: {e}")
         return
     
+    if args.learning_curve:
+        run_learning_curve(X_train.values, y_train, X_test.values, y_test, args.workers)
+        return
+    
     # Initialize and train model
     print("\n🤖 Initializing Logistic Regression model...")
     print("   Hyperparameters:")
-    print("   - Learning Rate: 0.005")
-    print("   - Iterations: 3000")
+    print(f"   - Learning Rate: {LEARNING_RATE}")
+    print(f"   - Iterations: {N_ITERATIONS}")
     print("   - Algorithm: Gradient Descent")
     
-    model = LogisticRegression(lr=0.005, n_iters=3000)
+    model = LogisticRegression(lr=LEARNING_RATE, n_iters=N_ITERATIONS)
     
     print("\n🔄 Training model...")
     print("   This may take a few minutes...\n")
     
-    model.fit(X_train.values, y_train)
+    # Hold out part of the training set for probability calibration
+    calibration_mask = np.zeros(len(X_train), dtype=bool)
+    calibration_mask[np.random.default_rng(42).permutation(len(X_train))[:int(len(X_train) * CALIBRATION_FRACTION)]] = True
+    X_calib, y_calib = X_train.values[calibration_mask], y_train[calibration_mask]
+    X_fit, y_fit = X_train.values[~calibration_mask], y_train[~calibration_mask]
+    
+    model.fit(X_fit, y_fit)
     
     print("✅ Model training completed!\n")
     
-    # Make predictions
+    # Calibrate probabilities on the held-out part
+    print(f"🎯 Fitting probability calibration on {len(X_calib)} held-out samples...")
+    raw_calib_proba = model.predict_proba(X_calib)
+    raw_test_proba = model.predict_proba(X_test.values)
+    calibrators = {name: fit(raw_calib_proba, y_calib) for name, fit in CALIBRATORS.items()}
+    test_ece = {"uncalibrated": expected_calibration_error(y_test, raw_test_proba)}
+    for name, calibrator in calibrators.items():
+        test_ece[name] = expected_calibration_error(y_test, calibrator(raw_test_proba))
+    
+    if CALIBRATION_METHOD == "auto":
+        method, model.calibrator, selection_ece = select_calibrator(raw_calib_proba, y_calib)
+    else:
+        method, model.calibrator, selection_ece = CALIBRATION_METHOD, calibrators[CALIBRATION_METHOD], None
+    calibration_report = {
+        "method": method,
+        "calibration_samples": int(len(X_calib)),
+        "selection_ece": selection_ece,
+        "test_ece": test_ece,
+        "reliability_curve": {
+            "uncalibrated": reliability_curve(y_test, raw_test_proba),
+            "calibrated": reliability_curve(y_test, model.predict_proba(X_test.values))
+        }
+    }
+    for name, ece in test_ece.items():
+        print(f"   Test ECE ({name}): {ece:.4f}")
+    print(f"✅ Using {method} calibration\n")
+    
+    # Train the bagged ensemble on the same data; its calibrator (same method as
+    # the main model's) is fitted on the members' own holdout probabilities
+    ensemble, ensemble_report = None, None
+    if ENSEMBLE_MODELS > 0:
+        print(f"🌲 Training bagged ensemble of {ENSEMBLE_MODELS} models in parallel...")
+        ensemble_start = datetime.now()
+        ensemble = fit_bagged(X_fit, y_fit, n_models=ENSEMBLE_MODELS, lr=LEARNING_RATE, n_iters=N_ITERATIONS)
+        raw_member_proba = ensemble.member_proba(X_calib)
+        ensemble.calibrator = CALIBRATORS[method](raw_member_proba.ravel(), np.repeat(y_calib, ENSEMBLE_MODELS))
+        ensemble_proba, ensemble_std, lower, upper = ensemble.predict_interval(X_test.values)
+        ensemble_report = {
+            "n_models": ENSEMBLE_MODELS,
+            "fit_seconds": (datetime.now() - ensemble_start).total_seconds(),
+            "test_roc_auc": float(roc_auc_score(y_test, ensemble_proba)),
+            "test_mean_std": float(ensemble_std.mean()),
+            "test_mean_interval_width": float((upper - lower).mean())
+        }
+        print(f"✅ Ensemble trained in {ensemble_report['fit_seconds']:.1f}s "
+              f"(mean spread ±{ensemble_report['test_mean_std']*100:.2f} pts)\n")
+    
+    # Make predictions; training metrics cover only the rows the model was
+    # fitted on, not the calibration holdout
     print("📊 Generating predictions...")
-    train_pred = model.predict(X_train.values)
+    train_pred = model.predict(X_fit)
     test_pred = model.predict(X_test.values)
     
-    train_proba = model.predict_proba(X_train.values)
+    train_proba = model.predict_proba(X_fit)
     test_proba = model.predict_proba(X_test.values)
     
     # Calculate metrics
     print("📈 Calculating performance metrics...\n")
-    train_metrics = classification_report(y_train, train_pred, train_proba)
+    train_metrics = classification_report(y_fit, train_pred, train_proba)
     test_metrics = classification_report(y_test, test_pred, test_proba)
     
     # Print metrics
@@ -263,13 +477,57 @@ def main():
         print(f"  {i}. {rec}")
     print(f"{'='*60}\n")
     
+    # Training population in raw units (whole-number columns rounded back after
+    # unscaling): predicted-risk and feature quantiles for the app's percentile
+    # ranking, and the drift reference
+    try:
+        with open(SCALER_PATH, "rb") as f:
+            scaler = pickle.load(f)
+        X_train_raw = X_train[FEATURE_COLUMNS].values.copy()
+        X_train_raw[:, NUMERIC_INDEX] = X_train_raw[:, NUMERIC_INDEX] * scaler.scale_ + scaler.mean_
+        X_train_raw[:, INTEGER_INDEX] = np.round(X_train_raw[:, INTEGER_INDEX])
+        X_test_raw = X_test[FEATURE_COLUMNS].values.copy()
+        X_test_raw[:, NUMERIC_INDEX] = X_test_raw[:, NUMERIC_INDEX] * scaler.scale_ + scaler.mean_
+        X_test_raw[:, INTEGER_INDEX] = np.round(X_test_raw[:, INTEGER_INDEX])
+        population = build_index(model.predict_proba(X_train.values), X_train_raw)
+    except Exception as e:
+        print(f"❌ Error loading scaler: {e}")
+        X_train_raw = X_test_raw = population = None
+    
+    # Test metrics per subgroup (gender, age band and the categorical
+    # columns, alone and crossed), all slices in one pass
+    subgroups = None
+    if X_test_raw is not None:
+        print("👥 Computing subgroup metrics...")
+        subgroups = subgroup_metrics(X_test_raw, y_test, test_pred, test_proba)
+        print_subgroups(subgroups)
+    
+    # Permutation feature importance on the test set: each feature's shuffled
+    # copies scored in one batch
+    importance = None
+    if IMPORTANCE_REPEATS > 0:
+        print(f"🔀 Computing permutation importance ({IMPORTANCE_REPEATS} shuffles per feature)...")
+        importance = permutation_importance(model, X_test.values, y_test, list(X_test.columns), IMPORTANCE_REPEATS,
+                                            max_samples=IMPORTANCE_MAX_SAMPLES)
+        print_importance(importance)
+    
     # Save model
     print("💾 Saving model...")
+    saved, save_failed = [], False
     try:
-        with open("model/logistic_model.pkl", "wb") as f:
-            pickle.dump(model, f)
+        atomic_write("model/logistic_model.pkl", pickle.dumps(model))
+        saved.append("model/logistic_model.pkl")
         print("✅ Model saved to: model/logistic_model.pkl")
+        if ensemble is not None:
+            atomic_write("model/ensemble.pkl", pickle.dumps(ensemble))
+            saved.append("model/ensemble.pkl")
+            print("✅ Ensemble saved to: model/ensemble.pkl")
+        if population is not None:
+            atomic_write("model/population_index.json", json.dumps(population.to_dict()).encode())
+            saved.append("model/population_index.json")
+            print("✅ Population percentile index saved to: model/population_index.json")
     except Exception as e:
+        save_failed = True
         print(f"❌ Error saving model: {e}")
     
     # Save comprehensive report
@@ -277,9 +535,10 @@ def main():
         "training_info": {
             "timestamp": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
             "algorithm": "Logistic Regression (Custom Implementation)",
-            "learning_rate": 0.005,
-            "iterations": 3000,
-            "training_samples": int(len(X_train)),
+            "learning_rate": LEARNING_RATE,
+            "iterations": N_ITERATIONS,
+            "training_samples": int(len(X_fit)),
+            "calibration_samples": int(len(X_calib)),
             "test_samples": int(len(X_test)),
             "n_features": int(X_train.shape[1])
         },
@@ -302,6 +561,15 @@ def main():
             "confusion_matrix": test_metrics['confusion_matrix']
         },
         "model_analysis": fit_analysis,
+        "calibration": calibration_report,
+        "ensemble": ensemble_report,
+        "subgroup_metrics": subgroups,
+        "permutation_importance": importance,
+        # Mean scaled feature vector of the training set; explanations
+        # measure each feature's contribution against it (model/explain.py)
+        "feature_baseline": {
+            column: float(value) for column, value in zip(X_train.columns, X_train.values.mean(axis=0))
+        },
         "feature_info": {
             "numerical_features": [
                 "age (scaled)",
@@ -324,12 +592,41 @@ def main():
     
     print("\n📄 Saving comprehensive report...")
     try:
-        with open("model/training_report.json", "w") as f:
-            json.dump(report, f, indent=2)
+        atomic_write("model/training_report.json", json.dumps(report, indent=2).encode())
+        saved.append("model/training_report.json")
         print("✅ Report saved to: model/training_report.json")
     except Exception as e:
+        save_failed = True
         print(f"❌ Error saving report: {e}")
     
+    # Save dataset aggregates for the app's Stats section (whole dataset)
+    print("\n📊 Saving dataset statistics...")
+    try:
+        dataset_stats = build_stats(
+            np.vstack([X_train_raw, X_test_raw]), np.concatenate([y_train, y_test]), report
+        )
+        atomic_write(STATS_PATH, json.dumps(dataset_stats).encode())
+        saved.append(STATS_PATH)
+        print(f"✅ Dataset statistics saved to: {STATS_PATH}")
+    except Exception as e:
+        save_failed = True
+        print(f"❌ Error saving dataset statistics: {e}")
+    
+    # Save training distribution snapshot for the input drift monitor
+    print("\n📡 Saving drift reference...")
+    try:
+        atomic_write(REFERENCE_PATH, json.dumps(build_reference(X_train_raw)).encode())
+        saved.append(REFERENCE_PATH)
+        print(f"✅ Drift reference saved to: {REFERENCE_PATH}")
+    except Exception as e:
+        save_failed = True
+        print(f"❌ Error saving drift reference: {e}")
+    
+    # Only complete runs are cached, so a hit restores every artifact
+    if cache is not None and not save_failed:
+        if cache.store(cache_key, saved):
+            print(f"\n⚡ Result cached as {cache_key[:12]} in {cache.directory}")
+    
     # Summary
     print(f"\n{'='*70}")
     print("TRAINING SUMMARY")
@@ -340,7 +637,13 @@ def main():
     print(f"✅ Model Status: {fit_analysis['status'].upper()}")
     print(f"✅ Files saved:")
     print(f"   - model/logistic_model.pkl")
+    if ensemble is not None:
+        print(f"   - model/ensemble.pkl")
+    if population is not None:
+        print(f"   - model/population_index.json")
     print(f"   - model/training_report.json")
+    print(f"   - {STATS_PATH}")
+    print(f"   - {REFERENCE_PATH}")
     print(f"\n🎉 All operations completed successfully!")
     print(f"{'='*70}\n")
 